@@ -0,0 +1,101 @@
+"""
+D1 로컬 사본(D1Mirror) 비교: 원격 D1 전체 조회 vs 증분 동기화 + 로컬 조회.
+로컬 D1 대역 서버(src/publisher/d1_local_server.py)를 띄워서 실행하며,
+매 단계마다 사본이 원격과 같은지, 중간에 끊긴 동기화가 이어지는지도 확인합니다.
+
+    python -m benchmarks.bench_d1_mirror
+    python -m benchmarks.bench_d1_mirror --posts 20000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from src.publisher.d1_client import D1Client
+from src.publisher.d1_local_server import start_local_server
+from src.storage.d1_mirror import D1Mirror
+
+SITEMAP_SQL = "SELECT id, slug, image_url, updated_at FROM posts ORDER BY id"
+COMPARE_SQL = "SELECT id, slug, title, content, updated_at FROM posts ORDER BY id"
+
+
+class FlakyClient:
+    """pages번째 조회 이후로 실패하는 클라이언트 (동기화 도중 끊김 흉내)"""
+
+    def __init__(self, client, pages):
+        self.client, self.pages = client, pages
+
+    def query(self, sql, params=None):
+        if self.pages <= 0:
+            raise ConnectionError("연결 끊김")
+        self.pages -= 1
+        return self.client.query(sql, params)
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - started) * 1000
+
+
+def seed(client, start, count):
+    client.batch([
+        ("INSERT INTO posts (slug, title, content, category, image_url, created_at, updated_at) "
+         "VALUES (?, ?, ?, '라이프', ?, '2026-01-01 00:00:00', '2026-01-01 00:00:00')",
+         (f"2026-01-01-p{i}", f"title {i}", "본문 " * 200, f"/images/opt/{i:016x}-1024.webp"))
+        for i in range(start, start + count)
+    ])
+
+
+def check(mirror, client, label):
+    assert mirror.query(COMPARE_SQL) == client.query(COMPARE_SQL), f"{label}: 사본이 원격과 다릅니다"
+
+
+def bench(posts):
+    with tempfile.TemporaryDirectory() as tmp:
+        server, api_base = start_local_server(os.path.join(tmp, "remote.db"))
+        client = D1Client("local", "local", "local", api_base=api_base)
+        for start in range(0, posts, 1000):
+            seed(client, start, min(1000, posts - start))
+
+        # 1) 첫 동기화 도중 끊김 → 이어서 동기화
+        mirror = D1Mirror(FlakyClient(client, 3), db_path=os.path.join(tmp, "mirror.db"), page_size=500)
+        try:
+            mirror.sync()
+        except ConnectionError:
+            pass
+        resumed_from = mirror.query("SELECT COUNT(*) AS n FROM posts")[0]["n"]
+        mirror._client = client
+        _, first_ms = timed(mirror.sync)
+        check(mirror, client, "resume")
+
+        # 2) 변경 없음 / 일부 수정·추가·삭제 후 증분 동기화
+        _, noop_ms = timed(mirror.sync)
+        client.batch([("UPDATE posts SET title = ?, updated_at = '2026-02-01 00:00:00' WHERE id = ?", (f"edited {i}", i))
+                      for i in range(1, posts, max(1, posts // 10))])
+        seed(client, posts, 5)
+        client.query("DELETE FROM posts WHERE id = 2")
+        delta, delta_ms = timed(mirror.sync)
+        check(mirror, client, "delta")
+
+        _, remote_ms = timed(lambda: client.query(SITEMAP_SQL))
+        _, local_ms = timed(lambda: mirror.query(SITEMAP_SQL))
+        _, remote_one = timed(lambda: client.query("SELECT title FROM posts WHERE slug = ?", ("2026-01-01-p7",)))
+        _, local_one = timed(lambda: mirror.query("SELECT title FROM posts WHERE slug = ?", ("2026-01-01-p7",)))
+        mirror.close()
+        server.shutdown()
+
+    print(f"\n[{posts:,} posts]")
+    print(f"  중단 후 재개: {resumed_from:,}행 받은 상태에서 이어서 완료 ({first_ms:.0f} ms)")
+    print(f"  변경 없음 sync:        {noop_ms:8.1f} ms")
+    print(f"  증분 sync {delta}: {delta_ms:8.1f} ms")
+    print(f"  sitemap 목록  원격 {remote_ms:8.1f} ms / 로컬 {local_ms:8.2f} ms")
+    print(f"  slug 1건 조회 원격 {remote_one:8.2f} ms / 로컬 {local_one * 1000:8.1f} µs")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--posts", type=int, nargs="+", default=[2000])
+    args = parser.parse_args()
+    for size in args.posts:
+        bench(size)
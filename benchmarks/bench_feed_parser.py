@@ -0,0 +1,57 @@
+"""
+피드 파싱 비교: 기존 BeautifulSoup 파서 vs 스트리밍 파서 (src/collector/feed_parser.py)
+benchmarks/fixtures의 녹화된 피드로 파싱 시간과 최대 메모리를 측정합니다.
+
+    python -m benchmarks.bench_feed_parser
+    python -m benchmarks.bench_feed_parser --limit 10 --repeat 50
+"""
+import argparse
+import contextlib
+import io
+import os
+import time
+import tracemalloc
+
+from src.collector.reddit_collector import RedditCollector
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def measure(fn, xml_text, limit, repeat):
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn(xml_text, limit)
+        started = time.perf_counter()
+        for _ in range(repeat):
+            fn(xml_text, limit)
+        elapsed = (time.perf_counter() - started) / repeat
+
+        tracemalloc.start()
+        result = fn(xml_text, limit)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    collector = RedditCollector.__new__(RedditCollector)
+    cases = [
+        ("reddit_top_day.atom", collector._parse_reddit_rss_soup, collector._parse_reddit_rss),
+        ("google_news_search.rss", collector._parse_google_news_rss_soup, collector._parse_google_news_rss),
+    ]
+    for name, legacy, streaming in cases:
+        with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+            xml_text = f.read()
+        old_t, old_mem, old_posts = measure(legacy, xml_text, args.limit, args.repeat)
+        new_t, new_mem, new_posts = measure(streaming, xml_text, args.limit, args.repeat)
+        same = "동일" if old_posts == new_posts else "불일치!"
+        print(f"{name:<24} limit={args.limit:<3} | BeautifulSoup {old_t * 1e3:7.2f}ms {old_mem / 1024:7.0f}KiB "
+              f"| 스트리밍 {new_t * 1e3:6.2f}ms {new_mem / 1024:6.0f}KiB | x{old_t / new_t:.1f} | 결과 {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+썸네일/사이트맵 git 배포 비교: 글마다 add/commit/push (이전 방식) vs GitPublisher 커밋 1개 + 백그라운드 push.
+임시 폴더의 bare 저장소를 원격으로 쓰고, --push-delay로 실제 원격 push의 네트워크 지연을 흉내 냅니다.
+다른 곳에서 먼저 push해 거절된 경우 rebase 후 다시 올라가는지도 확인합니다.
+
+    python -m benchmarks.bench_git_publisher
+    python -m benchmarks.bench_git_publisher --posts 8 --push-delay 1.5
+"""
+import argparse
+import os
+import subprocess
+import tempfile
+import time
+
+from benchmarks.pipeline_replay import init_git, remote_commits
+from src.publisher.git_publisher import GitPublisher, run_git
+
+
+def delayed_runner(delay):
+    """push/pull만 delay초 늦게 끝나는 git 실행기"""
+    def run(args, cwd):
+        if args[1] in ("push", "pull"):
+            time.sleep(delay)
+        return run_git(args, cwd)
+    return run
+
+
+def write_post_assets(repo, i):
+    """글 1개 분량의 썸네일 변환 결과(크기별 WebP/AVIF)를 만들고 경로를 반환합니다."""
+    out_dir = os.path.join(repo, "public", "images", "opt")
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for width in (480, 768, 1024):
+        for fmt in ("webp", "avif"):
+            path = f"public/images/opt/{i:016x}-{width}.{fmt}"
+            with open(os.path.join(repo, path), "wb") as f:
+                f.write(os.urandom(2048))
+            paths.append(path)
+    return paths
+
+
+def write_sitemap(repo, posts):
+    with open(os.path.join(repo, "public", "sitemap.xml"), "w") as f:
+        f.write("".join(f"<url><loc>https://example.com/blog/{i}</loc></url>\n" for i in range(posts)))
+    return ["public/sitemap.xml"]
+
+
+def sh(repo, command, delay):
+    if " push " in f" {command} ":
+        time.sleep(delay)
+    subprocess.run(command, cwd=repo, shell=True, check=True, capture_output=True)
+
+
+def per_post(repo, posts, delay):
+    """이전 manager.py 방식: 글마다 add/commit/push, 마지막에 사이트맵 add/commit/push. 파이프라인이 막힌 시간을 잽니다."""
+    started = time.perf_counter()
+    for i in range(posts):
+        write_post_assets(repo, i)
+        sh(repo, "git add public/images/*", delay)
+        sh(repo, f'git commit -q -m "Image: {i}"', delay)
+        sh(repo, "git push -q origin main", delay)
+    write_sitemap(repo, posts)
+    sh(repo, "git add -A public/sitemap*", delay)
+    sh(repo, 'git commit -q -m "Update sitemap.xml"', delay)
+    sh(repo, "git push -q origin main", delay)
+    blocked = time.perf_counter() - started
+    return blocked, blocked
+
+
+def batched(repo, posts, delay):
+    """GitPublisher: 경로만 모았다가 커밋 1개, push는 백그라운드. (막힌 시간, push까지 끝난 시간)"""
+    publisher = GitPublisher(repo, runner=delayed_runner(delay))
+    started = time.perf_counter()
+    for i in range(posts):
+        publisher.stage(write_post_assets(repo, i), f"Image: {i}")
+    publisher.stage(write_sitemap(repo, posts), "Update sitemap.xml")
+    publisher.commit()
+    publisher.push_async()
+    blocked = time.perf_counter() - started
+    ok = publisher.wait()
+    total = time.perf_counter() - started
+    publisher.close()
+    assert ok, "push 실패"
+    return blocked, total
+
+
+def check_rejected_push(repo):
+    """다른 클론이 먼저 push해 두면 거절 → pull --rebase → 다시 push로 둘 다 원격에 남아야 함"""
+    subprocess.run("git clone -q remote.git other && cd other && git -c user.name=o -c user.email=o@o "
+                   "commit -q --allow-empty -m other && git push -q origin main", cwd=repo, shell=True, check=True)
+    before = remote_commits(repo)
+    publisher = GitPublisher(repo)
+    publisher.stage(write_post_assets(repo, 999), "Image: rejected")
+    publisher.commit()
+    publisher.push_async()
+    assert publisher.wait(), "rebase 후 push 실패"
+    publisher.close()
+    assert remote_commits(repo) == before + 1, "원격 커밋 수가 맞지 않습니다"
+    log = subprocess.run(["git", "log", "--format=%s", "-2"], cwd=repo, capture_output=True, text=True).stdout.split("\n")
+    assert log[:2] == ["Publish 1 post image(s)", "other"], log
+
+
+def bench(posts, delay):
+    results = {}
+    for name, fn in (("글마다 push", per_post), ("커밋 1개 + 백그라운드 push", batched)):
+        with tempfile.TemporaryDirectory() as repo:
+            init_git(repo)
+            before = remote_commits(repo)
+            blocked, total = fn(repo, posts, delay)
+            results[name] = (blocked, total, remote_commits(repo) - before)
+            if fn is batched:
+                check_rejected_push(repo)
+
+    print(f"\n[글 {posts}개, push 지연 {delay}s]")
+    for name, (blocked, total, commits) in results.items():
+        print(f"  {name:<22} 파이프라인 대기 {blocked * 1000:8.0f} ms / push 완료까지 {total * 1000:8.0f} ms / 커밋 {commits}개")
+    print("  거절된 push → rebase 후 재시도: OK")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--posts", type=int, default=8)
+    parser.add_argument("--push-delay", type=float, default=0.5, help="push 1번에 더할 네트워크 지연(초)")
+    args = parser.parse_args()
+    bench(args.posts, args.push_delay)
@@ -0,0 +1,126 @@
+"""
+서브레딧 수집 비교: 레딧이 실패해야 구글 뉴스로 넘어가는 순차 방식 vs 건강 기록 기반 헤지(동시 요청) 방식.
+
+가짜 세션으로 호스트별 지연/오류를 흉내 냅니다. (--scale로 시간 축소, 기본 0.1 = 10배 빠르게)
+- 정상 서브레딧: 레딧 0.2~0.6초
+- 느린 서브레딧: 레딧 6초
+- 요청 제한: 레딧 3초 뒤 429
+- 접속 불가: 레딧 10초 타임아웃
+구글 뉴스는 0.4~0.8초. 같은 수집기로 여러 번 돌려 건강 기록이 쌓이며 달라지는 것도 봅니다.
+
+    python -m benchmarks.bench_hedged_collect
+    python -m benchmarks.bench_hedged_collect --runs 5 --scale 0.2
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import tempfile
+import threading
+import time
+
+import requests
+
+from benchmarks.synthetic import make_reddit_feed
+from src.collector.reddit_collector import RedditCollector
+from src.collector.source_health import SourceHealth
+from src.common.http_cache import HttpCache, set_session_factory
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+# 서브레딧별 레딧 상태
+SCENARIOS = {
+    "Supplements": "ok", "Gadgets": "ok", "HomeImprovement": "ok", "Technology": "ok", "BuyItForLife": "ok",
+    "LifeProTips": "slow", "ExplainLikeImFive": "rate_limited", "Biohacking": "down",
+}
+
+
+class FakeResponse:
+    def __init__(self, status_code, text):
+        self.status_code = status_code
+        self.content = text.encode("utf-8")
+        self.headers = {"Content-Type": "application/xml"}
+
+
+class FakeSession:
+    def __init__(self, host, scale, rng, calls):
+        self.host, self.scale, self.rng, self.calls = host, scale, rng, calls
+        with open(os.path.join(FIXTURES, "google_news_search.rss"), encoding="utf-8") as f:
+            self.news = f.read()
+
+    def get(self, url, params=None, headers=None, timeout=None, **kwargs):
+        with self.calls["lock"]:
+            self.calls[self.host] = self.calls.get(self.host, 0) + 1
+            jitter = self.rng.random()
+        if self.host == "news.google.com":
+            time.sleep((0.4 + 0.4 * jitter) * self.scale)
+            return FakeResponse(200, self.news)
+        sub = url.split("/r/")[1].split("/")[0]
+        scenario = SCENARIOS[sub]
+        if scenario == "down":
+            time.sleep(timeout * self.scale)
+            raise requests.Timeout("read timed out")
+        if scenario == "rate_limited":
+            time.sleep(3 * self.scale)
+            return FakeResponse(429, "Too Many Requests")
+        time.sleep((6 if scenario == "slow" else 0.2 + 0.4 * jitter) * self.scale)
+        return FakeResponse(200, make_reddit_feed(10, sub))
+
+
+def collect(hedge, runs, scale, seed):
+    """runs번 x 서브레딧 8개를 차례로 수집하고 (서브레딧별 수집 시간 목록, 호스트별 요청 수)를 반환합니다."""
+    rng = random.Random(seed)
+    calls = {"lock": threading.Lock()}
+    set_session_factory(lambda host, new_session: FakeSession(host, scale, rng, calls))
+    times = {sub: [] for sub in SCENARIOS}
+    caches = []
+    # 진 쪽 요청은 수집이 끝난 뒤에도 스레드에서 돌며 출력하므로 통째로 버림
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        health = SourceHealth(":memory:", hedge_after=2.0 * scale, min_hedge=0.3 * scale)
+        collector = RedditCollector(health=health, hedge=hedge)
+        try:
+            for run in range(runs):
+                # 실행마다 HTTP 캐시를 비워 매번 네트워크로 받게 함 (건강 기록은 이어짐)
+                collector.http = HttpCache(os.path.join(tmp, f"http_{run}.db"))
+                caches.append(collector.http)
+                for sub in SCENARIOS:
+                    started = time.perf_counter()
+                    posts = collector.fetch_top_posts(sub, limit=10)
+                    assert posts, f"{sub}: 수집 결과 없음"
+                    times[sub].append((time.perf_counter() - started) / scale)
+        finally:
+            collector.pool.shutdown(wait=True)
+            for cache in caches:
+                cache.conn.close()
+            health.close()
+            set_session_factory(None)
+    calls.pop("lock")
+    return times, calls
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--scale", type=float, default=0.1, help="지연 시간 배율 (결과는 원래 시간으로 환산해 출력)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    results = {name: collect(hedge, args.runs, args.scale, args.seed)
+               for name, hedge in (("순차 (실패 후 전환)", False), ("헤지", True))}
+
+    print(f"\n[실행 {args.runs}번 x 서브레딧 {len(SCENARIOS)}개, 시간은 실제 환산]")
+    header = "".join(f"{name:>22}" for name in results)
+    print(f"  {'서브레딧 (레딧 상태)':<34}{header}")
+    for sub, scenario in SCENARIOS.items():
+        cells = "".join(f"{sum(times[sub]) / len(times[sub]):>21.2f}s" for times, _ in results.values())
+        print(f"  {sub + ' (' + scenario + ')':<34}{cells}")
+    for label, fn in (("실행 1번 합계", lambda t: sum(sum(v) for v in t.values()) / args.runs),
+                      ("가장 느린 수집", lambda t: max(max(v) for v in t.values()))):
+        cells = "".join(f"{fn(times):>21.2f}s" for times, _ in results.values())
+        print(f"  {label:<34}{cells}")
+    cells = "".join(f"{calls.get('news.google.com', 0):>21}번" for _, calls in results.values())
+    print(f"  {'구글 뉴스 요청':<34}{cells}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+painter 상주 서비스 확인: StubPainter(GPU 없음)로 렌더 큐의 대기열 한도, 서비스 강제 종료 후 재시작 복구,
+한 연결을 여러 스레드가 함께 쓰는 경우를 확인합니다. 하나라도 어긋나면 AssertionError.
+
+- 대기 작업이 max_pending개면 다음 submit은 QueueFull (block=True면 자리가 날 때까지 기다렸다가 들어감)
+- 렌더 중인 서비스 프로세스를 kill하면 작업이 running으로 남고, 재시작한 서비스가 되돌려 끝까지 처리
+- 같은 RenderQueue를 클라이언트 스레드 여러 개와 서비스 스레드가 함께 써도 작업이 빠짐없이 끝남
+
+    python -m benchmarks.bench_painter_service
+    python -m benchmarks.bench_painter_service --max-pending 6 --stub-delay 0.5
+"""
+import argparse
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from src.painter.job_queue import QueueFull, RenderQueue
+from src.painter.painter_service import PainterClient, PainterService, StubPainter
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def start_service(workdir, delay, log):
+    """작업 폴더(data/painter_queue.db, data/images)에서 스텁 서비스 프로세스를 띄웁니다."""
+    env = dict(os.environ, PYTHONPATH=ROOT, PYTHONUNBUFFERED="1")
+    return subprocess.Popen([sys.executable, "-m", "src.painter.painter_service", "--stub", "--stub-delay", str(delay)],
+                            cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+
+def wait_for(predicate, timeout, message):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return
+        time.sleep(0.05)
+    raise AssertionError(message)
+
+
+def statuses(queue, job_ids):
+    return [queue.get(job_id)["status"] for job_id in job_ids]
+
+
+def check_backpressure_and_recovery(workdir, max_pending, delay):
+    queue = RenderQueue(os.path.join(workdir, "data", "painter_queue.db"), max_pending=max_pending)
+    job_ids = [queue.submit(f"prompt {i}", f"thumb_{i}.png") for i in range(max_pending)]
+    try:
+        queue.submit("overflow", "overflow.png")
+        raise AssertionError("가득 찬 대기열에 작업이 들어갔습니다")
+    except QueueFull:
+        pass
+    started = time.perf_counter()
+    try:
+        queue.submit("overflow", "overflow.png", block=True, timeout=0.5)
+        raise AssertionError("서비스가 없는데 block submit이 자리를 얻었습니다")
+    except QueueFull:
+        pass
+    print(f"  OK  대기열 한도 {max_pending}개: 넘치면 QueueFull (block은 {time.perf_counter() - started:.1f}s 기다린 뒤)")
+
+    log_path = os.path.join(workdir, "service.log")
+    with open(log_path, "w", encoding="utf-8") as log:
+        service = start_service(workdir, delay, log)
+        wait_for(lambda: "running" in statuses(queue, job_ids), 60, "서비스가 작업을 가져가지 않았습니다")
+        victim = next(j for j in job_ids if queue.get(j)["status"] == "running")
+        service.kill()
+        service.wait()
+        assert queue.get(victim)["status"] == "running", queue.get(victim)
+        print(f"  OK  렌더 중 kill: 작업 #{victim}이 running으로 남음")
+
+        # 재시작 전에도 자리가 비면 block submit이 들어가야 함 (끝난 작업만큼 자리가 생김)
+        service = start_service(workdir, delay, log)
+        try:
+            started = time.perf_counter()
+            extra = queue.submit("late", "late.png", block=True, timeout=60)
+            waited = time.perf_counter() - started
+            job_ids.append(extra)
+            wait_for(lambda: set(statuses(queue, job_ids)) == {"done"}, 60 + len(job_ids) * delay * 4,
+                     f"재시작 후 끝나지 않은 작업: {statuses(queue, job_ids)}")
+        finally:
+            service.kill()
+            service.wait()
+    with open(log_path, encoding="utf-8") as f:
+        output = f.read()
+    assert "중단됐던 렌더 작업 1개" in output, output
+    assert queue.get(victim)["attempts"] == 2, queue.get(victim)
+    for job_id in job_ids:
+        assert os.path.exists(os.path.join(workdir, "data", "images", queue.get(job_id)["output_name"]))
+    print(f"  OK  재시작한 서비스가 #{victim}을 되돌려 처리, 넘친 작업은 {waited:.1f}s 기다렸다가 들어가 "
+          f"전체 {len(job_ids)}개 완료")
+    queue.close()
+
+
+def check_shared_connection(workdir, clients, per_client):
+    """클라이언트 스레드들과 서비스 스레드가 RenderQueue 하나(연결 하나)를 같이 씀"""
+    queue = RenderQueue(os.path.join(workdir, "shared.db"), max_pending=4)
+    service = PainterService(queue, lambda: StubPainter(0, os.path.join(workdir, "shared_images")))
+    stop = threading.Event()
+    with contextlib.redirect_stdout(io.StringIO()):
+        service.start()
+
+        def serve():
+            while not stop.is_set():
+                if not service.run_once():
+                    time.sleep(0.01)
+
+        worker = threading.Thread(target=serve)
+        worker.start()
+        client = PainterClient(queue, timeout=60, poll_interval=0.01)
+        results, errors = [], []
+
+        def draw(c):
+            try:
+                for i in range(per_client):
+                    results.append(client.generate_image(f"prompt {c}-{i}", f"shared_{c}_{i}.png"))
+            except Exception as e:
+                errors.append(e)
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=draw, args=(c,)) for c in range(clients)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stop.set()
+        worker.join()
+    assert not errors, errors
+    assert len(results) == clients * per_client and all(results), results
+    print(f"  OK  연결 공유: 클라이언트 {clients}개 × {per_client}장 + 서비스 스레드 "
+          f"({time.perf_counter() - started:.1f}s, 오류 없음)")
+    queue.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-pending", type=int, default=4)
+    parser.add_argument("--stub-delay", type=float, default=0.3)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--per-client", type=int, default=10)
+    args = parser.parse_args()
+    print("[painter 서비스: 대기열 한도 / 강제 종료 복구 / 연결 공유]")
+    with tempfile.TemporaryDirectory() as tmp:
+        check_backpressure_and_recovery(tmp, args.max_pending, args.stub_delay)
+        check_shared_connection(tmp, args.clients, args.per_client)
+    print("[+] painter 서비스 확인 통과")
+
+
+if __name__ == "__main__":
+    main()
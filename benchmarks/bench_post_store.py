@@ -0,0 +1,81 @@
+"""
+처리 이력 조회 비용 비교: 기존 방식(호출마다 sqlite3.connect) vs PostStore(상주 연결 + 메모리 인덱스)
+
+    python -m benchmarks.bench_post_store            # 10k, 1M
+    python -m benchmarks.bench_post_store --sizes 10000
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+from src.storage.post_store import PostStore
+
+CANDIDATES = 10  # run_pipeline이 서브레딧마다 확인하는 후보 수
+
+
+def build_db(path, size):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE posts (reddit_id TEXT PRIMARY KEY, title TEXT, processed_date TEXT, file_path TEXT)")
+    conn.executemany(
+        "INSERT INTO posts VALUES (?, ?, '2026-01-01 00:00:00', '')",
+        ((f"t3_{i:08x}", f"title {i}") for i in range(size))
+    )
+    conn.commit()
+    conn.close()
+
+
+def legacy_is_processed(db_path, reddit_id):
+    conn = sqlite3.connect(db_path)
+    result = conn.execute("SELECT 1 FROM posts WHERE reddit_id = ?", (reddit_id,)).fetchone()
+    conn.close()
+    return result is not None
+
+
+def bench(size, rounds):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        build_db(db_path, size)
+        # 절반은 이미 처리된 ID, 절반은 새 ID
+        batches = [
+            [f"t3_{(r * 7919 + i) % size:08x}" if i % 2 else f"new_{r}_{i}" for i in range(CANDIDATES)]
+            for r in range(rounds)
+        ]
+
+        started = time.perf_counter()
+        for batch in batches:
+            [i for i in batch if not legacy_is_processed(db_path, i)]
+        legacy = (time.perf_counter() - started) / rounds
+
+        started = time.perf_counter()
+        store = PostStore(db_path)
+        load = time.perf_counter() - started
+        mode = "set" if store.ids is not None else "bloom"
+
+        started = time.perf_counter()
+        for batch in batches:
+            store.filter_unprocessed(batch)
+        batched = (time.perf_counter() - started) / rounds
+
+        started = time.perf_counter()
+        bloom_store = PostStore(db_path, bloom_threshold=1)
+        bloom_load = time.perf_counter() - started
+        started = time.perf_counter()
+        for batch in batches:
+            bloom_store.filter_unprocessed(batch)
+        bloom = (time.perf_counter() - started) / rounds
+        store.close()
+        bloom_store.close()
+
+    print(f"[{size:>9,} ids] 기존 {legacy * 1e6:9.1f}us/배치 | PostStore({mode}) {batched * 1e6:7.1f}us/배치 "
+          f"| bloom {bloom * 1e6:7.1f}us/배치 | 인덱스 로드 {load * 1e3:.0f}ms (bloom 재로드 {bloom_load * 1e3:.0f}ms)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 1_000_000])
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+    for size in args.sizes:
+        bench(size, args.rounds)
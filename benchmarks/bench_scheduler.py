@@ -0,0 +1,132 @@
+"""
+PollScheduler 시뮬레이션: 가짜 시계 + 가짜 수집기로 일주일치를 몇 초 만에 돌려
+고정 1시간 간격(작업 스케줄러 방식)과 서브레딧별 적응형 간격을 비교합니다.
+
+임시 디렉터리에 실제 GTBManager를 만들고 run_daemon → collect_candidates → PollScheduler.observe 경로를 그대로 탑니다.
+수집기만 가짜이고, 글 생성/발행 대신 실행마다 서브레딧당 후보 1개를 처리한 것으로 기록합니다.
+
+가짜 피드는 서브레딧마다 정한 시간당 글 수(포아송)로 새 글이 올라오고, 최근 limit개만 보여 줍니다.
+수집하기 전에 피드에서 밀려난 글은 놓친 글로 셉니다.
+
+    python -m benchmarks.bench_scheduler
+    python -m benchmarks.bench_scheduler --days 14 --seed 3
+"""
+import argparse
+import bisect
+import contextlib
+import io
+import os
+import random
+import tempfile
+
+from manager import GTBManager
+from src.pipeline.scheduler import PollScheduler
+
+# 서브레딧별 시간당 새 글 수 (대략적인 활발함 차이)
+RATES = {
+    "Technology": 3.0, "ExplainLikeImFive": 2.0, "Gadgets": 1.5, "LifeProTips": 1.0,
+    "Supplements": 0.5, "HomeImprovement": 0.4, "BuyItForLife": 0.3, "Biohacking": 0.1,
+}
+
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class FakeFeeds:
+    """서브레딧별 글 도착 시각을 미리 만들어 두고, 시각 t에 최근 limit개를 보여 주는 수집기 (RedditCollector 대역)"""
+
+    def __init__(self, clock, rates, days, limit=10, seed=0):
+        rng = random.Random(seed)
+        self.clock, self.limit = clock, limit
+        self.arrivals = {}
+        for sub, per_hour in rates.items():
+            t, times = 0.0, []
+            while t < days * 86400:
+                t += rng.expovariate(per_hour / 3600)
+                times.append(t)
+            self.arrivals[sub] = times
+        self.seen = {sub: {} for sub in rates}   # 글 번호 -> 처음 본 시각
+        self.polls = 0
+
+    def fetch_top_posts(self, sub, limit=1):
+        now = self.clock()
+        self.polls += 1
+        visible = bisect.bisect_right(self.arrivals[sub], now)
+        posts = []
+        for i in reversed(range(max(0, visible - min(limit, self.limit)), visible)):
+            self.seen[sub].setdefault(i, now)
+            posts.append({"id": f"t3_{sub}_{i}", "title": f"{sub} #{i}"})
+        return posts
+
+    def stats(self, until):
+        total = missed = 0
+        delays = []
+        for sub, times in self.arrivals.items():
+            for i, t in enumerate(times):
+                if t > until:
+                    break
+                total += 1
+                if i in self.seen[sub]:
+                    delays.append(self.seen[sub][i] - t)
+                else:
+                    missed += 1
+        return total, missed, sum(delays) / len(delays) if delays else 0
+
+
+def simulate(days, seed, **scheduler_args):
+    clock = FakeClock()
+    feeds = FakeFeeds(clock, RATES, days, seed=seed)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                manager = GTBManager()
+                manager.collector = feeds
+
+                def run_pipeline(subs=None):
+                    # 실제 실행처럼 서브레딧마다 후보 1개만 발행되고 나머지는 다음 실행의 후보로 남음
+                    candidates = manager.collect_candidates(subs)
+                    manager.store.mark_processed_many(
+                        [(c[0]['id'], c[0]['title'], "db://bench") for c in candidates.values() if c])
+                    return []
+
+                manager.run_pipeline = run_pipeline
+                scheduler = PollScheduler(manager.target_subreddits, manager.db_path, clock=clock, sleep=clock.sleep,
+                                          rng=random.Random(seed), **scheduler_args)
+                manager.run_daemon(scheduler=scheduler, should_stop=lambda: clock() >= days * 86400)
+            intervals = {sub: s["interval"] for sub, s in scheduler.state.items()}
+            manager.store.close()
+            manager.jobs.close()
+        finally:
+            os.chdir(cwd)
+    return feeds.polls, feeds.stats(days * 86400), intervals
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    fixed = simulate(args.days, args.seed, min_interval=3600, max_interval=3600, jitter=0, max_in_flight=len(RATES))
+    adaptive = simulate(args.days, args.seed)
+    print(f"[{args.days}일, 서브레딧 {len(RATES)}개]")
+    for name, (polls, (total, missed, delay), _) in (("고정 1시간", fixed), ("적응형", adaptive)):
+        print(f"  {name:<10} 수집 {polls:>5}회  놓친 글 {missed:>5}/{total} ({missed / total:6.1%})  "
+              f"평균 발견 지연 {delay / 60:6.1f}분")
+    print("\n  적응형이 학습한 간격")
+    for sub, interval in sorted(adaptive[2].items(), key=lambda item: item[1]):
+        print(f"    {sub:<20}{RATES[sub]:>5.1f}개/시간 → {interval / 60:>5.0f}분")
+
+
+if __name__ == "__main__":
+    main()
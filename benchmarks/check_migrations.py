@@ -0,0 +1,191 @@
+"""
+마이그레이션 확인: 로컬 D1 대역 서버(SQLite)와 임시 gtb_storage.db에 마이그레이션을 적용하고
+자주 쓰는 조회의 EXPLAIN QUERY PLAN이 새 인덱스를 타는지 확인합니다. 하나라도 어긋나면 AssertionError.
+
+- 옛 스키마(마이그레이션 도입 전)에서 시작: 드라이런은 아무것도 바꾸지 않고, 적용 후에는 렌더링 컬럼/집계 테이블/인덱스가 생김
+- 다시 돌리면 적용할 것이 없음, 적용 기록(schema_migrations)과 체크섬이 남음
+- schema.sql로 새로 만든 DB에 적용해도 결과 인덱스가 같음 (schema.sql = 모든 마이그레이션 적용 결과)
+- 빈 gtb_storage.db / 캐시 파일을 각 클래스가 열면 local / cache 마이그레이션만으로 쓰는 테이블이 모두 생김
+
+    python -m benchmarks.check_migrations
+    python -m benchmarks.check_migrations --verbose    # 조회별 실행 계획 출력
+"""
+import argparse
+import contextlib
+import io
+import os
+import sqlite3
+import tempfile
+
+from src.collector.source_health import SourceHealth
+from src.common.http_cache import HttpCache
+from src.common.rate_limit import DailyQuota, TokenBucket
+from src.common.tracing import Tracer
+from src.common.ttl_cache import TTLCache
+from src.common.usage_log import UsageLog
+from src.painter.image_optimizer import ImageOptimizer
+from src.pipeline.scheduler import PollScheduler
+from src.publisher.d1_client import D1Client
+from src.publisher.d1_local_server import start_local_server
+from src.storage.migrations import DIRECTORIES, MigrationRunner, SQLiteTarget
+from src.storage.post_jobs import PostJobs
+from src.storage.post_store import PostStore
+from src.storage.topic_index import TopicIndex
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), "..", "schema.sql")
+CARD = "id, slug, title, summary, excerpt, reading_minutes, category, image_url, image_meta, created_at"
+
+# (설명, 조회, 실행 계획에 있어야 하는 문구) - 사이트/미러/집계 작업이 실제로 보내는 조회와 같은 모양
+HOT_QUERIES = [
+    ("index.astro 최신순 목록", f"SELECT {CARD} FROM posts ORDER BY created_at DESC",
+     "SCAN posts USING INDEX idx_posts_created"),
+    ("category 페이지", f"SELECT {CARD} FROM posts WHERE category = '건강' ORDER BY created_at DESC",
+     "SEARCH posts USING INDEX idx_posts_category_created (category=?)"),
+    ("미러 수정분 동기화",
+     "SELECT * FROM posts WHERE id <= 100 AND (updated_at > '2026-01-01' OR (updated_at = '2026-01-01' AND id > 5)) "
+     "ORDER BY updated_at, id LIMIT 500",
+     "idx_posts_updated"),
+    ("popular.astro 방문 합계",
+     "SELECT path, SUM(count) AS visits FROM stats_daily WHERE type = 'visit' AND path LIKE '/blog/%' GROUP BY path",
+     "SEARCH stats_daily USING COVERING INDEX idx_stats_daily_type_path (type=?)"),
+    ("admin 경로별 합계", "SELECT path, type, SUM(count) FROM stats_daily GROUP BY path, type",
+     "SCAN stats_daily USING COVERING INDEX idx_stats_daily_type_path"),
+    ("집계 전 최근 원본", "SELECT path, COUNT(*) FROM stats WHERE id > 100 AND type = 'visit' GROUP BY path",
+     "SEARCH stats USING INTEGER PRIMARY KEY (rowid>?)"),
+]
+
+OLD_SCHEMA = """
+CREATE TABLE stats (id INTEGER PRIMARY KEY AUTOINCREMENT, type TEXT NOT NULL, path TEXT, label TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP);
+CREATE TABLE posts (id INTEGER PRIMARY KEY AUTOINCREMENT, slug TEXT UNIQUE NOT NULL, title TEXT NOT NULL, summary TEXT,
+    content TEXT NOT NULL, category TEXT, image_url TEXT, created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP);
+"""
+
+
+def plan(db, sql):
+    return " / ".join(row["detail"] for row in db.query(f"EXPLAIN QUERY PLAN {sql}"))
+
+
+def indexes(db):
+    return {r["name"] for r in db.query("SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'")}
+
+
+def check_d1(tmp, verbose):
+    old_path = os.path.join(tmp, "old.sql")
+    with open(old_path, "w", encoding="utf-8") as f:
+        f.write(OLD_SCHEMA)
+    server, api_base = start_local_server(os.path.join(tmp, "d1.db"), schema_path=old_path)
+    d1 = D1Client("local", "local", "local", api_base=api_base)
+    try:
+        d1.batch([("INSERT INTO posts (slug, title, content, category) VALUES (?, ?, ?, ?)",
+                   (f"s{i}", f"title {i}", f"## 제목 {i}\n본문", "건강" if i % 2 else "IT테크")) for i in range(200)])
+        runner = MigrationRunner(d1, DIRECTORIES["d1"])
+
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            planned = runner.migrate(dry_run=True)
+        assert [m.version for m in planned] == [m.version for m in runner.migrations], planned
+        assert "CREATE INDEX IF NOT EXISTS idx_posts_category_created" in out.getvalue()
+        assert not runner.applied() and not indexes(d1), "드라이런이 DB를 바꿨습니다"
+        if verbose:
+            print(out.getvalue())
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            applied = runner.migrate()
+        assert len(applied) == len(runner.migrations)
+        assert runner.migrate(quiet=True) == [], "두 번째 실행에 적용할 것이 남았습니다"
+        columns = {r["name"] for r in d1.query("PRAGMA table_info(posts)")}
+        assert {"content_html", "excerpt", "reading_minutes", "toc", "image_meta"} <= columns, columns
+        assert {r["version"] for r in d1.query("SELECT version FROM schema_migrations")} == \
+            {m.version for m in runner.migrations}
+
+        d1.batch([("INSERT INTO stats (type, path) VALUES (?, ?)", ("visit", f"/blog/s{i % 50}")) for i in range(500)])
+        d1.batch([("INSERT INTO stats_daily (date, type, path, count) VALUES (?, 'visit', ?, 1)",
+                   (f"2026-09-{1 + i % 28:02d}", f"/blog/s{i}")) for i in range(200)])
+
+        print("[D1 대역: 옛 스키마 → 마이그레이션]")
+        for name, sql, expected in HOT_QUERIES:
+            detail = plan(d1, sql)
+            ok = expected in detail
+            print(f"  {'OK ' if ok else 'FAIL'} {name:<26}{detail if verbose or not ok else ''}")
+            assert ok, f"{name}: '{expected}'가 실행 계획에 없습니다: {detail}"
+        return indexes(d1)
+    finally:
+        d1.close()
+        server.shutdown()
+        server.server_close()
+
+
+def check_fresh_schema(tmp, migrated_indexes):
+    """schema.sql로 만든 새 DB에 마이그레이션을 돌려도 아무것도 바뀌지 않고 인덱스가 같아야 함"""
+    conn = sqlite3.connect(os.path.join(tmp, "fresh.db"), isolation_level=None)
+    with open(SCHEMA_PATH, encoding="utf-8") as f:
+        conn.executescript(f.read())
+    db = SQLiteTarget(conn)
+    before = indexes(db)
+    with contextlib.redirect_stdout(io.StringIO()):
+        MigrationRunner(db, DIRECTORIES["d1"]).migrate()
+    assert before == indexes(db) == migrated_indexes, (before, indexes(db), migrated_indexes)
+    conn.close()
+    print(f"  OK  schema.sql = 마이그레이션 결과 (인덱스 {len(before)}개)")
+
+
+def check_local(tmp):
+    """이전 버전이 만든 gtb_storage.db도 PostStore가 열 때 기록만 남기고 그대로 씀"""
+    path = os.path.join(tmp, "gtb_storage.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE posts (reddit_id TEXT PRIMARY KEY, title TEXT, processed_date TEXT, file_path TEXT)")
+    conn.execute("INSERT INTO posts VALUES ('t3_old', 'old', '2026-01-01', 'db://x')")
+    conn.commit()
+    conn.close()
+    store = PostStore(path)
+    assert store.is_processed("t3_old")
+    versions = [r[0] for r in store.conn.execute("SELECT version FROM schema_migrations")]
+    assert versions == [m.version for m in MigrationRunner(SQLiteTarget(store.conn), DIRECTORIES["local"]).migrations]
+    store.close()
+    print(f"  OK  기존 gtb_storage.db에 local 마이그레이션 {versions} 기록")
+
+
+def tables(path):
+    conn = sqlite3.connect(path)
+    names = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    conn.close()
+    return names
+
+
+def check_local_tables(tmp):
+    """새 gtb_storage.db / 캐시 파일을 각 클래스가 열기만 해도 쓰는 테이블이 마이그레이션으로 생김"""
+    path = os.path.join(tmp, "fresh_storage.db")
+    opened = [PostStore(path), PostJobs(path), TopicIndex(path), DailyQuota("google", 100, path),
+              TokenBucket("coupang", 10, 3600, path), UsageLog(path), SourceHealth(path), PollScheduler([], path),
+              ImageOptimizer(path)]
+    Tracer(path)._connect().close()
+    expected = {"posts", "posts_bloom", "post_jobs", "runs", "spans", "topic_docs", "api_quota", "token_bucket",
+                "llm_usage", "source_health", "poll_schedule", "poll_seen", "image_variants", "image_sources"}
+    missing = expected - tables(path)
+    assert not missing, f"gtb_storage.db에 없는 테이블: {missing}"
+    for obj in opened:
+        obj.conn.close()
+    print(f"  OK  새 gtb_storage.db에 local 마이그레이션으로 테이블 {len(expected)}개")
+
+    for name, open_cache in (("http_cache.db", HttpCache), ("cache.db", lambda p: TTLCache("check", 60, p))):
+        cache_path = os.path.join(tmp, name)
+        open_cache(cache_path).conn.close()
+        assert {"http_cache", "kv_cache"} <= tables(cache_path), tables(cache_path)
+    print("  OK  http_cache.db / cache.db에 cache 마이그레이션")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        migrated = check_d1(tmp, args.verbose)
+        check_fresh_schema(tmp, migrated)
+        check_local(tmp)
+        check_local_tables(tmp)
+    print("[+] 마이그레이션 확인 통과")
+
+
+if __name__ == "__main__":
+    main()
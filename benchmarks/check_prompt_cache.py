@@ -0,0 +1,94 @@
+"""
+Claude 시스템 프롬프트 캐시 확인.
+
+- 오프라인: 캐시 쓰기/읽기가 모두 0인 응답이면 ClaudeProcessor가 한 번만 경고하는지 (가짜 usage)
+- ANTHROPIC_API_KEY가 있으면: count_tokens로 SYSTEM_PROMPT 토큰 수가 최소 캐시 길이를 넉넉히 넘는지
+- --live: 실제로 max_tokens=1 요청을 두 번 보내 첫 번째는 캐시 쓰기, 두 번째는 캐시 읽기가 나오는지 (소액 과금)
+
+    python -m benchmarks.check_prompt_cache
+    python -m benchmarks.check_prompt_cache --live
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+
+from src.common.usage_log import UsageLog
+from src.processor.claude_processor import SYSTEM_PROMPT, ClaudeProcessor
+
+# Sonnet / Opus의 최소 캐시 길이. 이보다 짧으면 cache_control이 조용히 무시됨
+MIN_CACHE_TOKENS = 1024
+# 지시문을 조금 줄여도 꺼지지 않도록 요구하는 여유
+MARGIN = 1.5
+
+
+def usage(input_tokens, creation=0, read=0):
+    return SimpleNamespace(usage=SimpleNamespace(input_tokens=input_tokens, output_tokens=1,
+                                                 cache_creation_input_tokens=creation, cache_read_input_tokens=read))
+
+
+def check_warning(tmp):
+    processor = ClaudeProcessor(UsageLog(os.path.join(tmp, "usage.db")))
+    with contextlib.redirect_stdout(io.StringIO()) as out:
+        processor._record_usage("stream_post", usage(300, creation=2400), time.perf_counter())
+        processor._record_usage("stream_post", usage(300, read=2400), time.perf_counter())
+    assert "캐시가 적용되지 않았습니다" not in out.getvalue(), out.getvalue()
+    with contextlib.redirect_stdout(io.StringIO()) as out:
+        processor._record_usage("stream_post", usage(2700), time.perf_counter())
+        processor._record_usage("stream_post", usage(2700), time.perf_counter())
+    assert out.getvalue().count("캐시가 적용되지 않았습니다") == 1, out.getvalue()
+    processor.usage_log.close()
+    print("  OK  캐시 쓰기/읽기가 없는 응답에서만 한 번 경고")
+
+
+def count_system_tokens(processor):
+    """system 블록이 있을 때와 없을 때의 입력 토큰 차이"""
+    messages = [{"role": "user", "content": "."}]
+    with_system = processor.client.messages.count_tokens(model=processor.model, system=processor.system,
+                                                         messages=messages).input_tokens
+    without = processor.client.messages.count_tokens(model=processor.model, messages=messages).input_tokens
+    return with_system - without
+
+
+def check_live(processor):
+    results = []
+    for _ in range(2):
+        message = processor.client.messages.create(model=processor.model, max_tokens=1, system=processor.system,
+                                                   messages=[{"role": "user", "content": "출력 형식을 이해했으면 '네'"}])
+        results.append(message.usage)
+    first, second = results
+    print(f"  1회차: 캐시 쓰기 {first.cache_creation_input_tokens or 0:,} / 읽기 {first.cache_read_input_tokens or 0:,}")
+    print(f"  2회차: 캐시 쓰기 {second.cache_creation_input_tokens or 0:,} / 읽기 {second.cache_read_input_tokens or 0:,}")
+    # 1회차는 이미 5분 안에 다른 호출이 캐시를 만들어 두었다면 읽기로 나올 수도 있음
+    assert (first.cache_creation_input_tokens or first.cache_read_input_tokens), "1회차에 캐시가 쓰이지 않았습니다"
+    assert second.cache_read_input_tokens, "2회차에 캐시 읽기가 없습니다"
+    print("  OK  두 번째 호출부터 시스템 프롬프트를 캐시에서 읽음")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--live", action="store_true", help="실제 요청 2회로 캐시 쓰기/읽기 확인 (소액 과금)")
+    args = parser.parse_args()
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    print(f"[Claude 시스템 프롬프트 캐시] SYSTEM_PROMPT {len(SYSTEM_PROMPT):,}자")
+    with tempfile.TemporaryDirectory() as tmp:
+        check_warning(tmp)
+        if not os.getenv("ANTHROPIC_API_KEY"):
+            print("  --  ANTHROPIC_API_KEY가 없어 토큰 수 / 실제 캐시 확인은 건너뜁니다")
+            return
+        processor = ClaudeProcessor(UsageLog(os.path.join(tmp, "usage.db")))
+        tokens = count_system_tokens(processor)
+        print(f"  시스템 프롬프트 {tokens:,}토큰 (최소 캐시 길이 {MIN_CACHE_TOKENS:,}토큰의 {tokens / MIN_CACHE_TOKENS:.1f}배)")
+        assert tokens >= MIN_CACHE_TOKENS * MARGIN, f"최소 캐시 길이의 {MARGIN}배보다 짧습니다"
+        if args.live:
+            check_live(processor)
+    print("[+] 프롬프트 캐시 확인 통과")
+
+
+if __name__ == "__main__":
+    main()
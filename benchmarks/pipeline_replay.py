@@ -0,0 +1,146 @@
+"""
+녹화(src/common/cassette.py)로 GTBManager 파이프라인을 네트워크·GPU·Cloudflare 없이 한 번 돌립니다.
+
+- 작업 디렉터리는 임시 폴더 (data/, public/이 저장소에 쓰이지 않음)
+- D1은 로컬 대역 서버(src/publisher/d1_local_server.py), git push는 임시 폴더의 bare 저장소로
+- painter는 녹화 재생 시 StubPainter (1x1 PNG)
+
+    python -m benchmarks.pipeline_replay                              # 합성 녹화
+    python -m benchmarks.pipeline_replay --cassette data/cassettes/run.json --speed 1 --async
+"""
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import sqlite3
+import subprocess
+import tempfile
+import time
+
+from benchmarks.synthetic import pipeline_interactions
+from src.common import http_cache
+from src.common.cassette import Cassette, install, uninstall
+from src.publisher.d1_local_server import start_local_server
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# 재생할 때는 값이 무엇이든 상관없지만 클라이언트 생성자가 비어 있으면 실패하는 키들
+DUMMY_ENV = {
+    "ANTHROPIC_API_KEY": "replay", "GEMINI_API_KEY": "replay",
+    "GOOGLE_SEARCH_API_KEY": "replay", "GOOGLE_SEARCH_CX": "replay",
+    "COUPANG_ACCESS_KEY": "replay", "COUPANG_SECRET_KEY": "replay", "COUPANG_SEARCH_HOURLY_LIMIT": "1000",
+    "CLOUDFLARE_ACCOUNT_ID": "local", "CLOUDFLARE_D1_DATABASE_ID": "local", "CLOUDFLARE_API_TOKEN": "local",
+    "PAINTER_MODE": "",
+}
+
+
+def init_git(path, remote="remote.git"):
+    """path를 git 저장소로 만들고 같은 폴더의 bare 저장소를 origin으로 연결합니다. (첫 커밋까지 push)"""
+    def git(*args):
+        subprocess.run(["git", *args], cwd=path, check=True, capture_output=True)
+    subprocess.run(["git", "init", "-q", "--bare", "-b", "main", remote], cwd=path, check=True, capture_output=True)
+    git("init", "-q", "-b", "main")
+    git("config", "user.name", "replay")
+    git("config", "user.email", "replay@localhost")
+    git("config", "commit.gpgsign", "false")
+    git("remote", "add", "origin", remote)
+    with open(os.path.join(path, ".gitignore"), "w") as f:
+        f.write("data/\n*.db*\nremote.git/\n")
+    git("add", ".gitignore")
+    git("commit", "-q", "-m", "init")
+    git("push", "-q", "origin", "main")
+
+
+def remote_commits(path, remote="remote.git"):
+    result = subprocess.run(["git", "--git-dir", remote, "rev-list", "--count", "main"], cwd=path,
+                            capture_output=True, text=True)
+    return int(result.stdout.strip() or 0)
+
+
+def seed_posts(db_path, n):
+    """기존 발행 글 n개를 로컬 D1에 넣어 둠 (사이트맵/미러 동기화 비용이 글 수에 따라 어떻게 느는지 보기 위함)"""
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.executemany(
+            "INSERT INTO posts (slug, title, summary, content, category, image_url) VALUES (?, ?, '', ?, 'IT테크', ?)",
+            ((f"20260101-seed{i:07x}", f"seed {i}", "본문 " * 50, f"/images/seed{i}.png") for i in range(n))
+        )
+    conn.close()
+
+
+@contextlib.contextmanager
+def _sandbox(env):
+    cwd = os.getcwd()
+    saved = {k: os.environ.get(k) for k in env}
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copy(os.path.join(REPO_ROOT, "schema.sql"), tmp)
+        os.chdir(tmp)
+        os.environ.update(env)
+        http_cache._default_cache = None
+        try:
+            yield tmp
+        finally:
+            http_cache._default_cache = None
+            uninstall()
+            os.chdir(cwd)
+            for k, v in saved.items():
+                if v is None:
+                    os.environ.pop(k, None)
+                else:
+                    os.environ[k] = v
+
+
+def replay_pipeline(cassette=None, use_async=False, existing_posts=0, quiet=True, speed=0.0):
+    """
+    파이프라인 1회 재생. cassette가 없으면 manager의 서브레딧 목록으로 합성 녹화를 만듭니다.
+    걸린 시간에는 백그라운드 push가 끝나기를 기다리는 시간(manager.close)까지 들어갑니다.
+    (걸린 초, 발행한 slug 목록, 원격 커밋 수, cassette) 반환
+    """
+    with _sandbox(DUMMY_ENV) as tmp:
+        init_git(tmp)
+        server, api_base = start_local_server(os.path.join(tmp, "d1.db"), schema_path="schema.sql")
+        try:
+            if existing_posts:
+                seed_posts(os.path.join(tmp, "d1.db"), existing_posts)
+            os.environ["D1_API_BASE"] = api_base
+            output = io.StringIO() if quiet else None
+            with contextlib.redirect_stdout(output) if quiet else contextlib.nullcontext():
+                from manager import GTBManager
+                manager = GTBManager()
+                if cassette is None:
+                    cassette = Cassette.from_interactions(pipeline_interactions(manager.target_subreddits), speed=speed)
+                install(manager, cassette)
+                started = time.perf_counter()
+                try:
+                    published = manager.run_pipeline_async() if use_async else manager.run_pipeline()
+                    manager.close()
+                    elapsed = time.perf_counter() - started
+                finally:
+                    # 실행마다 새 manager를 만들므로 이미지 변환 프로세스 풀을 남겨 두지 않음
+                    if "optimizer" in manager.__dict__:
+                        manager.optimizer.close()
+            return elapsed, published, remote_commits(tmp), cassette
+        finally:
+            os.environ.pop("D1_API_BASE", None)
+            server.shutdown()
+            server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cassette", help="manager.py --record로 만든 녹화 (없으면 합성 녹화)")
+    parser.add_argument("--speed", type=float, default=0.0, help="녹화된 지연 × speed만큼 대기 (0 = 즉시)")
+    parser.add_argument("--async", dest="use_async", action="store_true")
+    parser.add_argument("--existing-posts", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    cassette = Cassette(args.cassette, speed=args.speed) if args.cassette else None
+    elapsed, published, commits, cassette = replay_pipeline(cassette, args.use_async, args.existing_posts,
+                                                            quiet=not args.verbose, speed=args.speed)
+    print(f"{'async' if args.use_async else 'sync'} 파이프라인 재생: {elapsed:.2f}s, {len(published)}개 발행, "
+          f"원격 커밋 {commits}개 (첫 커밋 포함), 남은 녹화 {cassette.unused()}건")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+파이프라인 벤치마크 모음 + 기준값(baseline) 비교.
+
+- pipeline: 합성(또는 --cassette) 녹화로 GTBManager.run_pipeline 전체를 재생 (기존 글 수별)
+- parse_claude_result / _parse_reddit_rss / generate_sitemap / sanitize_filename: 합성 데이터 10 ~ 100k건
+
+    python -m benchmarks.suite                      # 실행 후 benchmarks/baselines.json과 비교, 느려졌으면 종료 코드 1
+    python -m benchmarks.suite --save               # 현재 결과를 기준값으로 저장
+    python -m benchmarks.suite --only sitemap --sizes 10 1000
+    python -m benchmarks.suite --cassette data/cassettes/run.json --only pipeline
+
+기준값은 측정한 기계에 묶인 값이라 다른 기계에서는 --save로 새로 만든 뒤 비교합니다.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+from benchmarks import synthetic
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines.json")
+SIZES = (10, 1000, 10000, 100000)
+# 파이프라인 재생은 미러 동기화가 HTTP로 전체를 받아 오므로 10k까지만 기본 측정
+PIPELINE_SIZES = (10, 1000, 10000)
+# 이보다 짧은 차이는 측정 잡음으로 보고 회귀로 치지 않음
+MIN_REGRESSION_SECONDS = 0.002
+
+
+def _timeit(fn, repeat):
+    """fn을 repeat번 실행한 시간의 중앙값(초). 출력은 버림"""
+    times = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - started)
+    return statistics.median(times)
+
+
+def _repeat_for(size):
+    return 7 if size <= 1000 else 3 if size <= 10000 else 1
+
+
+def bench_parse_claude_result(size):
+    """Claude 응답 size개 파싱 (글 하나당 1회)"""
+    from manager import GTBManager
+    manager = GTBManager.__new__(GTBManager)
+    texts = [synthetic.make_claude_text(i) for i in range(min(size, 200))]
+    n = len(texts)
+    return _timeit(lambda: [manager.parse_claude_result(texts[i % n]) for i in range(size)], _repeat_for(size))
+
+
+def bench_parse_reddit_rss(size):
+    """항목 size개짜리 Atom 피드를 끝까지 파싱"""
+    from src.collector.reddit_collector import RedditCollector
+    collector = RedditCollector.__new__(RedditCollector)
+    xml_text = synthetic.make_reddit_feed(size)
+    return _timeit(lambda: collector._parse_reddit_rss(xml_text, size), _repeat_for(size))
+
+
+def bench_sitemap(size):
+    """글 size개로 사이트맵(필요하면 샤드) 전체 쓰기. 매번 빈 상태에서 시작"""
+    import generate_sitemap
+    posts = synthetic.make_posts(size)
+
+    def run():
+        with tempfile.TemporaryDirectory() as tmp:
+            state = generate_sitemap.SitemapState(os.path.join(tmp, "state.db"))
+            try:
+                generate_sitemap.build_sitemaps(posts, state, output_dir=tmp)
+            finally:
+                state.close()
+    return _timeit(run, _repeat_for(size))
+
+
+def bench_sanitize_filename(size):
+    from manager import GTBManager
+    manager = GTBManager.__new__(GTBManager)
+    titles = synthetic.make_titles(size)
+    return _timeit(lambda: [manager.sanitize_filename(t) for t in titles], _repeat_for(size))
+
+
+def bench_pipeline(size, cassette_path=None):
+    """기존 글 size개가 있는 상태에서 파이프라인 1회 재생 (녹화 지연은 기다리지 않음)"""
+    from benchmarks.pipeline_replay import replay_pipeline
+    from src.common.cassette import Cassette
+    times = []
+    for _ in range(3 if size <= 1000 else 1):
+        cassette = Cassette(cassette_path) if cassette_path else None
+        elapsed, published, _, _ = replay_pipeline(cassette, existing_posts=size)
+        if not published:
+            raise RuntimeError("재생한 파이프라인이 글을 하나도 발행하지 못했습니다.")
+        times.append(elapsed)
+    return statistics.median(times)
+
+
+BENCHMARKS = {
+    "pipeline": (bench_pipeline, PIPELINE_SIZES),
+    "parse_claude_result": (bench_parse_claude_result, SIZES),
+    "parse_reddit_rss": (bench_parse_reddit_rss, SIZES),
+    "sitemap": (bench_sitemap, SIZES),
+    "sanitize_filename": (bench_sanitize_filename, SIZES),
+}
+
+
+def run(only=None, sizes=None, cassette_path=None):
+    results = {}
+    for name, (fn, default_sizes) in BENCHMARKS.items():
+        if only and name not in only:
+            continue
+        for size in sizes or default_sizes:
+            if name == "pipeline":
+                seconds = fn(size, cassette_path)
+            else:
+                seconds = fn(size)
+            key = f"{name}[{size}]"
+            results[key] = seconds
+            print(f"  {key:<30}{seconds * 1000:>12.2f}ms", flush=True)
+    return results
+
+
+def machine():
+    return {"python": platform.python_version(), "machine": platform.machine(), "system": platform.system()}
+
+
+def load_baseline(path=BASELINE_PATH):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    baseline = load_baseline(path) or {"results": {}}
+    baseline["machine"] = machine()
+    baseline["results"].update({k: round(v, 6) for k, v in results.items()})
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write("\n")
+    print(f"[+] 기준값 {len(results)}개 저장: {path}")
+
+
+def compare(results, baseline, tolerance):
+    """(회귀 목록, 출력 줄) 반환. 기준값보다 tolerance 비율 이상 느리면 회귀"""
+    regressions, lines = [], []
+    for key, seconds in results.items():
+        base = baseline["results"].get(key)
+        if base is None:
+            lines.append(f"  {key:<30} 기준값 없음")
+            continue
+        ratio = seconds / base if base else float("inf")
+        slower = seconds > base * (1 + tolerance) and seconds - base > MIN_REGRESSION_SECONDS
+        mark = "  ← 회귀" if slower else ""
+        lines.append(f"  {key:<30}{base * 1000:>12.2f}ms →{seconds * 1000:>10.2f}ms  x{ratio:.2f}{mark}")
+        if slower:
+            regressions.append(key)
+    return regressions, lines
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="일부 벤치마크만 실행")
+    parser.add_argument("--sizes", nargs="+", type=int, help="데이터 크기 (기본 10 1000 10000 100000)")
+    parser.add_argument("--cassette", help="파이프라인 재생에 쓸 녹화 (없으면 합성 녹화)")
+    parser.add_argument("--save", action="store_true", help="결과를 기준값으로 저장")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="허용 배율 (0.5 = 기준값보다 50%%까지 느려도 통과)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    args = parser.parse_args()
+
+    print("[*] 벤치마크 실행 중...")
+    results = run(args.only, args.sizes, args.cassette)
+    if args.save:
+        save_baseline(results, args.baseline)
+        return
+
+    baseline = load_baseline(args.baseline)
+    if not baseline:
+        print("[!] 기준값이 없습니다. --save로 먼저 저장하세요.")
+        return
+    if baseline.get("machine") != machine():
+        print(f"[!] 기준값을 측정한 환경이 다릅니다: {baseline.get('machine')} (현재 {machine()})")
+    regressions, lines = compare(results, baseline, args.tolerance)
+    print("\n[*] 기준값 비교")
+    print("\n".join(lines))
+    if regressions:
+        print(f"\n[!] 성능 회귀 {len(regressions)}건: {', '.join(regressions)}")
+        sys.exit(1)
+    print("\n[+] 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+벤치마크용 합성 데이터: 사이트맵 포스트 행, Reddit Atom 피드, Claude 응답, 제목, 파이프라인 재생용 녹화.
+같은 크기면 항상 같은 데이터가 나오도록 난수 시드를 고정합니다.
+"""
+import json
+import random
+from html import escape
+
+WORDS = ("magnesium glycinate sleep creatine whey protein omega oil vitamin zinc melatonin dose effect brand "
+         "quality cheap study morning evening oled ips monitor laptop battery router mesh ssd nvme").split()
+KOREAN = "비교 차이 선택 가이드 가격 성능 장점 단점 추천 후기 구매 효과 사용 환경 한국 소비자".split()
+
+
+def _words(rng, n, vocab=WORDS):
+    return " ".join(rng.choice(vocab) for _ in range(n))
+
+
+def make_posts(n, seed=0):
+    """generate_sitemap이 읽는 posts 행 (id, slug, image_url, created_at, updated_at)"""
+    rng = random.Random(seed)
+    posts = []
+    for i in range(1, n + 1):
+        created = f"2026-{1 + i % 12:02d}-{1 + i % 28:02d} 0{i % 10}:00:00"
+        posts.append({
+            "id": i,
+            "slug": f"2026{1 + i % 12:02d}{1 + i % 28:02d}-t3_{i:07x}",
+            "image_url": f"/images/opt/{i:08x}-1200.webp" if rng.random() < 0.9 else None,
+            "created_at": created,
+            "updated_at": created if rng.random() < 0.8 else f"2026-10-{1 + i % 28:02d} 12:00:00",
+        })
+    return posts
+
+
+def make_reddit_feed(n, sub="Supplements", seed=0, id_prefix=""):
+    """old.reddit.com /top/.rss 형식의 Atom 피드 (항목 n개)"""
+    rng = random.Random(seed)
+    entries = []
+    for i in range(n):
+        post_id = f"{id_prefix}{i:07x}"
+        body = "".join(f"<p>{_words(rng, 40)}</p>" for _ in range(3))
+        content = escape(f'<!-- SC_OFF --><div class="md">{body}</div><!-- SC_ON --> submitted by '
+                         f'<a href="https://old.reddit.com/user/u{i}"> /u/u{i} </a>')
+        link = f"https://old.reddit.com/r/{sub}/comments/{post_id}/x/"
+        entries.append(
+            f'<entry><author><name>/u/u{i}</name></author><category term="{sub}" label="r/{sub}"/>'
+            f'<content type="html">{content}</content><id>t3_{post_id}</id><link href="{link}" />'
+            f'<updated>2026-02-06T01:00:00+00:00</updated><title>{escape(_words(rng, 8).capitalize())}?</title></entry>'
+        )
+    return ('<?xml version="1.0" encoding="UTF-8"?><feed xmlns="http://www.w3.org/2005/Atom">'
+            f'<title>top scoring links : {sub}</title>{"".join(entries)}</feed>')
+
+
+def make_claude_text(i=0, paragraphs=12, seed=0):
+    """ClaudeProcessor 출력 형식(VS_TITLE ... CONTENT)을 따르는 응답 본문"""
+    rng = random.Random(seed * 100003 + i)
+    a, b = rng.sample(WORDS, 2)
+    body = ["## 서론 (왜 비교해야 하는가)", _words(rng, 60, KOREAN),
+            "## 한눈에 보는 비교표", f"| 항목 | {a} | {b} |", "|---|---|---|"]
+    body += [f"| {_words(rng, 1, KOREAN)} | {rng.randint(1, 99)} | {rng.randint(1, 99)} |" for _ in range(6)]
+    body.append("## 상세 비교 분석")
+    for p in range(paragraphs):
+        body += [f"### 항목 {p + 1}", _words(rng, 80, KOREAN), "---" if p % 4 == 3 else ""]
+    body += ["## 결론: 당신에게 맞는 선택은?", _words(rng, 40, KOREAN)]
+    return (f"VS_TITLE: {a} vs {b}\n---\nTITLE: {a} vs {b}: 핵심 차이점과 선택 가이드\n---\n"
+            f"SUMMARY: {_words(rng, 30, KOREAN)}\n---\n"
+            f"IMAGE_PROMPT: {a} and {b} side by side, studio lighting\n---\n"
+            f"KEYWORDS: {a} vs {b}, {a} {b} 비교, {a} {b} 차이\n---\n"
+            f"CONTENT: " + "\n".join(body))
+
+
+def make_titles(n, seed=0):
+    """sanitize_filename 입력 (금지 문자, 공백, 한글 섞인 제목)"""
+    rng = random.Random(seed)
+    marks = '/:*?"<>| '
+    return [f"{_words(rng, 3)}{rng.choice(marks)}{_words(rng, 2, KOREAN)}{rng.choice(marks)}{_words(rng, 4)}"
+            for _ in range(n)]
+
+
+def _chunks(text, size=24, interval=0.02):
+    return [[round((i // size + 1) * interval, 4), text[i:i + size]] for i in range(0, len(text), size)]
+
+
+def pipeline_interactions(subs, candidates=10, seed=0):
+    """
+    GTBManager.run_pipeline 한 번을 재생할 수 있는 합성 녹화 항목.
+    seconds는 실제 API에서 흔히 보던 대략의 지연이라 speed를 주면 그만큼 기다립니다.
+    """
+    interactions = []
+    for n, sub in enumerate(subs):
+        interactions.append({
+            "kind": "http", "key": f"https://old.reddit.com/r/{sub}/top/.rss?t=day",
+            "response": {"status_code": 200, "headers": {"Content-Type": "application/atom+xml"},
+                         "body": make_reddit_feed(candidates, sub, seed + n, id_prefix=f"{n:x}")},
+            "seconds": 0.4,
+        })
+
+    ranking = {"categories": [{
+        "category": sub, "winner_index": 0, "reason": "비교 수요가 높음", "compare_a": f"{sub} A", "compare_b": f"{sub} B",
+        "target_keywords": f"{sub} A vs B, {sub} A B 비교, {sub} A B 차이",
+        "scores": [{"index": i, "score": 90 - i} for i in range(candidates)],
+    } for sub in subs]}
+    interactions.append({"kind": "gemini", "key": None, "response": {"text": json.dumps(ranking, ensure_ascii=False)},
+                         "seconds": 3.0})
+
+    search = {"items": [{"title": f"검색 결과 {i}", "snippet": "요약", "link": f"https://example.com/{i}"} for i in range(5)]}
+    products = {"data": {"productData": [
+        {"productName": f"상품 {i}", "productPrice": 10000 + i, "productUrl": f"https://link.coupang.com/{i}",
+         "productImage": f"https://image.coupang.com/{i}.jpg"} for i in range(3)]}}
+    for n, sub in enumerate(subs):
+        interactions += [{"kind": "http", "key": "https://www.googleapis.com/customsearch/v1*",
+                          "response": {"status_code": 200, "headers": {}, "body": json.dumps(search, ensure_ascii=False)},
+                          "seconds": 0.3} for _ in range(3)]
+        text = make_claude_text(n, seed=seed)
+        interactions.append({
+            "kind": "claude_stream", "key": None,
+            "response": {"text": text, "chunks": _chunks(text),
+                         "usage": {"input_tokens": 900, "output_tokens": 2500,
+                                   "cache_creation_input_tokens": 0, "cache_read_input_tokens": 1100}},
+            "seconds": _chunks(text)[-1][0],
+        })
+        interactions.append({"kind": "painter", "key": None, "response": {}, "seconds": 20.0})
+        interactions += [{"kind": "http", "key": "https://api-gateway.coupang.com/*",
+                          "response": {"status_code": 200, "headers": {}, "body": json.dumps(products, ensure_ascii=False)},
+                          "seconds": 0.5} for _ in range(2)]
+    return interactions
@@ -1,16 +1,36 @@
 """
-D1 DB에서 모든 포스트를 조회하여 public/sitemap.xml 정적 파일을 생성합니다.
+D1 DB의 포스트로 public/sitemap.xml 정적 파일을 생성합니다.
 manager.py 파이프라인 실행 후 또는 단독 실행 가능.
+
+- URL이 MAX_URLS_PER_FILE을 넘으면 sitemap.xml을 인덱스로 바꾸고 sitemap-static.xml / sitemap-posts-N.xml로 나눕니다.
+  포스트 샤드는 id 범위(SHARD_SIZE개씩)로 고정이라 새 글은 마지막 샤드만 바꿉니다.
+- 샤드별 내용 해시를 data/gtb_storage.db의 sitemap_shards에 저장해 바뀐 샤드만 다시 씁니다.
+- 파일마다 .gz 사본을 함께 씁니다.
+- 원격 D1 대신 증분 동기화한 로컬 사본(src/storage/d1_mirror.py)을 읽습니다.
+  (개수, 최대 id, 최대 updated_at)이 지난번과 같으면 바로 끝냅니다.
 """
-import json
+import gzip
+import hashlib
 import os
-import shutil
-import subprocess
+import sqlite3
 import urllib.parse
+from datetime import datetime
+from xml.sax.saxutils import escape
+
+from src.publisher.d1_client import D1Client
+from src.storage.d1_mirror import D1Mirror
 
 SITE = "https://auto-blogs-7i9.pages.dev"
-DB_NAME = "auto-blog-db"
-OUTPUT_PATH = "public/sitemap.xml"
+OUTPUT_DIR = "public"
+OUTPUT_PATH = f"{OUTPUT_DIR}/sitemap.xml"
+STATE_DB = "data/gtb_storage.db"
+
+# 프로토콜 한도는 파일당 50,000 URL / 50MB(비압축). 여유를 두고 나눔
+MAX_URLS_PER_FILE = 45000
+MAX_BYTES_PER_FILE = 45 * 1024 * 1024
+SHARD_SIZE = 40000
+# 출력 형식을 바꾸면 올려서 모든 샤드를 다시 쓰게 함
+FORMAT_VERSION = "2"
 
 STATIC_PAGES = [
     {"url": "/", "changefreq": "daily", "priority": "1.0"},
@@ -20,66 +40,223 @@ STATIC_PAGES = [
     {"url": f"/category/{urllib.parse.quote('라이프')}", "changefreq": "daily", "priority": "0.7"},
 ]
 
+URLSET_OPEN = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+               '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+               'xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">\n')
+URLSET_CLOSE = '</urlset>\n'
+INDEX_OPEN = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+              '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+INDEX_CLOSE = '</sitemapindex>\n'
+
+
+def fetch_watermark(client):
+    """포스트 테이블이 바뀌었는지 판단할 값 (개수, 최대 id, 최대 updated_at)"""
+    rows = client.query(
+        "SELECT COUNT(*) AS count, MAX(id) AS max_id, MAX(COALESCE(updated_at, created_at)) AS last_update FROM posts"
+    )
+    row = rows[0] if rows else {}
+    return f"{FORMAT_VERSION}|{SITE}|{row.get('count')}|{row.get('max_id')}|{row.get('last_update')}"
 
-def fetch_posts_from_d1():
-    """wrangler d1 execute로 모든 포스트 slug/날짜를 조회"""
+
+def _select_posts(client):
+    return client.query(
+        "SELECT id, slug, image_url, created_at, COALESCE(updated_at, created_at) AS updated_at "
+        "FROM posts ORDER BY id"
+    )
+
+
+def fetch_posts_from_d1(client=None):
+    """D1 REST API로 사이트맵에 필요한 컬럼만 id 순으로 조회 (client를 넘기면 기존 세션 재사용)"""
     try:
-        npx_path = shutil.which("npx") or "npx"
-        result = subprocess.run(
-            [npx_path, "wrangler", "d1", "execute", DB_NAME, "--remote",
-             "--command=SELECT slug, created_at FROM posts ORDER BY created_at DESC",
-             "--json"],
-            capture_output=True, text=True, timeout=30, shell=(os.name == "nt")
-        )
-        data = json.loads(result.stdout)
-        # wrangler --json 출력은 배열 형태, 첫 번째 항목의 results에 데이터
-        if data and isinstance(data, list) and len(data) > 0:
-            return data[0].get("results", [])
-        return []
+        return _select_posts(client or D1Client())
     except Exception as e:
         print(f"[!] D1 조회 실패: {e}")
         return []
 
 
-def generate_sitemap(posts):
-    """sitemap.xml 문자열 생성"""
-    xml = '<?xml version="1.0" encoding="UTF-8"?>\n'
-    xml += '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
-
-    for page in STATIC_PAGES:
-        xml += f"""  <url>
+def _static_entry(page):
+    return f"""  <url>
     <loc>{SITE}{page["url"]}</loc>
     <changefreq>{page["changefreq"]}</changefreq>
     <priority>{page["priority"]}</priority>
   </url>\n"""
 
-    for post in posts:
-        slug = urllib.parse.quote(post["slug"], safe="")
-        lastmod = ""
-        if post.get("created_at"):
-            lastmod = f"\n    <lastmod>{post['created_at'].split(' ')[0]}</lastmod>"
-        xml += f"""  <url>
+
+def _post_entry(post):
+    slug = urllib.parse.quote(post["slug"], safe="")
+    lastmod = ""
+    if post.get("updated_at"):
+        lastmod = f"\n    <lastmod>{post['updated_at'].split(' ')[0]}</lastmod>"
+    image = ""
+    if post.get("image_url"):
+        image_loc = post["image_url"] if post["image_url"].startswith("http") else f"{SITE}{post['image_url']}"
+        image = f"\n    <image:image>\n      <image:loc>{escape(image_loc)}</image:loc>\n    </image:image>"
+    return f"""  <url>
     <loc>{SITE}/blog/{slug}</loc>{lastmod}
     <changefreq>monthly</changefreq>
-    <priority>0.8</priority>
+    <priority>0.8</priority>{image}
   </url>\n"""
 
-    xml += '</urlset>\n'
-    return xml
 
+def generate_sitemap(posts):
+    """sitemap.xml 문자열 생성 (단일 파일 형식)"""
+    return "".join(_iter_urlset(STATIC_PAGES, posts))
+
+
+def _iter_urlset(static_pages, posts):
+    yield URLSET_OPEN
+    for page in static_pages:
+        yield _static_entry(page)
+    for post in posts:
+        yield _post_entry(post)
+    yield URLSET_CLOSE
+
+
+def _write_streaming(path, chunks):
+    """조각을 하나씩 xml과 .xml.gz에 동시에 써 내려가고, 다 쓴 뒤에 교체합니다. 쓴 바이트 수를 반환합니다."""
+    tmp_path, tmp_gz = f"{path}.tmp", f"{path}.gz.tmp"
+    written = 0
+    with open(tmp_path, "wb") as raw, open(tmp_gz, "wb") as gz_file:
+        # mtime=0: 내용이 같으면 .gz도 바이트 단위로 같게
+        with gzip.GzipFile(fileobj=gz_file, mode="wb", mtime=0) as gz:
+            for chunk in chunks:
+                data = chunk.encode("utf-8")
+                raw.write(data)
+                gz.write(data)
+                written += len(data)
+    if written > MAX_BYTES_PER_FILE:
+        print(f"[!] {path} 크기 {written / 1e6:.1f}MB - SHARD_SIZE를 줄여야 합니다.")
+    os.replace(tmp_path, path)
+    os.replace(tmp_gz, f"{path}.gz")
+    return written
+
+
+class SitemapState:
+    """샤드별 내용 해시와 마지막 워터마크를 기억합니다."""
+
+    def __init__(self, db_path=STATE_DB):
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("""CREATE TABLE IF NOT EXISTS sitemap_shards (
+            name TEXT PRIMARY KEY, hash TEXT, url_count INTEGER, bytes INTEGER, lastmod TEXT, updated_at TEXT)""")
+        self.conn.commit()
+
+    def get(self, name):
+        row = self.conn.execute("SELECT hash, lastmod FROM sitemap_shards WHERE name = ?", (name,)).fetchone()
+        return row if row else (None, None)
+
+    def names(self):
+        return {row[0] for row in self.conn.execute("SELECT name FROM sitemap_shards WHERE name != '__watermark__'")}
+
+    def put(self, name, digest, url_count=0, size=0, lastmod=None):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sitemap_shards (name, hash, url_count, bytes, lastmod, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (name, digest, url_count, size, lastmod, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            )
+
+    def delete(self, name):
+        with self.conn:
+            self.conn.execute("DELETE FROM sitemap_shards WHERE name = ?", (name,))
+
+    def close(self):
+        self.conn.close()
 
-def main():
-    print("[*] D1에서 포스트 목록 조회 중...")
-    posts = fetch_posts_from_d1()
-    print(f"[*] {len(posts)}개 포스트 발견")
 
-    xml = generate_sitemap(posts)
+def _digest(*parts):
+    h = hashlib.sha256(f"{FORMAT_VERSION}|{SITE}".encode("utf-8"))
+    for part in parts:
+        h.update(b"\x1f" + repr(part).encode("utf-8"))
+    return h.hexdigest()
 
-    with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
-        f.write(xml)
 
-    print(f"[+] {OUTPUT_PATH} 생성 완료 (총 {len(posts) + len(STATIC_PAGES)}개 URL)")
+def _plan_shards(posts):
+    """(파일명, 정적 페이지, 포스트 목록) 목록. 한 파일에 다 들어가면 sitemap.xml 하나."""
+    if len(posts) + len(STATIC_PAGES) <= MAX_URLS_PER_FILE:
+        return [("sitemap.xml", STATIC_PAGES, posts)]
+    shards = {}
+    for post in posts:
+        shards.setdefault((post["id"] - 1) // SHARD_SIZE, []).append(post)
+    plan = [("sitemap-static.xml", STATIC_PAGES, [])]
+    plan += [(f"sitemap-posts-{index + 1}.xml", [], shards[index]) for index in sorted(shards)]
+    return plan
+
+
+def build_sitemaps(posts, state, output_dir=OUTPUT_DIR):
+    """바뀐 샤드만 다시 씁니다. 새로 쓴 파일 경로 목록을 반환합니다."""
+    written = []
+    plan = _plan_shards(posts)
+    index_entries = []
+    for name, static_pages, shard_posts in plan:
+        digest = _digest(static_pages, [(p["slug"], p.get("updated_at"), p.get("image_url")) for p in shard_posts])
+        lastmod = max((p["updated_at"] for p in shard_posts if p.get("updated_at")), default=None)
+        index_entries.append((name, lastmod))
+        path = os.path.join(output_dir, name)
+        if state.get(name)[0] == digest and os.path.exists(path) and os.path.exists(f"{path}.gz"):
+            continue
+        size = _write_streaming(path, _iter_urlset(static_pages, shard_posts))
+        state.put(name, digest, len(static_pages) + len(shard_posts), size, lastmod)
+        written.append(path)
+
+    if len(plan) > 1:
+        digest = _digest(index_entries)
+        path = os.path.join(output_dir, "sitemap.xml")
+        if state.get("sitemap.xml")[0] != digest or not os.path.exists(path):
+            def index_chunks():
+                yield INDEX_OPEN
+                for name, lastmod in index_entries:
+                    tag = f"\n    <lastmod>{lastmod.split(' ')[0]}</lastmod>" if lastmod else ""
+                    yield f"  <sitemap>\n    <loc>{SITE}/{name}</loc>{tag}\n  </sitemap>\n"
+                yield INDEX_CLOSE
+            size = _write_streaming(path, index_chunks())
+            state.put("sitemap.xml", digest, len(index_entries), size)
+            written.append(path)
+
+    # 더 이상 쓰지 않는 샤드 정리 (글 삭제 또는 단일 파일로 돌아간 경우)
+    keep = {name for name, _, _ in plan} | {"sitemap.xml"}
+    for name in state.names() - keep:
+        for stale in (os.path.join(output_dir, name), os.path.join(output_dir, f"{name}.gz")):
+            if os.path.exists(stale):
+                os.remove(stale)
+                written.append(stale)
+        state.delete(name)
+    return written
+
+
+def main(client=None, force=False, mirror=None):
+    """사이트맵을 갱신하고 바뀐 파일 경로 목록을 반환합니다. 바뀐 게 없으면 빈 리스트."""
+    source = mirror or D1Mirror(client)
+    state = SitemapState()
+    try:
+        print("[*] D1 로컬 사본 동기화 중...")
+        try:
+            source.sync()
+        except Exception as e:
+            # 동기화에 실패해도 마지막으로 받아 둔 사본으로 진행
+            print(f"[!] D1 동기화 실패, 로컬 사본 사용: {e}")
+        watermark = fetch_watermark(source)
+        if not force and state.get("__watermark__")[0] == watermark and os.path.exists(OUTPUT_PATH):
+            print("[*] 포스트 변경 없음 - 사이트맵 유지")
+            return []
+        posts = _select_posts(source)
+        print(f"[*] {len(posts)}개 포스트 발견")
+
+        written = build_sitemaps(posts, state)
+        state.put("__watermark__", watermark)
+        if written:
+            print(f"[+] 사이트맵 갱신 완료: {', '.join(written)} (총 {len(posts) + len(STATIC_PAGES)}개 URL)")
+        else:
+            print("[*] 샤드 내용 변경 없음 - 사이트맵 유지")
+        return written
+    finally:
+        state.close()
+        if mirror is None:
+            source.close()
 
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    from dotenv import load_dotenv
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="sitemap.xml 생성")
+    parser.add_argument("--force", action="store_true", help="변경 여부와 상관없이 모든 샤드 다시 쓰기")
+    main(force=parser.parse_args().force)
@@ -1,30 +1,39 @@
-import os
 import time
-import sqlite3
+_IMPORT_STARTED = time.perf_counter()
+
+import os
 import re
+import sys
+import shutil
+import signal
+import asyncio
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import cached_property
 from dotenv import load_dotenv
 
-from src.collector.reddit_collector import RedditCollector
-from src.collector.google_searcher import GoogleSearcher
-from src.processor.gemini_analyzer import GeminiAnalyzer
-from src.processor.claude_processor import ClaudeProcessor
-from src.painter.local_painter import LocalPainter
-from src.affiliate.coupang_helper import CoupangHelper
+from src.storage.post_store import PostStore
+from src.processor.section_parser import parse_sections
+from src.common.http_cache import get_http_cache
+from src.common.startup_profile import StartupProfile
+from src.common.tracing import Tracer
 
 load_dotenv()
 
 class GTBManager:
-    def __init__(self):
+    def __init__(self, profile=None, tracer=None):
+        self.profile = profile or StartupProfile()
         self.db_path = "data/gtb_storage.db"
-        self._init_db()
+        with self.profile.timed("init", "store"):
+            self.store = PostStore(self.db_path)
+        self.tracer = tracer or Tracer(self.db_path)
         print("[*] GTB 매거진 '본질 강화' 엔진 가동 중...")
-        self.collector = RedditCollector()
-        self.searcher = GoogleSearcher()
-        self.analyzer = GeminiAnalyzer()
-        self.processor = ClaudeProcessor()
-        self.painter = LocalPainter()
-        self.affiliate = CoupangHelper()
+        self.pending_posts = []
+        # D1에는 들어갔고 썸네일이 다음 git 커밋을 기다리는 job
+        self.uncommitted = []
+        # 직전 실행에서 서브레딧별로 피드에 보인 글 ID 목록 (수집 실패면 None). --daemon 스케줄러가 처음 본 글 수를 셈
+        self.last_poll = {}
         
         self.category_map = {
             "Supplements": "건강",
@@ -38,6 +47,85 @@ class GTBManager:
         }
         self.target_subreddits = list(self.category_map.keys())
 
+    # 단계별 클라이언트는 처음 쓰일 때 만든다.
+    # 새 후보가 없는 실행이면 torch/diffusers/anthropic/genai를 아예 import하지 않음
+    @cached_property
+    def collector(self):
+        return self.profile.build("collector", "src.collector.reddit_collector", "RedditCollector")
+
+    @cached_property
+    def searcher(self):
+        return self.profile.build("searcher", "src.collector.google_searcher", "GoogleSearcher")
+
+    @cached_property
+    def analyzer(self):
+        return self.profile.build("analyzer", "src.processor.gemini_analyzer", "GeminiAnalyzer")
+
+    @cached_property
+    def processor(self):
+        return self.profile.build("processor", "src.processor.claude_processor", "ClaudeProcessor")
+
+    @cached_property
+    def painter(self):
+        # PAINTER_MODE=service: 상주 painter 서비스(src/painter/painter_service.py)에 렌더링을 맡김
+        if os.getenv("PAINTER_MODE") == "service":
+            return self.profile.build("painter", "src.painter.painter_service", "PainterClient")
+        return self.profile.build("painter", "src.painter.local_painter", "LocalPainter")
+
+    @cached_property
+    def affiliate(self):
+        return self.profile.build("affiliate", "src.affiliate.coupang_helper", "CoupangHelper")
+
+    @cached_property
+    def optimizer(self):
+        return self.profile.build("optimizer", "src.painter.image_optimizer", "ImageOptimizer", self.db_path)
+
+    @cached_property
+    def d1(self):
+        return self.profile.build("d1", "src.publisher.d1_client", "D1Client")
+
+    @cached_property
+    def mirror(self):
+        return self.profile.build("mirror", "src.storage.d1_mirror", "D1Mirror", self.d1)
+
+    @cached_property
+    def publisher(self):
+        return self.profile.build("publisher", "src.publisher.git_publisher", "GitPublisher")
+
+    @cached_property
+    def jobs(self):
+        return self.profile.build("jobs", "src.storage.post_jobs", "PostJobs", self.db_path)
+
+    @cached_property
+    def interest_cache(self):
+        from src.common.ttl_cache import TTLCache
+        return TTLCache("reader_interest", 6 * 3600)
+
+    def reader_interest(self):
+        """
+        서브레딧별 최근 인기 글 (stats_daily 집계, src/storage/stats_rollup.py). Gemini 주제 선정에 참고로 넘깁니다.
+        6시간 캐시하며, 조회에 실패하면 빈 dict (선정은 통계 없이 그대로 진행)
+        """
+        interest = self.interest_cache.get("by_category")
+        if interest is None:
+            try:
+                from src.storage.stats_rollup import StatsRollup
+                interest = StatsRollup(self.d1).popularity()
+            except Exception as e:
+                print(f"[!] 인기 글 통계 조회 실패: {e}")
+                return {}
+            self.interest_cache.set("by_category", interest)
+        return {sub: interest[category] for sub, category in self.category_map.items() if category in interest}
+
+    @cached_property
+    def topics(self):
+        index = self.profile.build("topics", "src.storage.topic_index", "TopicIndex", self.db_path)
+        if not len(index):
+            # 처음 쓰는 DB면 지금까지 발행한 'A vs B' 제목으로 비교 대상 색인을 채움
+            from src.storage.topic_index import pairs_from_titles
+            index.add_many(pairs_from_titles(self.store.titles()))
+        return index
+
     def _extract_search_query(self, title):
         """제목에서 검색에 유리한 핵심 키워드를 추출합니다."""
         # 불용어 제거 (간이 버전)
@@ -48,29 +136,37 @@ class GTBManager:
         # 핵심 키워드 3-4개 조합
         return " ".join(filtered_words[:4])
 
-    def _init_db(self):
-        os.makedirs("data", exist_ok=True)
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("CREATE TABLE IF NOT EXISTS posts (reddit_id TEXT PRIMARY KEY, title TEXT, processed_date TEXT, file_path TEXT)")
-        conn.commit()
-        conn.close()
-
     def is_already_processed(self, reddit_id):
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT 1 FROM posts WHERE reddit_id = ?", (reddit_id,))
-        result = cursor.fetchone()
-        conn.close()
-        return result is not None
+        return self.store.is_processed(reddit_id)
 
     def mark_as_processed(self, reddit_id, title, file_path):
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("INSERT OR IGNORE INTO posts (reddit_id, title, processed_date, file_path) VALUES (?, ?, ?, ?)",
-            (reddit_id, title, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), file_path))
-        conn.commit()
-        conn.close()
+        self.store.mark_processed(reddit_id, title, file_path)
+
+    def collect_candidates(self, subs):
+        """서브레딧별 후보 중 아직 처리하지 않은 것만 {sub: posts}로 반환하고, 피드에 보인 글 ID는 last_poll에 남깁니다."""
+        candidates_by_sub = {}
+        self.last_poll = {}
+        for sub in subs:
+            with self.tracer.span("collect", sub=sub):
+                # 후보군 10개를 가져옴 (Gemini가 분석할 재료)
+                posts = self.collector.fetch_top_posts(sub, limit=10)
+                self.last_poll[sub] = None if posts is None else [p['id'] for p in posts]
+
+                # 아직 처리하지 않은 후보들만 선별
+                candidates_by_sub[sub] = self.filter_new_candidates(posts or [])
+            if not candidates_by_sub[sub]:
+                print(f"[-] {sub} 카테고리에 새로운 후보가 없습니다.")
+        return candidates_by_sub
+
+    def filter_new_candidates(self, posts):
+        """처리하지 않았고 진행 중인 job(post_jobs)도 없는 후보만 남깁니다."""
+        ids = [p['id'] for p in posts]
+        # 구글 뉴스 ID 형식을 바꾸기 전에 처리한 글은 posts에 예전 ID로만 남아 있음 (reddit_collector.legacy_news_id)
+        legacy = {p['legacy_id']: p['id'] for p in posts if p.get('legacy_id')}
+        unprocessed = set(self.store.filter_unprocessed(ids + list(legacy)))
+        done = {new_id for old_id, new_id in legacy.items() if old_id not in unprocessed}
+        new = set(self.jobs.filter_new([i for i in ids if i in unprocessed and i not in done]))
+        return [p for p in posts if p['id'] in new]
 
     def sanitize_filename(self, filename):
         filename = re.sub(r'[\/:*?"<>|]', '', filename)
@@ -78,139 +174,495 @@ class GTBManager:
         return filename[:50]
 
     def parse_claude_result(self, raw_text):
-        data = {}
-        patterns = {
-            'vs_title': r'VS_TITLE:\s*(.*?)(?:\n---|\nTITLE:|$)',
-            'title': r'TITLE:\s*(.*?)(?:\n---|\nSUMMARY:|$)',
-            'summary': r'SUMMARY:\s*(.*?)(?:\n---|\nCONTENT:|$)',
-            'content': r'CONTENT:\s*(.*?)(?:\n---|\nIMAGE_PROMPT:|$)',
-            'image_prompt': r'IMAGE_PROMPT:\s*(.*?)(?:\n---|\nKEYWORDS:|$)',
-            'keywords': r'KEYWORDS:\s*(.*)'
-        }
-        for key, pattern in patterns.items():
-            match = re.search(pattern, raw_text, re.DOTALL | re.IGNORECASE)
-            if match:
-                data[key] = match.group(1).strip()
-            else:
-                data[key] = ""
+        return self._fill_keywords(parse_sections(raw_text))
+
+    def _fill_keywords(self, data):
         if not data.get('keywords') and data.get('title'):
             data['keywords'] = " ".join(data['title'].split()[:2])
         return data
 
-    def run_pipeline(self):
+    def drop_duplicate_topics(self, candidates_by_sub):
+        """
+        순위 선정 전에 이미 다룬 주제와 거의 같은 후보를 뺍니다. (topic_index, 임계값 TOPIC_DUP_THRESHOLD)
+        이번 실행에서 다른 카테고리에 먼저 나온 같은 이야기도 함께 뺍니다.
+        """
+        from src.storage.topic_index import TopicIndex
+        self.run_topics = TopicIndex(":memory:", threshold=self.topics.threshold)
+        filtered = {}
+        for sub, posts in candidates_by_sub.items():
+            kept = []
+            for post in posts:
+                match = self.topics.query("source", post['title']) or self.run_topics.query("source", post['title'])
+                if match:
+                    print(f"[=] 이미 다룬 주제와 유사 ({match[1]:.0%}, {match[0]}): {post['title'][:40]}")
+                    continue
+                self.run_topics.add_many([(post['id'], "source", post['title'])])
+                kept.append(post)
+            filtered[sub] = kept
+        return filtered
+
+    def comparison_pair(self, post):
+        if post.get('compare_a') and post.get('compare_b'):
+            from src.storage.topic_index import pair_text
+            return pair_text(post['compare_a'], post['compare_b'])
+        return None
+
+    def is_repeated_comparison(self, post):
+        """Gemini가 고른 비교 대상(A vs B)을 이미 썼으면 Claude/이미지 생성 전에 건너뜁니다."""
+        pair = self.comparison_pair(post)
+        if not pair:
+            return False
+        run_topics = getattr(self, "run_topics", None)
+        match = self.topics.query("pair", pair) or (run_topics and run_topics.query("pair", pair))
+        if match:
+            print(f"[=] 이미 작성한 비교 글과 유사 ({match[1]:.0%}, {match[0]}): {post['compare_a']} vs {post['compare_b']}")
+            return True
+        if run_topics:
+            run_topics.add_many([(post['id'], "pair", pair)])
+        return False
+
+    def pick_search_queries(self, post):
+        """Gemini가 뽑은 롱테일 키워드(최대 3개)를 구글 검색어로 사용합니다."""
+        keywords = [k.strip() for k in (post.get('target_keywords') or post['title']).split(',')]
+        return [k for k in keywords if k][:3] or [post['title']]
+
+    def pick_affiliate_keywords(self, parsed_data):
+        """쿠팡 검색 키워드 후보를 우선순위 순으로 반환합니다. (본문 키워드 → 제목 앞 2단어)"""
+        keywords_raw = parsed_data.get('keywords', "").replace("[", "").replace("]", "").split(",")
+        search_keyword = "인기상품"
+        for kw in keywords_raw:
+            clean_kw = kw.strip()
+            if clean_kw and len(clean_kw) > 1:
+                search_keyword = clean_kw
+                break
+        fallback_kw = " ".join(parsed_data.get('title', '').split()[:2])
+        return [search_keyword, fallback_kw]
+
+    def find_affiliate_items(self, parsed_data):
+        """쿠팡 상품 목록. 호출 한도/오류로 조회하지 못하면 예외를 내서 affiliated 단계를 끝내지 않고 재시도하게 합니다."""
+        with self.tracer.span("coupang"):
+            return self._affiliate_result(
+                self.affiliate.search_first_available(self.pick_affiliate_keywords(parsed_data), limit=3))
+
+    @staticmethod
+    def _affiliate_result(items):
+        # []는 '상품 없음'으로 확정, None은 한도/오류로 조회를 못 한 것
+        if items is None:
+            raise RuntimeError("쿠팡 상품 조회 실패 (호출 한도 또는 API 오류), 다음 시도에서 다시 조회합니다")
+        return items
+
+    def publish_image(self, image_filename):
+        """
+        생성된 썸네일을 WebP/AVIF 반응형 이미지로 변환해 public/images/opt에 두고 대표 URL을 반환합니다.
+        변환에 실패하면 원본 PNG를 그대로 public/images로 옮깁니다.
+        painter가 파일을 만들지 못했으면 RuntimeError (painted 단계를 실패로 기록하고 다음 시도에서 다시 그림)
+        """
+        src_path = f"data/images/{image_filename}"
+        if not os.path.exists(src_path):
+            if os.path.exists(f"public/images/{image_filename}"):
+                return f"/images/{image_filename}"
+            raise RuntimeError(f"썸네일 생성 실패: {src_path} 파일이 없습니다")
+        with self.tracer.span("image_optimize"):
+            result = self.optimizer.optimize(src_path)
+        if result:
+            os.remove(src_path)
+            from src.painter.image_optimizer import default_url
+            return default_url(result)
+        os.makedirs("public/images", exist_ok=True)
+        shutil.move(src_path, f"public/images/{image_filename}")
+        return f"/images/{image_filename}"
+
+    def render_thumbnail(self, post, img_prompt):
+        image_filename = f"thumb_{post['id']}.png"
+        # 이전 실행에서 그려 두고 변환 전에 멈춘 썸네일이 있으면 다시 그리지 않음
+        if not os.path.exists(f"data/images/{image_filename}"):
+            with self.tracer.span("painter"):
+                self.painter.generate_image(img_prompt or "Professional photography", image_filename)
+        return self.publish_image(image_filename)
+
+    def write_post_streaming(self, job):
+        """
+        Claude 응답을 스트리밍으로 받으면서 IMAGE_PROMPT가 끝나면 썸네일 생성을, KEYWORDS가 끝나면 쿠팡 조회를
+        백그라운드로 시작합니다. 결과물은 끝나는 대로 post_jobs에 저장하고(이미 있는 결과물은 건너뜀) 갱신된 job을 반환합니다.
+        생성에 실패하면 None. 그 사이 끝난 썸네일/쿠팡 결과는 저장되어 다음 시도에서 그대로 씁니다.
+        """
+        post = job['post']
+        # claude span 밖에서 묶어 둬야 썸네일/쿠팡 span이 claude의 자식이 아닌 형제로 기록됨
+        render_thumbnail = self.tracer.bind(self.render_thumbnail)
+        find_affiliate_items = self.tracer.bind(self.find_affiliate_items)
+
+        def paint(img_prompt):
+            return self.jobs.save(post['id'], image_url=render_thumbnail(post, img_prompt))
+
+        def find_items(parsed_data):
+            return self.jobs.save(post['id'], coupang=find_affiliate_items(parsed_data))
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            futures, done = {}, {}
+
+            def on_section(name, value):
+                done[name] = value
+                if name == "image_prompt" and value and job['image_url'] is None:
+                    futures["image"] = pool.submit(paint, value)
+                elif name == "keywords" and value and job['coupang'] is None:
+                    futures["coupang"] = pool.submit(find_items, dict(done))
+
+            with self.tracer.span("claude"):
+                parser = self.processor.stream_post(post, korean_trends=job['trends'], on_section=on_section)
+            if not parser:
+                return None
+            parsed_data = self._fill_keywords(parser.close())
+            job = self.jobs.save(post['id'], parsed=parsed_data)
+            if "image" not in futures and job['image_url'] is None:
+                futures["image"] = pool.submit(paint, parsed_data.get('image_prompt'))
+            if "coupang" not in futures and job['coupang'] is None:
+                futures["coupang"] = pool.submit(find_items, parsed_data)
+            for future in futures.values():
+                future.result()
+        return self.jobs.get(post['id'])
+
+    def advance_post(self, job, today_str):
+        """
+        job을 마지막으로 끝낸 단계 다음부터 진행해 D1 발행 대기열에 넣습니다. (검색 → 작성 → 썸네일/쿠팡 → 발행 대기)
+        실패하면 post_jobs에 재시도를 예약하고 False를 반환합니다.
+        """
+        post = job['post']
+        try:
+            if job['stage'] == "published":
+                # D1에는 이미 들어갔고 썸네일 push / 처리 기록만 남은 글
+                self.pending_posts.append(job)
+                return True
+            if not job['searched']:
+                # 구체적인 롱테일 키워드로 한국 트렌드 검색
+                with self.tracer.span("google_search"):
+                    korean_trends = self.searcher.search_korean_trends_many(self.pick_search_queries(post))
+                job = self.jobs.save(post['id'], trends=korean_trends)
+            if job['parsed'] is None:
+                # 고도화된 Claude 프로세서로 글 생성 (스트리밍 중 IMAGE_PROMPT/KEYWORDS가 나오면 이미지·쿠팡 작업을 바로 시작)
+                job = self.write_post_streaming(job)
+                if not job:
+                    raise RuntimeError("Claude 글 생성 실패")
+            if job['coupang'] is None:
+                job = self.jobs.save(post['id'], coupang=self.find_affiliate_items(job['parsed']))
+            if job['image_url'] is None:
+                job = self.jobs.save(post['id'], image_url=self.render_thumbnail(post, job['parsed'].get('image_prompt')))
+            with self.tracer.span("publish"):
+                self.publish_post(job, today_str)
+            return True
+        except Exception as e:
+            self.jobs.fail(post['id'], e)
+            return False
+
+    def resume_posts(self):
+        """
+        이전 실행에서 끝나지 않은 job 중 재시도할 때가 된 것들을 반환합니다.
+        이 프로세스에서 이미 발행해 미뤄 둔 git 커밋(GIT_COMMIT_WINDOW)을 기다리는 글은 빼고 돌려줍니다.
+        """
+        waiting = {job['reddit_id'] for job in self.uncommitted}
+        jobs = [job for job in self.jobs.resumable() if job['reddit_id'] not in waiting]
+        if jobs:
+            print(f"[*] 이전 실행에서 끝나지 않은 글 {len(jobs)}개를 마지막 단계부터 이어서 진행합니다.")
+        return jobs
+
+    def build_full_content(self, parsed_data, coupang_items):
+        # 본문 마크다운 결합 (수익화 CTA 및 버튼 강화)
+        full_content = f"## 💡 핵심 요약\n{parsed_data.get('summary')}\n\n{parsed_data.get('content')}"
+        if coupang_items:
+            full_content += "\n\n---\n### 🛒 추천 상품 (최저가 및 재고 확인)\n"
+            for item in coupang_items:
+                full_content += f"- **[{item['name']}]({item['link']})** ({item['price']}원) - *실시간 할인 확인하기*\n"
+            full_content += "\n*쿠팡 파트너스 활동의 일환으로 수수료를 제공받습니다.*\n"
+        return full_content
+
+    def publish_post(self, job, today_str):
+        """완성된 글(affiliated 단계 job)을 D1 발행 대기열에 넣습니다. 실제 INSERT와 썸네일 push는 flush_posts()에서 처리합니다."""
+        parsed_data = job['parsed']
+        title = parsed_data.get('title', 'no_title')
+        full_content = self.build_full_content(parsed_data, job['coupang'])
+        slug = f"{today_str}-{job['reddit_id']}"
+        category_name = self.category_map.get(job['sub'], "인사이트")
+        # 엣지가 요청마다 마크다운을 파싱하지 않도록 HTML/발췌/읽기 시간/목차를 여기서 한 번 계산
+        from src.processor.post_renderer import render_post
+        rendered = render_post(full_content)
+
+        # 사이트 <picture>용 크기별 WebP/AVIF srcset + LQIP (변환에 실패해 원본 PNG면 None)
+        image_meta = self.optimizer.meta_for(job['image_url'])
+
+        print(f"[*] DB 발행 대기열에 추가: {title}")
+        self.d1.enqueue(
+            "INSERT OR IGNORE INTO posts (slug, title, summary, content, category, image_url, image_meta, "
+            "content_html, excerpt, reading_minutes, toc) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (slug, title, parsed_data.get('summary', ''), full_content, category_name, job['image_url'], image_meta,
+             rendered['content_html'], rendered['excerpt'], rendered['reading_minutes'], rendered['toc'])
+        )
+        self.pending_posts.append(dict(job, slug=slug))
+        return slug
+
+    def stage_posts(self, jobs):
+        """D1에 들어간 글의 썸네일 파일을 다음 git 커밋에 올립니다. 커밋되면 publish_assets()가 committed로 기록합니다."""
+        from src.painter.image_optimizer import asset_paths
+        staged = {job['reddit_id'] for job in self.uncommitted}
+        for job in jobs:
+            if job['reddit_id'] in staged:
+                continue
+            staged.add(job['reddit_id'])
+            self.publisher.stage(asset_paths(job['image_url']), f"Image: {job['slug']}")
+            self.uncommitted.append(job)
+
+    def mark_committed(self, jobs):
+        """썸네일이 커밋된 글을 한 번에 처리 완료(committed)로 기록하고 원문 제목 + 비교 대상 + 요약을 유사도 인덱스에 넣습니다."""
+        if not jobs:
+            return
+        self.store.mark_processed_many(
+            [(job['reddit_id'], job['parsed'].get('title'), f"db://{job['slug']}") for job in jobs]
+        )
+        topic_docs = []
+        for job in jobs:
+            topic_docs.append((job['reddit_id'], "source", job['post']['title']))
+            pair = self.comparison_pair(job['post'])
+            if pair:
+                topic_docs.append((job['reddit_id'], "pair", pair))
+            if job['parsed'].get('summary'):
+                topic_docs.append((job['reddit_id'], "summary", job['parsed']['summary']))
+        self.topics.add_many(topic_docs)
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        for job in jobs:
+            self.jobs.save(job['reddit_id'], committed_at=now)
+
+    def publish_assets(self, force=False):
+        """
+        이번 실행에서 모은 썸네일/사이트맵을 커밋 1개로 묶고 push는 백그라운드로 보냅니다.
+        GIT_COMMIT_WINDOW가 아직 안 지났으면 다음 실행으로 미룹니다. (force=True면 바로 커밋)
+        """
+        if not self.publisher.has_staged():
+            # 지난번 push가 실패해 로컬에만 있는 커밋이 있으면 다시 보냄
+            if self.publisher.unpushed():
+                self.publisher.push_async()
+            return
+        if not force and not self.publisher.due():
+            return
+        from src.publisher.git_publisher import GitError
+        jobs, self.uncommitted = self.uncommitted, []
+        try:
+            with self.tracer.span("git_commit"):
+                sha = self.publisher.commit()
+        except GitError as e:
+            print(f"[!] git 커밋 실패: {e}")
+            for job in jobs:
+                self.jobs.fail(job['reddit_id'], e)
+            return
+        self.mark_committed(jobs)
+        if sha:
+            print(f"[+] git 커밋 {sha[:7]} (썸네일 {len(jobs)}개), 백그라운드로 push 중...")
+            self.publisher.push_async()
+
+    def close(self):
+        """미뤄 둔 커밋을 마저 하고 진행 중인 push가 끝날 때까지 기다립니다. (프로세스 종료 전에 호출)"""
+        if "publisher" in self.__dict__:
+            if self.publisher.has_staged():
+                self.publish_assets(force=True)
+            self.publisher.close()
+
+    def flush_posts(self):
+        """
+        대기 중인 글을 D1 배치 1회로 INSERT(published)하고 썸네일을 다음 git 커밋에 올립니다.
+        실패한 글은 post_jobs에 남아 다음 실행에서 실패한 단계부터 다시 시도합니다.
+        """
+        if not self.pending_posts:
+            return []
+        pending, self.pending_posts = self.pending_posts, []
+        inserts = [job for job in pending if job['stage'] != "published"]
+        if inserts:
+            print(f"[*] D1에 {len(inserts)}개 포스팅 일괄 저장 중...")
+            try:
+                with self.tracer.span("d1_flush"):
+                    self.d1.flush()
+            except Exception as e:
+                print(f"[!] D1 저장 실패: {e}")
+                # 다음 실행이 affiliated 단계부터 다시 넣으므로 남은 대기열은 버림
+                self.d1.pending.clear()
+                for job in inserts:
+                    self.jobs.fail(job['reddit_id'], e)
+                pending = [job for job in pending if job['stage'] == "published"]
+            else:
+                pending = [job for job in pending if job['stage'] == "published"] + \
+                          [dict(job, **self.jobs.save(job['reddit_id'], slug=job['slug'])) for job in inserts]
+
+        published = []
+        for job in pending:
+            print(f"[+++] DB 발행 완료: {job['slug']}")
+            published.append(job['slug'])
+        self.stage_posts(pending)
+        return published
+
+    def update_sitemap(self):
+        # 사이트맵 재생성
+        print("[*] 사이트맵 재생성 중...")
+        try:
+            from generate_sitemap import main as generate_sitemap
+            with self.tracer.span("sitemap"):
+                changed = generate_sitemap(self.d1, mirror=self.mirror)
+            if changed:
+                # 샤드마다 .gz가 함께 쓰이거나 지워짐
+                self.publisher.stage([p for path in changed for p in (path, f"{path}.gz")], "Update sitemap.xml")
+        except Exception as e:
+            print(f"[!] 사이트맵 생성 실패: {e}")
+
+    def print_run_reports(self):
+        print(f"[*] {get_http_cache().report()}")
+        if "collector" in self.__dict__:
+            print(f"[*] {self.collector.health.report()}")
+        # Claude를 한 번도 부르지 않은 실행이면 processor를 만들지 않음
+        if "processor" in self.__dict__:
+            print(f"[*] {self.processor.usage_log.report()}")
+
+    def run_pipeline(self, subs=None):
+        self.tracer.start_run("sync")
+        published, status = [], "error"
+        try:
+            published = self._run_pipeline(subs or self.target_subreddits)
+            status = "ok"
+        finally:
+            self.tracer.end_run(status, len(published))
+        return published
+
+    def _run_pipeline(self, subs):
         print("\n" + "="*60)
         print(f"🚀 GTB 수익화/유입 최적화 모드 시작: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print("="*60)
 
         today_str = datetime.now().strftime("%Y%m%d")
 
-        for sub in self.target_subreddits:
-            # 후보군 10개를 가져옴 (Gemini가 분석할 재료)
-            posts = self.collector.fetch_top_posts(sub, limit=10)
-            category_name = self.category_map.get(sub, "인사이트")
-            
-            # 아직 처리하지 않은 후보들만 선별
-            candidates = [p for p in posts if not self.is_already_processed(p['id'])]
-            
-            if not candidates:
-                print(f"[-] {sub} 카테고리에 새로운 후보가 없습니다.")
-                continue
+        for job in self.resume_posts():
+            with self.tracer.span("post", sub=job['sub'], post_id=job['reddit_id']):
+                self.advance_post(job, today_str)
 
-            # [핵심] Gemini가 수익성과 유입 확률이 가장 높은 주제 1개만 선정
-            print(f"[*] Gemini가 {len(candidates)}개의 후보 중 '황금 주제' 분석 중...")
-            selected_posts = self.analyzer.analyze_and_rank_topics(candidates)
-            
+        candidates_by_sub = self.collect_candidates(subs)
+
+        with self.tracer.span("dedup"):
+            candidates_by_sub = self.drop_duplicate_topics(candidates_by_sub)
+
+        # [핵심] Gemini가 모든 카테고리의 후보를 한 번에 보고 카테고리별로 수익성과 유입 확률이 가장 높은 주제 1개씩 선정
+        total = sum(len(c) for c in candidates_by_sub.values())
+        if total:
+            print(f"[*] Gemini가 {total}개의 후보 중 카테고리별 '황금 주제' 분석 중...")
+            with self.tracer.span("gemini_rank"):
+                selected_by_sub = self.analyzer.rank_categories(candidates_by_sub, self.reader_interest())
+        else:
+            selected_by_sub = {}
+
+        for sub, selected_posts in selected_by_sub.items():
             published_in_sub = False
             for post in selected_posts:
                 print(f"[!] 최종 당첨! ({sub}): {post['title']}")
-                
-                # 구체적인 롱테일 키워드로 한국 트렌드 검색
-                search_query = post.get('target_keywords', post['title']).split(',')[0]
-                korean_trends = self.searcher.search_korean_trends(search_query)
-                
-                # 고도화된 Claude 프로세서로 글 생성
-                processed_text = self.processor.process_post(post, korean_trends=korean_trends)
-                if not processed_text: continue
-                parsed_data = self.parse_claude_result(processed_text)
-                
-                img_prompt = parsed_data.get('image_prompt', "Professional photography")
-                image_filename = f"thumb_{post['id']}.png"
-                self.painter.generate_image(img_prompt, image_filename)
-                
-                os.makedirs("public/images", exist_ok=True)
-                if os.path.exists(f"data/images/{image_filename}"):
-                    import shutil
-                    shutil.move(f"data/images/{image_filename}", f"public/images/{image_filename}")
-                
-                keywords_raw = parsed_data.get('keywords', "").replace("[", "").replace("]", "").split(",")
-                search_keyword = "인기상품"
-                for kw in keywords_raw:
-                    clean_kw = kw.strip()
-                    if clean_kw and len(clean_kw) > 1:
-                        search_keyword = clean_kw
-                        break
-                
-                coupang_items = self.affiliate.search_products(search_keyword, limit=3)
-                if not coupang_items:
-                    fallback_kw = " ".join(parsed_data.get('title', '').split()[:2])
-                    coupang_items = self.affiliate.search_products(fallback_kw, limit=3)
-
-                # [DB 저장 로직] Cloudflare D1에 직접 INSERT
-                safe_title = parsed_data.get('title', 'no_title').replace("'", "''")
-                safe_summary = parsed_data.get('summary', '').replace("'", "''")
-                # 본문 마크다운 결합 (수익화 CTA 및 버튼 강화)
-                full_content = f"## 💡 핵심 요약\n{parsed_data.get('summary')}\n\n{parsed_data.get('content')}"
-                if coupang_items:
-                    full_content += "\n\n---\n### 🛒 추천 상품 (최저가 및 재고 확인)\n"
-                    for item in coupang_items:
-                        full_content += f"- **[{item['name']}]({item['link']})** ({item['price']}원) - *실시간 할인 확인하기*\n"
-                    full_content += "\n*쿠팡 파트너스 활동의 일환으로 수수료를 제공받습니다.*\n"
-                
-                safe_content = full_content.replace("'", "''")
-                slug = f"{today_str}-{post['id']}"
-                image_url = f"/images/{image_filename}"
-                
-                print(f"[*] DB에 포스팅 저장 중: {safe_title}")
-                
-                # D1 실행
-                db_name = "auto-blog-db"
-                sql = f"INSERT OR IGNORE INTO posts (slug, title, summary, content, category, image_url) VALUES ('{slug}', '{safe_title}', '{safe_summary}', '{safe_content}', '{category_name}', '{image_url}');"
-                
-                with open("temp.sql", "w", encoding="utf-8") as f:
-                    f.write(sql)
-                
-                os.system(f"npx wrangler d1 execute {db_name} --remote --file=temp.sql --yes")
-                os.remove("temp.sql")
-
-                self.mark_as_processed(post['id'], parsed_data.get('title'), f"db://{slug}")
-                print(f"[+++] DB 발행 완료: {slug}")
-                
-                os.system("git add public/images/*")
-                os.system(f"git commit -m \"Image: {image_filename}\"")
-                os.system("git push origin main")
+                if self.is_repeated_comparison(post):
+                    continue
+                job = self.jobs.select(sub, post)
+                with self.tracer.span("post", sub=sub, post_id=post['id']):
+                    if not self.advance_post(job, today_str): continue
                 
                 published_in_sub = True
-                time.sleep(5)
-                break 
+                break
 
             if not published_in_sub:
                 print(f"[-] {sub} 카테고리에 새로 발행할 수 있는 글이 없습니다.")
 
-        # 사이트맵 재생성
-        print("[*] 사이트맵 재생성 중...")
-        try:
-            from generate_sitemap import main as generate_sitemap
-            generate_sitemap()
-            os.system("git add public/sitemap.xml")
-            os.system('git commit -m "Update sitemap.xml"')
-            os.system("git push origin main")
-        except Exception as e:
-            print(f"[!] 사이트맵 생성 실패: {e}")
+        # 새로 발행한 글이 없으면 사이트맵/git 작업도 건너뜀
+        published = self.flush_posts()
+        if published:
+            self.update_sitemap()
+        self.publish_assets()
+        self.print_run_reports()
+        self.profile.report()
 
         print("\n" + "="*60)
         print("✅ 모든 작업 완료.")
         print("="*60)
+        return published
+
+    def run_pipeline_async(self, limits=None, subs=None):
+        """단계별 큐로 연결된 비동기 파이프라인으로 실행합니다. (src/pipeline/async_pipeline.py)"""
+        from src.pipeline.async_pipeline import AsyncPipeline
+        self.tracer.start_run("async")
+        published, status = [], "error"
+        try:
+            published = asyncio.run(AsyncPipeline(self, limits=limits, subs=subs).run())
+            status = "ok"
+        finally:
+            self.tracer.end_run(status, len(published))
+        self.profile.report()
+        return published
+
+    def run_daemon(self, use_async=False, scheduler=None, max_ticks=None, should_stop=None):
+        """
+        --daemon: 프로세스를 띄워 둔 채 서브레딧마다 따로 정한 시각에 수집/발행합니다. (src/pipeline/scheduler.py)
+        Claude/Gemini/painter 클라이언트와 HTTP 세션은 실행 사이에 그대로 재사용합니다.
+        """
+        from src.pipeline.scheduler import PollScheduler
+        scheduler = scheduler or PollScheduler(self.target_subreddits, self.db_path)
+        print(f"[*] 데몬 모드 시작: 서브레딧 {len(scheduler.subs)}개, 한 번에 최대 {scheduler.max_in_flight}개")
+
+        def poll(subs):
+            print(f"[*] 수집 시각이 된 서브레딧: {', '.join(subs)}")
+            # 수집 전에 실패하면 이전 실행의 값이 남지 않도록 (없는 sub는 실패로 기록됨)
+            self.last_poll = {}
+            try:
+                if use_async:
+                    self.run_pipeline_async(subs=subs)
+                else:
+                    self.run_pipeline(subs=subs)
+            except Exception as e:
+                # 한 번 실패해도 데몬은 계속 돌고, 끝나지 않은 글은 다음 실행이 이어서 진행
+                print(f"[!] 실행 실패: {e}")
+            return {sub: self.last_poll.get(sub) for sub in subs}
+
+        try:
+            scheduler.run(poll, max_ticks=max_ticks, should_stop=should_stop)
+        finally:
+            scheduler.close()
 
 if __name__ == "__main__":
-    manager = GTBManager()
-    manager.run_pipeline()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="GTB 매거진 자동 발행 파이프라인")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="수집/분석/작성/이미지 단계를 겹쳐 실행하는 비동기 파이프라인 모드")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="모듈 import / 클라이언트 생성 시간을 실행 끝에 출력")
+    parser.add_argument("--report", action="store_true",
+                        help="최근 실행들의 단계별 p50/p95와 가장 느린 실행의 임계 경로를 출력하고 종료")
+    parser.add_argument("--runs", type=int, default=20, help="--report에서 집계할 최근 실행 수")
+    parser.add_argument("--profile-stage", action="append", default=[], metavar="STAGE",
+                        help="해당 단계(claude, painter, ...)를 프로파일링해 data/profiles/에 저장 (여러 번 지정 가능)")
+    parser.add_argument("--profiler", choices=("cprofile", "pyinstrument"), default="cprofile")
+    parser.add_argument("--daemon", action="store_true",
+                        help="종료하지 않고 서브레딧별로 수집 주기를 조절하며 계속 실행 (run_auto_blog.bat 반복 실행 대신)")
+    parser.add_argument("--record", metavar="PATH",
+                        help="외부 API 응답을 녹화해 PATH에 저장 (benchmarks/suite.py --cassette로 재생)")
+    args = parser.parse_args()
+
+    tracer = Tracer(profile_stages=args.profile_stage, profiler=args.profiler)
+    if args.report:
+        print(tracer.report(args.runs))
+        raise SystemExit(0)
+
+    profile = StartupProfile(enabled=args.startup_profile)
+    if profile.enabled:
+        profile.records.append(("import", "manager.py (모듈 전체)", time.perf_counter() - _IMPORT_STARTED))
+    manager = GTBManager(profile, tracer)
+    cassette = None
+    if args.record:
+        from src.common.cassette import Cassette, install
+        cassette = install(manager, Cassette(args.record, mode="record"))
+    if args.daemon:
+        # 작업 스케줄러/서비스 종료(SIGTERM)도 Ctrl+C처럼 finally까지 정리하고 끝나도록
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        if args.daemon:
+            manager.run_daemon(use_async=args.use_async)
+        elif args.use_async:
+            manager.run_pipeline_async()
+        else:
+            manager.run_pipeline()
+    finally:
+        manager.close()
+        if cassette:
+            cassette.save()
\ No newline at end of file
@@ -0,0 +1,9 @@
+-- 캐시 파일 (data/http_cache.db: HTTP 응답, src/common/http_cache.py / data/cache.db: 키-값, src/common/ttl_cache.py)
+-- 두 파일에 같은 마이그레이션을 적용하므로 각 파일에는 쓰지 않는 테이블이 하나씩 빈 채로 있음
+CREATE TABLE IF NOT EXISTS http_cache (
+    cache_key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, status INTEGER,
+    headers TEXT, body BLOB, fetched_at REAL, parsed TEXT
+);
+CREATE TABLE IF NOT EXISTS kv_cache (
+    namespace TEXT, key TEXT, value TEXT, expires_at REAL, PRIMARY KEY (namespace, key)
+);
@@ -0,0 +1,7 @@
+"""posts에 발행 때 미리 계산하는 컬럼(content_html, excerpt, reading_minutes, toc) 추가"""
+from src.processor.post_renderer import ensure_columns
+
+
+def up(db):
+    # 발행 코드가 먼저 붙였을 수도 있어 없는 컬럼만 추가
+    ensure_columns(db)
@@ -0,0 +1,17 @@
+-- 일별 방문/클릭 집계와 집계 워터마크 (src/storage/stats_rollup.py)
+CREATE TABLE IF NOT EXISTS stats_daily (
+    date TEXT NOT NULL,
+    type TEXT NOT NULL,
+    path TEXT NOT NULL DEFAULT '',
+    label TEXT NOT NULL DEFAULT '',
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (date, type, path, label)
+);
+-- popular / admin: type별 경로 합계를 테이블을 읽지 않고 인덱스만으로 (count까지 포함)
+CREATE INDEX IF NOT EXISTS idx_stats_daily_type_path ON stats_daily (type, path, count);
+
+CREATE TABLE IF NOT EXISTS rollup_state (
+    name TEXT PRIMARY KEY,
+    last_id INTEGER NOT NULL DEFAULT 0,
+    updated_at DATETIME
+);
@@ -0,0 +1,6 @@
+-- 목록 페이지 (index / admin: 최신순, category: 카테고리별 최신순)
+CREATE INDEX IF NOT EXISTS idx_posts_created ON posts (created_at);
+CREATE INDEX IF NOT EXISTS idx_posts_category_created ON posts (category, created_at);
+
+-- 미러 수정분 동기화 (updated_at, id 커서)
+CREATE INDEX IF NOT EXISTS idx_posts_updated ON posts (updated_at, id);
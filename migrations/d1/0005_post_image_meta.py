@@ -0,0 +1,7 @@
+"""posts에 썸네일 변형 정보 컬럼(image_meta) 추가"""
+from src.processor.post_renderer import ensure_columns
+
+
+def up(db):
+    # 0002를 이 컬럼이 생긴 뒤에 적용한 DB나 발행 코드가 먼저 붙인 DB면 이미 있음
+    ensure_columns(db)
@@ -0,0 +1,4 @@
+-- gtb_storage.db 처리 이력 (src/storage/post_store.py)
+CREATE TABLE IF NOT EXISTS posts (reddit_id TEXT PRIMARY KEY, title TEXT, processed_date TEXT, file_path TEXT);
+CREATE TABLE IF NOT EXISTS posts_bloom (
+    id INTEGER PRIMARY KEY CHECK (id = 1), row_count INTEGER, size INTEGER, hash_count INTEGER, bits BLOB);
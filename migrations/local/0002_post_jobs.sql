@@ -0,0 +1,20 @@
+-- 글별 파이프라인 진행 상태 (src/storage/post_jobs.py)
+CREATE TABLE IF NOT EXISTS post_jobs (
+    reddit_id TEXT PRIMARY KEY,
+    sub TEXT,
+    stage TEXT DEFAULT 'selected',
+    status TEXT DEFAULT 'active',
+    post TEXT,
+    trends TEXT,
+    parsed TEXT,
+    image_url TEXT,
+    coupang TEXT,
+    slug TEXT,
+    committed_at TEXT,
+    attempts INTEGER DEFAULT 0,
+    next_attempt_at REAL DEFAULT 0,
+    error TEXT,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_post_jobs_resume ON post_jobs (status, stage, next_attempt_at);
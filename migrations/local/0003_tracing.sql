@@ -0,0 +1,11 @@
+-- 실행/단계별 소요 시간 (src/common/tracing.py)
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, mode TEXT, started_at TEXT, duration REAL,
+    status TEXT, published INTEGER
+);
+CREATE TABLE IF NOT EXISTS spans (
+    run_id INTEGER, span_id INTEGER, parent_id INTEGER, stage TEXT, sub TEXT, post_id TEXT,
+    start_offset REAL, duration REAL, status TEXT, error TEXT, counters TEXT,
+    PRIMARY KEY (run_id, span_id)
+);
+CREATE INDEX IF NOT EXISTS idx_spans_stage ON spans (stage, run_id);
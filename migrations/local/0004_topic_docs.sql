@@ -0,0 +1,5 @@
+-- 중복 주제 색인의 MinHash 서명 (src/storage/topic_index.py)
+CREATE TABLE IF NOT EXISTS topic_docs (
+    kind TEXT, doc_hash TEXT, reddit_id TEXT, text TEXT, signature BLOB, params TEXT, created_at TEXT,
+    PRIMARY KEY (kind, doc_hash)
+);
@@ -0,0 +1,3 @@
+-- 유료 API 일일 호출 수 / 시간당 호출 제한 토큰 (src/common/rate_limit.py)
+CREATE TABLE IF NOT EXISTS api_quota (name TEXT, day TEXT, used INTEGER, PRIMARY KEY (name, day));
+CREATE TABLE IF NOT EXISTS token_bucket (name TEXT PRIMARY KEY, tokens REAL, updated_at REAL);
@@ -0,0 +1,7 @@
+-- LLM 호출별 토큰 사용량 (src/common/usage_log.py)
+CREATE TABLE IF NOT EXISTS llm_usage (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, model TEXT, call TEXT,
+    input_tokens INTEGER, output_tokens INTEGER,
+    cache_creation_input_tokens INTEGER, cache_read_input_tokens INTEGER,
+    seconds REAL, created_at TEXT
+);
@@ -0,0 +1,7 @@
+-- 수집 소스별 응답 시간/실패율 (src/collector/source_health.py)
+CREATE TABLE IF NOT EXISTS source_health (
+    source TEXT, sub TEXT, latency REAL, deviation REAL, samples INTEGER DEFAULT 0,
+    failure_rate REAL DEFAULT 0, successes INTEGER DEFAULT 0, failures INTEGER DEFAULT 0,
+    consecutive_failures INTEGER DEFAULT 0, last_failure_at REAL, last_error TEXT, updated_at TEXT,
+    PRIMARY KEY (source, sub)
+);
@@ -0,0 +1,8 @@
+-- --daemon 서브레딧별 수집 간격과 피드에서 본 글 ID (src/pipeline/scheduler.py)
+CREATE TABLE IF NOT EXISTS poll_schedule (
+    sub TEXT PRIMARY KEY, interval REAL, next_poll_at REAL,
+    polls INTEGER DEFAULT 0, new_ids INTEGER DEFAULT 0, errors INTEGER DEFAULT 0, updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS poll_seen (
+    sub TEXT, reddit_id TEXT, seen_at REAL, PRIMARY KEY (sub, reddit_id)
+);
@@ -0,0 +1,6 @@
+-- 썸네일 WebP/AVIF 변형과 원본 경로별 해시 (src/painter/image_optimizer.py)
+CREATE TABLE IF NOT EXISTS image_variants (
+    content_hash TEXT PRIMARY KEY, width INTEGER, height INTEGER, lqip TEXT,
+    variants TEXT, created_at TEXT
+);
+CREATE TABLE IF NOT EXISTS image_sources (source TEXT PRIMARY KEY, content_hash TEXT);
@@ -0,0 +1,18 @@
+-- painter 렌더 큐 (data/painter_queue.db, src/painter/job_queue.py)
+-- 예전에는 RenderQueue가 직접 만들던 테이블이라 IF NOT EXISTS로 기존 파일에도 그대로 적용됨
+CREATE TABLE IF NOT EXISTS render_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    prompt TEXT NOT NULL,
+    output_name TEXT NOT NULL,
+    priority INTEGER DEFAULT 0,
+    status TEXT DEFAULT 'queued',
+    attempts INTEGER DEFAULT 0,
+    result_path TEXT,
+    error TEXT,
+    created_at REAL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_render_jobs_pick ON render_jobs (status, priority DESC, id);
+-- 서비스 프로세스별 마지막 생존 신호. 클라이언트는 이게 오래됐으면 기다리지 않고 바로 포기함
+CREATE TABLE IF NOT EXISTS painter_workers (pid INTEGER PRIMARY KEY, beat_at REAL);
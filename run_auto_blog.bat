@@ -8,9 +8,15 @@ git pull origin main >> 자동실행_로그.txt 2>&1
 rem 2. 가상환경이 있다면 활성화 (현재 .venv 폴더가 보입니다)
 call .venv\Scripts\activate >> 자동실행_로그.txt 2>&1
 
+rem 2-1. D1 스키마 마이그레이션 (적용할 것이 없으면 바로 끝남)
+py -m src.storage.migrations --target d1 >> 자동실행_로그.txt 2>&1
+
 rem 3. 메인 스크립트 실행
 py manager.py >> 자동실행_로그.txt 2>&1
 
+rem 4. 방문/클릭 통계 일별 집계 + 오래된 원본 정리
+py -m src.storage.stats_rollup >> 자동실행_로그.txt 2>&1
+
 echo [%date% %time%] 작업이 완료되었습니다. >> 자동실행_로그.txt
 echo ------------------------------------------ >> 자동실행_로그.txt
 deactivate
@@ -1,3 +1,5 @@
+-- D1 전체 스키마 (새 DB용). 기존 DB는 python -m src.storage.migrations --target d1로 맞춥니다.
+
 -- 기존 통계 테이블
 CREATE TABLE IF NOT EXISTS stats (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -16,6 +18,36 @@ CREATE TABLE IF NOT EXISTS posts (
     content TEXT NOT NULL,
     category TEXT,
     image_url TEXT,
+    -- 썸네일 크기별 WebP/AVIF srcset + LQIP JSON (src/painter/image_optimizer.py picture_meta)
+    image_meta TEXT,
+    -- 발행 때 미리 계산해 두는 값 (src/processor/post_renderer.py)
+    content_html TEXT,
+    excerpt TEXT,
+    reading_minutes INTEGER,
+    toc TEXT,
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
-);
\ No newline at end of file
+);
+
+-- 일별 방문/클릭 집계 (src/storage/stats_rollup.py가 stats에서 모음, 날짜는 한국 시간)
+CREATE TABLE IF NOT EXISTS stats_daily (
+    date TEXT NOT NULL,
+    type TEXT NOT NULL,
+    path TEXT NOT NULL DEFAULT '',
+    label TEXT NOT NULL DEFAULT '',
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (date, type, path, label)
+);
+CREATE INDEX IF NOT EXISTS idx_stats_daily_type_path ON stats_daily (type, path, count);
+
+-- 집계가 끝난 stats id 워터마크
+CREATE TABLE IF NOT EXISTS rollup_state (
+    name TEXT PRIMARY KEY,
+    last_id INTEGER NOT NULL DEFAULT 0,
+    updated_at DATETIME
+);
+
+-- 자주 쓰는 조회용 인덱스 (migrations/d1/0004_hot_query_indexes.sql)
+CREATE INDEX IF NOT EXISTS idx_posts_created ON posts (created_at);
+CREATE INDEX IF NOT EXISTS idx_posts_category_created ON posts (category, created_at);
+CREATE INDEX IF NOT EXISTS idx_posts_updated ON posts (updated_at, id);
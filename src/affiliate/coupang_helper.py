@@ -1,22 +1,41 @@
 import os
+import asyncio
 import hmac
 import hashlib
 import requests
 import json
 import time
 from datetime import datetime
-from dotenv import load_dotenv
 
-load_dotenv()
+from src.common import tracing
+from src.common.http_cache import get_session
+from src.common.rate_limit import TokenBucket, QuotaExceeded
+from src.common.ttl_cache import TTLCache
 
 class CoupangHelper:
+    # 같은 키워드는 6시간 동안 재검색하지 않음 (결과 없음은 1시간)
+    CACHE_TTL = 6 * 60 * 60
+    EMPTY_CACHE_TTL = 60 * 60
+    # 서명(signed-date)은 서버 시간 허용 범위 안에서만 유효하므로 짧게 재사용
+    SIGNATURE_REUSE_SECONDS = 60
+
     def __init__(self):
         self.access_key = os.getenv("COUPANG_ACCESS_KEY")
         self.secret_key = os.getenv("COUPANG_SECRET_KEY")
         self.domain = "https://api-gateway.coupang.com"
+        self.session = get_session("api-gateway.coupang.com")
+        self.cache = TTLCache("coupang_search", self.CACHE_TTL)
+        # 파트너스 검색 API 한도: 시간당 10회
+        self.limiter = TokenBucket("coupang_search", int(os.getenv("COUPANG_SEARCH_HOURLY_LIMIT", "10")), 60 * 60)
+        self._signatures = {}
 
     def _generate_auth_header(self, method, path, query_string=""):
-        """쿠팡 파트너스 공식 HMAC 서명 생성 (여기.txt 참고)"""
+        """쿠팡 파트너스 공식 HMAC 서명 생성 (여기.txt 참고). 유효 시간 안에서는 같은 요청의 서명을 재사용합니다."""
+        sig_key = (method, path, query_string or "")
+        cached = self._signatures.get(sig_key)
+        if cached and time.time() - cached[0] < self.SIGNATURE_REUSE_SECONDS:
+            return cached[1]
+
         # GMT 기준 시간 생성
         date_gmt = time.strftime('%y%m%d', time.gmtime())
         time_gmt = time.strftime('%H%M%S', time.gmtime())
@@ -32,10 +51,49 @@ class CoupangHelper:
             digestmod=hashlib.sha256
         ).hexdigest()
 
-        return f"CEA algorithm=HmacSHA256, access-key={self.access_key}, signed-date={datetime_str}, signature={signature}"
+        header = f"CEA algorithm=HmacSHA256, access-key={self.access_key}, signed-date={datetime_str}, signature={signature}"
+        self._signatures[sig_key] = (time.time(), header)
+        return header
+
+    def search_products(self, keyword, limit=3, wait=0):
+        """
+        키워드로 상품 검색. 캐시 → 시간당 한도 확인 → API 순서로 조회합니다.
+        상품이 없으면 [], 호출 한도에 걸렸거나 API 오류로 조회하지 못했으면 None (나중에 다시 조회해야 함)
+        """
+        cache_key = f"{' '.join(keyword.lower().split())}|{limit}"
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            print(f"[=] 쿠팡 '{keyword}' 캐시 사용: {len(cached)}개")
+            return cached
+
+        try:
+            self.limiter.acquire(timeout=wait)
+        except QuotaExceeded as e:
+            print(f"[!] 쿠팡 API 호출 한도 도달, '{keyword}' 검색을 미룹니다: {e}")
+            return None
 
-    def search_products(self, keyword, limit=3):
-        """키워드로 상품 검색 (여기.txt의 안정적인 파싱 로직 적용)"""
+        result = self._request_products(keyword, limit)
+        if result is not None:
+            self.cache.set(cache_key, result, ttl=None if result else self.EMPTY_CACHE_TTL)
+        return result
+
+    def search_first_available(self, keywords, limit=3):
+        """
+        후보 키워드를 우선순위(목록 순서)대로 하나씩 검색해 처음 나온 비어 있지 않은 결과를 반환합니다.
+        앞 키워드에서 상품이 나오면 뒤 키워드는 검색하지 않아 시간당 한도를 아낍니다.
+        모든 후보에 상품이 없으면 [], 한도/오류로 조회하지 못한 후보가 있으면 None
+        """
+        keywords = [k for k in dict.fromkeys(keywords) if k and k.strip()]
+        for kw in keywords:
+            items = self.search_products(kw, limit)
+            if items is None:
+                return None
+            if items:
+                return items
+        return []
+
+    def _request_products(self, keyword, limit):
+        """실제 API 호출 (여기.txt의 안정적인 파싱 로직 적용). 오류면 None."""
         # 정확한 API 경로
         path = "/v2/providers/affiliate_open_api/apis/openapi/products/search"
         
@@ -51,7 +109,9 @@ class CoupangHelper:
         }
 
         try:
-            response = requests.get(url, headers=headers, timeout=10)
+            # 요청마다 서명이 달라 응답 캐시는 쓰지 않고 커넥션 풀만 공유
+            response = self.session.get(url, headers=headers, timeout=10)
+            tracing.count("bytes_in", len(response.content))
             if response.status_code == 200:
                 data = response.json()
                 
@@ -84,12 +144,21 @@ class CoupangHelper:
                 return result_links[:limit]
             else:
                 print(f"[!] 쿠팡 API 오류 ({response.status_code}): {response.text}")
-                return []
+                return None
         except Exception as e:
             print(f"[!] 쿠팡 API 예외 발생: {e}")
-            return []
+            return None
+
+    async def search_products_async(self, keyword, limit=3):
+        """search_products의 비동기 버전 (블로킹 HTTP 호출을 스레드에서 실행)"""
+        return await asyncio.to_thread(self.search_products, keyword, limit)
+
+    async def search_first_available_async(self, keywords, limit=3):
+        return await asyncio.to_thread(self.search_first_available, keywords, limit)
 
 if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
     helper = CoupangHelper()
     test_keyword = "비타민 K2"
     print(f"[*] '{test_keyword}' 테스트 검색 중...")
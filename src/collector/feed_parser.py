@@ -0,0 +1,114 @@
+"""
+RSS/Atom 스트리밍 파서.
+피드 전체를 트리로 만들지 않고 항목(entry/item)이 닫히는 대로 하나씩 꺼내며,
+limit개를 읽으면 즉시 멈춥니다. 다 쓴 요소는 바로 비워서 메모리를 돌려줍니다.
+"""
+from html.parser import HTMLParser
+from xml.etree.ElementTree import XMLPullParser
+
+CHUNK_SIZE = 16 * 1024
+ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+
+
+class _TagStripper(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.buffer = []
+        self.preserve = 0
+
+    def _flush(self):
+        if not self.buffer:
+            return
+        text = "".join(self.buffer)
+        self.buffer = []
+        # 태그 사이 공백만 있는 구간은 한 칸으로 접음 (BeautifulSoup과 동일 규칙)
+        if not self.preserve and not text.strip(ASCII_SPACES):
+            text = "\n" if "\n" in text else " "
+        self.parts.append(text)
+
+    def handle_starttag(self, tag, attrs):
+        self._flush()
+        if tag in ("pre", "textarea"):
+            self.preserve += 1
+
+    def handle_endtag(self, tag):
+        self._flush()
+        if tag in ("pre", "textarea") and self.preserve:
+            self.preserve -= 1
+
+    def handle_comment(self, data):
+        self._flush()
+
+    def handle_data(self, data):
+        self.buffer.append(data)
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def strip_html(html):
+    """태그를 제거한 텍스트만 반환합니다. (BeautifulSoup(...).get_text()와 같은 결과)"""
+    if not html or "<" not in html and "&" not in html:
+        return html or ""
+    stripper = _TagStripper()
+    stripper.feed(html)
+    stripper.close()
+    return "".join(stripper.parts)
+
+
+def _local(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def iter_items(xml_text, item_tag, limit):
+    """item_tag(네임스페이스 제외 이름) 요소를 {자식이름: 요소} 형태로 최대 limit개 yield합니다."""
+    if limit <= 0:
+        return
+    parser = XMLPullParser(events=("start", "end"))
+    root = None
+    count = 0
+    for pos in range(0, len(xml_text), CHUNK_SIZE):
+        parser.feed(xml_text[pos:pos + CHUNK_SIZE])
+        for event, elem in parser.read_events():
+            if event == "start":
+                if root is None:
+                    root = elem
+                continue
+            if _local(elem.tag) != item_tag:
+                continue
+            fields = {}
+            for child in elem:
+                fields.setdefault(_local(child.tag), child)
+            yield fields
+            count += 1
+            elem.clear()
+            if count >= limit:
+                return
+    parser.close()
+
+
+def parse_atom_entries(xml_text, limit):
+    """Atom(레딧 RSS) entry를 id/title/content_html/link dict로 반환합니다."""
+    entries = []
+    for f in iter_items(xml_text, "entry", limit):
+        link = f.get("link")
+        entries.append({
+            "id": (f["id"].text or "") if "id" in f else "",
+            "title": (f["title"].text or "") if "title" in f else "",
+            "content_html": (f["content"].text or "") if "content" in f else "",
+            "link": link.get("href", "") if link is not None else "",
+        })
+    return entries
+
+
+def parse_rss_items(xml_text, limit):
+    """RSS 2.0(구글 뉴스) item을 title/link dict로 반환합니다."""
+    items = []
+    for f in iter_items(xml_text, "item", limit):
+        items.append({
+            "title": (f["title"].text or "") if "title" in f else "",
+            "link": (f["link"].text or "") if "link" in f else "",
+        })
+    return items
@@ -1,48 +1,124 @@
 import os
-import requests
-from dotenv import load_dotenv
+import asyncio
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
 
-load_dotenv()
+from src.common import tracing
+from src.common.http_cache import get_session
+from src.common.rate_limit import DailyQuota, QuotaExceeded
+from src.common.ttl_cache import TTLCache
 
 class GoogleSearcher:
+    # 같은 검색어는 하루 동안 유료 쿼터를 다시 쓰지 않음
+    CACHE_TTL = 24 * 60 * 60
+
     def __init__(self):
         self.api_key = os.getenv("GOOGLE_SEARCH_API_KEY")
         self.cx = os.getenv("GOOGLE_SEARCH_CX")
+        self.session = get_session("www.googleapis.com")
+        self.cache = TTLCache("google_search", self.CACHE_TTL)
+        self.quota = DailyQuota("google_search", int(os.getenv("GOOGLE_SEARCH_DAILY_QUOTA", "100")))
 
-    def search_korean_trends(self, keyword):
-        """구글에서 한국 상위 블로그 정보를 검색하여 요약합니다."""
-        if not self.api_key or not self.cx:
-            print("[!] 구글 검색 API 키 또는 CX가 설정되지 않았습니다. 트렌드 분석을 건너뜁니다.")
-            return None
+    @staticmethod
+    def normalize_query(keyword):
+        return " ".join(unicodedata.normalize("NFC", keyword).lower().split())
 
+    def _search_items(self, keyword, lang="lang_ko", num=5):
+        """검색 결과 항목(title/snippet/link) 리스트. 캐시 → 쿼터 확인 → API 순서로 조회합니다."""
+        query = self.normalize_query(keyword)
+        cache_key = f"{query}|{lang}|{num}"
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            print(f"[=] 구글 검색 캐시 사용: '{keyword}'")
+            return cached
+
+        self.quota.acquire()
         print(f"[*] 구글에서 '{keyword}' 관련 한국 트렌드 검색 중...")
         url = "https://www.googleapis.com/customsearch/v1"
         params = {
             "key": self.api_key,
             "cx": self.cx,
-            "q": keyword,
-            "lr": "lang_ko", 
-            "num": 5
+            "q": query,
+            "lr": lang,
+            "num": num
         }
 
-        try:
-            response = requests.get(url, params=params, timeout=10)
-            if response.status_code == 200:
-                items = response.json().get("items", [])
-                trend_summary = []
-                for item in items:
-                    title = item.get("title")
-                    snippet = item.get("snippet")
-                    trend_summary.append(f"- 제목: {title}\n  내용요약: {snippet}")
-                
-                return "\n".join(trend_summary)
-            else:
-                print(f"[!] 구글 검색 실패: {response.status_code}")
-                return None
-        except Exception as e:
-            print(f"[!] 구글 검색 중 오류 발생: {e}")
+        response = self.session.get(url, params=params, timeout=10)
+        tracing.count("bytes_in", len(response.content))
+        if response.status_code != 200:
+            print(f"[!] 구글 검색 실패: {response.status_code}")
+            return None
+
+        items = [
+            {"title": item.get("title"), "snippet": item.get("snippet"), "link": item.get("link")}
+            for item in response.json().get("items", [])
+        ]
+        self.cache.set(cache_key, items)
+        return items
+
+    @staticmethod
+    def _format(items):
+        trend_summary = []
+        for item in items:
+            trend_summary.append(f"- 제목: {item['title']}\n  내용요약: {item['snippet']}")
+        return "\n".join(trend_summary)
+
+    def search_korean_trends(self, keyword):
+        """구글에서 한국 상위 블로그 정보를 검색하여 요약합니다."""
+        return self.search_korean_trends_many([keyword])
+
+    def search_korean_trends_many(self, keywords, max_items=10):
+        """
+        여러 키워드를 동시에 검색하고 URL 기준으로 중복을 제거해 하나의 요약으로 합칩니다.
+        각 키워드의 상위 결과가 앞에 오도록 순위별로 번갈아 섞습니다.
+        """
+        if not self.api_key or not self.cx:
+            print("[!] 구글 검색 API 키 또는 CX가 설정되지 않았습니다. 트렌드 분석을 건너뜁니다.")
+            return None
+
+        # 정규화 후 같은 검색어는 한 번만 조회 (동시 조회 시 쿼터 중복 차감 방지)
+        unique = {}
+        for k in keywords:
+            if k and k.strip():
+                unique.setdefault(self.normalize_query(k), k.strip())
+        keywords = list(unique.values())
+        if not keywords:
             return None
 
+        def safe_search(keyword):
+            try:
+                return self._search_items(keyword) or []
+            except QuotaExceeded as e:
+                print(f"[!] 구글 검색 쿼터 초과, '{keyword}' 검색을 건너뜁니다: {e}")
+                return []
+            except Exception as e:
+                print(f"[!] 구글 검색 중 오류 발생: {e}")
+                return []
+
+        with ThreadPoolExecutor(max_workers=len(keywords)) as pool:
+            results = list(pool.map(safe_search, keywords))
+
+        merged, seen = [], set()
+        for rank in range(max((len(r) for r in results), default=0)):
+            for items in results:
+                if rank < len(items):
+                    item = items[rank]
+                    key = item.get("link") or item.get("title")
+                    if key not in seen:
+                        seen.add(key)
+                        merged.append(item)
+
+        return self._format(merged[:max_items]) if merged else None
+
+    async def search_korean_trends_async(self, keyword):
+        """search_korean_trends의 비동기 버전 (블로킹 HTTP 호출을 스레드에서 실행)"""
+        return await asyncio.to_thread(self.search_korean_trends, keyword)
+
+    async def search_korean_trends_many_async(self, keywords):
+        return await asyncio.to_thread(self.search_korean_trends_many, keywords)
+
 if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
     searcher = GoogleSearcher()
-    print(searcher.search_korean_trends("비타민D K2 효능"))
\ No newline at end of file
+    print(searcher.search_korean_trends("비타민D K2 효능"))
@@ -1,46 +1,165 @@
-import requests
-import time
+import asyncio
+import hashlib
+import os
 import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from xml.etree.ElementTree import ParseError
 from bs4 import BeautifulSoup
 
+from src.collector.feed_parser import parse_atom_entries, parse_rss_items, strip_html
+from src.collector.source_health import SourceHealth
+from src.common.http_cache import get_http_cache
+from src.storage.topic_index import normalize
+
+
+def news_id(title):
+    """
+    구글 뉴스 항목의 안정적인 ID. 매체명 꼬리(' - Reuters')를 떼고 정규화한 제목의 해시라서
+    같은 기사를 여러 매체가 그대로 실어도, 제목 앞부분만 같은 다른 기사여도 ID가 뒤섞이지 않습니다.
+    """
+    headline = title.rsplit(" - ", 1)[0] if " - " in title else title
+    return "gn_" + hashlib.sha1(normalize(headline).encode("utf-8")).hexdigest()[:16]
+
+
+def legacy_news_id(title):
+    """
+    예전 구글 뉴스 ID (제목에서 영문자와 '0'만 남긴 앞 15자). posts에는 원문 제목이 없어 새 ID로 옮길 수 없으므로
+    이 형식으로 처리된 글은 수집할 때 함께 확인합니다. (manager.filter_new_candidates)
+    """
+    return re.sub(r'[^a-zA-Z0-0]', '', title)[:15]
+
 class RedditCollector:
-    def __init__(self):
+    def __init__(self, health=None, hedge=None):
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8"
         }
+        self.http = get_http_cache()
+        self.health = health or SourceHealth()
+        # COLLECT_HEDGE=0이면 예전처럼 레딧이 실패한 뒤에만 구글 뉴스로 넘어감
+        self.hedge = os.getenv("COLLECT_HEDGE", "1") != "0" if hedge is None else hedge
+        self.pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="feed")
+
+    def _fetch_feed(self, url, limit, parse):
+        """
+        캐시/조건부 GET으로 피드를 받아 파싱합니다. 피드가 그대로면 저장된 파싱 결과를 재사용합니다.
+        (상태 코드, 글 목록, 네트워크 없이 캐시에서 바로 나왔는지)를 반환합니다.
+        """
+        response = self.http.get(url, headers=self.headers, timeout=10)
+        if response.status_code != 200:
+            return response.status_code, None, response.from_cache
+        cached = response.parsed
+        if cached and cached.get("limit", 0) >= limit:
+            print(f"[=] 피드 변경 없음, 캐시 사용 ({len(cached['posts'][:limit])}건)")
+            return 200, cached["posts"][:limit], response.from_cache and not response.not_modified
+        posts = parse(response.text, limit)
+        self.http.store_parsed(url, {"limit": limit, "posts": posts})
+        return 200, posts, False
+
+    def _sources(self, subreddit_name):
+        """(이름, URL, 파서) - 앞이 주 소스, 뒤가 예비 소스"""
+        return (
+            # old.reddit.com (더 안정적임)
+            ("reddit", f"https://old.reddit.com/r/{subreddit_name}/top/.rss?t=day", self._parse_reddit_rss),
+            # 구글 뉴스: 해당 서브레딧 키워드로 글로벌 최신 뉴스를 가져옵니다.
+            ("google_news", f"https://news.google.com/rss/search?q={subreddit_name}+latest&hl=en-US&gl=US&ceid=US:en",
+             self._parse_google_news_rss),
+        )
+
+    def _fetch_source(self, source, subreddit_name, limit):
+        """소스 1개를 받아 건강 기록을 남기고, 쓸 만한 결과(200 + 글 1건 이상)면 글 목록, 아니면 None"""
+        name, url, parse = source
+        started = time.perf_counter()
+        try:
+            status, posts, cached = self._fetch_feed(url, limit, parse)
+        except Exception as e:
+            self.health.record(name, subreddit_name, False, time.perf_counter() - started, e)
+            print(f"[!] {name} 접속 불가: {e}")
+            return None
+        seconds = None if cached else time.perf_counter() - started
+        self.health.record(name, subreddit_name, status == 200, seconds, None if status == 200 else f"HTTP {status}")
+        if status != 200:
+            print(f"[!] {name} 응답 오류 (Status: {status})")
+        return posts or None
 
     def fetch_top_posts(self, subreddit_name, limit=1):
-        """레딧(old 버전)과 구글 뉴스를 교대로 시도하여 무조건 데이터를 가져옵니다."""
-        
-        # 시도 1: old.reddit.com (더 안정적임)
+        """
+        레딧(old 버전)을 먼저 부르고, 늦어지거나 실패하면 구글 뉴스를 함께 불러 먼저 온 쓸 만한 결과를 씁니다.
+        언제 구글 뉴스를 보낼지는 소스별 건강 기록(SourceHealth.hedge_delay)이 정합니다.
+        진 쪽 요청은 결과만 버립니다. (requests 호출은 중간에 끊을 수 없어 스레드에서 끝까지 돌고 기록만 남김)
+        두 소스 모두 실패하면 None ('새 글 없음'과 구분해 --daemon 스케줄러가 짧은 간격으로 다시 시도)
+        """
+        primary, backup = self._sources(subreddit_name)
+        hedge_after = self.health.hedge_delay(primary[0], backup[0], subreddit_name) if self.hedge else None
         print(f"\n[*] r/{subreddit_name} 트렌드 수집 중 (Reddit Mirror)...")
-        reddit_url = f"https://old.reddit.com/r/{subreddit_name}/top/.rss?t=day"
-        
+        pending = {self.pool.submit(self._fetch_source, primary, subreddit_name, limit)}
+        hedged = False
+        while pending:
+            done, pending = wait(pending, timeout=None if hedged else hedge_after, return_when=FIRST_COMPLETED)
+            for future in done:
+                posts = future.result()
+                if posts:
+                    for loser in pending:
+                        loser.cancel()
+                    return posts
+            if not hedged:
+                hedged = True
+                if done:
+                    print("[!] 레딧 수집 실패. 구글 뉴스로 전환합니다.")
+                elif hedge_after == 0:
+                    print("[*] 레딧이 최근 실패 중이라 구글 뉴스도 함께 요청합니다.")
+                else:
+                    print(f"[*] 레딧 응답이 {hedge_after:.1f}초 넘게 늦어 구글 뉴스도 함께 요청합니다.")
+                print(f"[*] '{subreddit_name}' 관련 글로벌 최신 트렌드 검색 중 (Google News)...")
+                pending.add(self.pool.submit(self._fetch_source, backup, subreddit_name, limit))
+
+        print("[!] 모든 수집 수단 실패")
+        return None
+
+    async def fetch_top_posts_async(self, subreddit_name, limit=1):
+        """fetch_top_posts의 비동기 버전 (블로킹 HTTP 호출을 스레드에서 실행)"""
+        return await asyncio.to_thread(self.fetch_top_posts, subreddit_name, limit)
+
+    def _parse_reddit_rss(self, xml_text, limit):
         try:
-            response = requests.get(reddit_url, headers=self.headers, timeout=10)
-            if response.status_code == 200:
-                return self._parse_reddit_rss(response.text, limit)
-            else:
-                print(f"[!] 레딧 응답 지연 (Status: {response.status_code}). 구글 뉴스로 전환합니다.")
-        except Exception:
-            print("[!] 레딧 접속 불가. 구글 뉴스로 전환합니다.")
-
-        # 시도 2: 구글 뉴스 (백업 - 매우 안정적)
-        # 해당 서브레딧 키워드로 글로벌 최신 뉴스를 가져옵니다.
-        print(f"[*] '{subreddit_name}' 관련 글로벌 최신 트렌드 검색 중 (Google News)...")
-        google_news_url = f"https://news.google.com/rss/search?q={subreddit_name}+latest&hl=en-US&gl=US&ceid=US:en"
-        
+            entries = parse_atom_entries(xml_text, limit)
+        except ParseError:
+            # 형식이 깨진 피드는 관대한 BeautifulSoup 파서로 재시도
+            return self._parse_reddit_rss_soup(xml_text, limit)
+        posts = []
+        for entry in entries:
+            title = entry["title"]
+            content_text = strip_html(entry["content_html"])
+            posts.append({
+                "id": entry["id"].split("/")[-1],
+                "title": title,
+                "content": content_text if len(content_text) > 20 else title,
+                "url": entry["link"]
+            })
+            print(f"[+] 레딧 수집 성공: {title[:30]}...")
+        return posts
+
+    def _parse_google_news_rss(self, xml_text, limit):
         try:
-            response = requests.get(google_news_url, headers=self.headers, timeout=10)
-            if response.status_code == 200:
-                return self._parse_google_news_rss(response.text, limit)
-        except Exception as e:
-            print(f"[!] 모든 수집 수단 실패: {e}")
-        
-        return []
+            items = parse_rss_items(xml_text, limit)
+        except ParseError:
+            return self._parse_google_news_rss_soup(xml_text, limit)
+        posts = []
+        for item in items:
+            title = item["title"]
+            link = item["link"]
+            posts.append({
+                "id": news_id(title),
+                "legacy_id": legacy_news_id(title),
+                "title": title,
+                "content": f"Global Trend News: {title}. Source: {link}",
+                "url": link
+            })
+            print(f"[+] 구글 뉴스 수집 성공: {title[:30]}...")
+        return posts
 
-    def _parse_reddit_rss(self, xml_text, limit):
+    def _parse_reddit_rss_soup(self, xml_text, limit):
         soup = BeautifulSoup(xml_text, "xml")
         entries = soup.find_all("entry")[:limit]
         posts = []
@@ -57,7 +176,7 @@ class RedditCollector:
             print(f"[+] 레딧 수집 성공: {title[:30]}...")
         return posts
 
-    def _parse_google_news_rss(self, xml_text, limit):
+    def _parse_google_news_rss_soup(self, xml_text, limit):
         soup = BeautifulSoup(xml_text, "xml")
         items = soup.find_all("item")[:limit]
         posts = []
@@ -65,7 +184,8 @@ class RedditCollector:
             title = item.find("title").text
             link = item.find("link").text
             posts.append({
-                "id": re.sub(r'[^a-zA-Z0-0]', '', title)[:15],
+                "id": news_id(title),
+                "legacy_id": legacy_news_id(title),
                 "title": title,
                 "content": f"Global Trend News: {title}. Source: {link}",
                 "url": link
@@ -76,4 +196,4 @@ class RedditCollector:
 if __name__ == "__main__":
     collector = RedditCollector()
     results = collector.fetch_top_posts("Supplements", limit=1)
-    print(f"수집 결과: {len(results)}건")
+    print(f"수집 결과: {len(results or [])}건")
@@ -0,0 +1,111 @@
+"""
+수집 소스(레딧 RSS / 구글 뉴스)별 응답 시간과 실패 기록 (gtb_storage.db의 source_health).
+
+RedditCollector가 레딧을 먼저 부르고, 구글 뉴스(예비)를 언제 같이 부를지 여기서 정합니다.
+
+- 응답 시간은 TCP 재전송 타이머처럼 평균(latency)과 편차(deviation)의 지수 이동 평균으로 추적하고
+  '평소라면 이 안에 끝났어야 하는 시간' = latency + 4 × deviation이 지나면 예비 소스를 함께 보냄
+- 해당 서브레딧에서 최근 실패했거나 소스 전체 실패율이 높으면 처음부터 동시에 보냄
+- 예비 소스도 최근 계속 실패 중이면 괜히 부르지 않고 주 소스가 실패했을 때만 넘어감
+
+행은 (소스, 서브레딧)별로 두고, 서브레딧 '*' 행에 소스 전체 통계를 함께 쌓습니다.
+캐시 적중처럼 네트워크를 타지 않은 응답은 응답 시간에 넣지 않습니다.
+"""
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from src.storage.migrations import migrate_local
+
+ALL = "*"
+
+
+class SourceHealth:
+    def __init__(self, db_path="data/gtb_storage.db", clock=time.time, alpha=0.2, hedge_after=None,
+                 min_hedge=0.3, recent_window=3600, min_samples=3):
+        self.clock = clock
+        self.alpha = alpha
+        # 기록이 부족할 때, 그리고 아무리 느려도 이 시간(초)이 지나면 예비 소스를 보냄
+        self.hedge_after = hedge_after if hedge_after is not None else float(os.getenv("COLLECT_HEDGE_AFTER", "2.0"))
+        self.min_hedge = min_hedge
+        self.recent_window = recent_window
+        self.min_samples = min_samples
+        if db_path != ":memory:" and os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        migrate_local(self.conn)
+
+    def get(self, source, sub=ALL):
+        with self.lock:
+            row = self.conn.execute("SELECT * FROM source_health WHERE source = ? AND sub = ?", (source, sub)).fetchone()
+        return dict(row) if row else None
+
+    def record(self, source, sub, ok, seconds=None, error=None):
+        """
+        소스 호출 1번의 결과를 반영합니다. seconds가 None이면(캐시 적중 등) 응답 시간은 건드리지 않습니다.
+        """
+        now = self.clock()
+        with self.lock:
+            with self.conn:
+                for key in (sub, ALL):
+                    row = self.conn.execute("SELECT * FROM source_health WHERE source = ? AND sub = ?",
+                                            (source, key)).fetchone()
+                    s = dict(row) if row else {"latency": None, "deviation": None, "samples": 0, "failure_rate": 0.0,
+                                               "successes": 0, "failures": 0, "consecutive_failures": 0,
+                                               "last_failure_at": None, "last_error": None}
+                    # 실패한 호출의 시간(대개 타임아웃)도 '느리다'는 정보라 응답 시간에 넣음
+                    if seconds is not None:
+                        if s["latency"] is None:
+                            s["latency"], s["deviation"] = seconds, seconds / 2
+                        else:
+                            s["deviation"] += self.alpha * (abs(seconds - s["latency"]) - s["deviation"])
+                            s["latency"] += self.alpha * (seconds - s["latency"])
+                        s["samples"] += 1
+                    s["failure_rate"] += self.alpha * ((0.0 if ok else 1.0) - s["failure_rate"])
+                    if ok:
+                        s["successes"] += 1
+                        s["consecutive_failures"] = 0
+                    else:
+                        s["failures"] += 1
+                        s["consecutive_failures"] += 1
+                        s["last_failure_at"] = now
+                        s["last_error"] = str(error)[:300] if error else None
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO source_health (source, sub, latency, deviation, samples, failure_rate, "
+                        "successes, failures, consecutive_failures, last_failure_at, last_error, updated_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (source, key, s["latency"], s["deviation"], s["samples"], s["failure_rate"], s["successes"],
+                         s["failures"], s["consecutive_failures"], s["last_failure_at"], s["last_error"],
+                         datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+                    )
+
+    def _failing(self, s):
+        return bool(s and s["consecutive_failures"] and self.clock() - (s["last_failure_at"] or 0) < self.recent_window)
+
+    def hedge_delay(self, primary, backup, sub):
+        """
+        주 소스를 보낸 뒤 몇 초 지나면 예비 소스를 함께 보낼지.
+        0이면 처음부터 동시에, None이면 주 소스가 실패할 때까지 기다립니다.
+        """
+        if self._failing(self.get(backup, sub)) or self._failing(self.get(backup)):
+            return None
+        overall = self.get(primary)
+        if self._failing(self.get(primary, sub)) or (overall and overall["failure_rate"] >= 0.5):
+            return 0.0
+        if not overall or overall["samples"] < self.min_samples:
+            return self.hedge_after
+        return min(self.hedge_after, max(self.min_hedge, overall["latency"] + 4 * overall["deviation"]))
+
+    def report(self):
+        with self.lock:
+            rows = self.conn.execute("SELECT * FROM source_health WHERE sub = ? ORDER BY source", (ALL,)).fetchall()
+        parts = [f"{r['source']} 평균 {r['latency'] or 0:.2f}s, 실패율 {r['failure_rate']:.0%}" for r in rows]
+        return "수집 소스: " + (" / ".join(parts) if parts else "기록 없음")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
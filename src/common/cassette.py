@@ -0,0 +1,414 @@
+"""
+외부 API 호출 녹화/재생 (Reddit·구글 뉴스·구글 검색·쿠팡 HTTP, Gemini, Claude, painter).
+
+    python manager.py --record data/cassettes/run.json      # 실제 API로 돌리면서 응답을 녹화
+    python -m benchmarks.suite --cassette data/cassettes/run.json   # 네트워크/GPU 없이 재생
+
+녹화 파일은 JSON 하나이고, 항목마다 종류(kind), 요청 키, 응답, 걸린 시간이 들어 있습니다.
+재생할 때는 같은 종류에서 아직 쓰지 않은 항목 중 키가 같은 것을 순서대로 돌려주고, 없으면 키가 null이거나
+'접두어*' 형태로 맞는 항목을 씁니다. (합성 녹화용, strict=True면 정확히 같은 키만)
+speed를 주면 녹화된 시간 × speed만큼 기다려 실제 지연을 흉내 냅니다. (기본 0 = 즉시)
+API 키는 요청 키에 넣지 않습니다. (구글 검색 key 파라미터는 HttpCache.cache_key가 빼고, 쿠팡 서명은 헤더라 제외)
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+from requests.structures import CaseInsensitiveDict
+
+from src.common.http_cache import HttpCache, set_session_factory
+from src.common.usage_log import USAGE_FIELDS
+
+FORMAT_VERSION = 1
+
+
+class CassetteMiss(LookupError):
+    """재생 중 녹화에 없는 요청이 들어옴"""
+
+
+def request_key(*parts):
+    """LLM 요청처럼 긴 요청은 해시로 키를 만듭니다."""
+    return hashlib.sha1(json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+
+class Cassette:
+    def __init__(self, path, mode="replay", speed=0.0, strict=False):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"알 수 없는 모드: {mode}")
+        self.path = path
+        self.mode = mode
+        self.speed = speed
+        self.strict = strict
+        self.lock = threading.Lock()
+        self.interactions = []
+        self.used = set()
+        if mode == "replay":
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            self.interactions = data["interactions"]
+
+    @property
+    def recording(self):
+        return self.mode == "record"
+
+    @classmethod
+    def from_interactions(cls, interactions, speed=0.0):
+        """합성 녹화(benchmarks/synthetic.py)처럼 메모리에서 바로 재생할 때"""
+        cassette = cls.__new__(cls)
+        cassette.path, cassette.mode, cassette.speed, cassette.strict = None, "replay", speed, False
+        cassette.lock = threading.Lock()
+        cassette.interactions = list(interactions)
+        cassette.used = set()
+        return cassette
+
+    def record(self, kind, key, response, seconds):
+        with self.lock:
+            self.interactions.append({"kind": kind, "key": key, "response": response, "seconds": round(seconds, 4)})
+
+    def _matches(self, entry_key, key, exact):
+        if exact or self.strict:
+            return entry_key == key
+        return entry_key is None or (entry_key.endswith("*") and key.startswith(entry_key[:-1]))
+
+    def _take(self, kind, key):
+        with self.lock:
+            # 키가 정확히 같은 항목을 먼저, 없으면 와일드카드(null 또는 '접두어*') 항목
+            for exact in (True, False):
+                for i, entry in enumerate(self.interactions):
+                    if i in self.used or entry["kind"] != kind:
+                        continue
+                    if self._matches(entry["key"], key, exact):
+                        self.used.add(i)
+                        return entry
+        raise CassetteMiss(f"녹화에 없는 {kind} 요청: {key}")
+
+    def play(self, kind, key, wait=True):
+        entry = self._take(kind, key)
+        if wait and self.speed:
+            time.sleep(entry["seconds"] * self.speed)
+        return entry
+
+    async def play_async(self, kind, key):
+        entry = self._take(kind, key)
+        if self.speed:
+            await asyncio.sleep(entry["seconds"] * self.speed)
+        return entry
+
+    def save(self):
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"version": FORMAT_VERSION, "interactions": self.interactions}, f, ensure_ascii=False, indent=1)
+        print(f"[+] 외부 호출 {len(self.interactions)}건 녹화: {self.path}")
+
+    def unused(self):
+        return len(self.interactions) - len(self.used)
+
+
+# --- HTTP (requests.Session 자리) ---
+
+class RecordedResponse:
+    """requests.Response 대신 쓰는 응답 (status_code, headers, content, text, json())"""
+
+    def __init__(self, status_code, content, headers):
+        self.status_code = status_code
+        self.content = content
+        self.headers = CaseInsensitiveDict(headers)
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def _dump_body(content):
+    try:
+        return {"body": content.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"body_b64": base64.b64encode(content).decode("ascii")}
+
+
+def _load_body(response):
+    if "body_b64" in response:
+        return base64.b64decode(response["body_b64"])
+    return response.get("body", "").encode("utf-8")
+
+
+class CassetteSession:
+    """get_session(host)가 돌려주는 세션 자리에 들어갑니다. 녹화 중이면 실제 세션으로 요청하고 응답을 남깁니다."""
+
+    def __init__(self, cassette, session=None):
+        self.cassette = cassette
+        self.session = session
+
+    def get(self, url, params=None, headers=None, timeout=None, **kwargs):
+        key = HttpCache.cache_key(url, params)
+        if not self.cassette.recording:
+            response = self.cassette.play("http", key)["response"]
+            return RecordedResponse(response["status_code"], _load_body(response), response.get("headers", {}))
+        started = time.perf_counter()
+        response = self.session.get(url, params=params, headers=headers, timeout=timeout, **kwargs)
+        kept = {k: v for k, v in response.headers.items() if k.lower() in ("content-type", "etag", "last-modified")}
+        self.cassette.record("http", key, {"status_code": response.status_code, "headers": kept, **_dump_body(response.content)},
+                             time.perf_counter() - started)
+        return response
+
+
+# --- Gemini (GenerativeModel 자리) ---
+
+class CassetteGeminiModel:
+    def __init__(self, cassette, model=None):
+        self.cassette = cassette
+        self.model = model
+
+    def generate_content(self, prompt):
+        key = request_key("gemini", prompt)
+        if not self.cassette.recording:
+            return SimpleNamespace(text=self.cassette.play("gemini", key)["response"]["text"])
+        started = time.perf_counter()
+        response = self.model.generate_content(prompt)
+        self.cassette.record("gemini", key, {"text": response.text}, time.perf_counter() - started)
+        return response
+
+    async def generate_content_async(self, prompt):
+        key = request_key("gemini", prompt)
+        if not self.cassette.recording:
+            return SimpleNamespace(text=(await self.cassette.play_async("gemini", key))["response"]["text"])
+        started = time.perf_counter()
+        response = await self.model.generate_content_async(prompt)
+        self.cassette.record("gemini", key, {"text": response.text}, time.perf_counter() - started)
+        return response
+
+
+# --- Claude (anthropic.Anthropic / AsyncAnthropic 자리) ---
+
+def _claude_key(kwargs):
+    return request_key("claude", kwargs.get("model"), kwargs.get("system"), kwargs.get("messages"))
+
+
+def _dump_message(message):
+    return {"text": message.content[0].text, "usage": {f: getattr(message.usage, f, None) or 0 for f in USAGE_FIELDS}}
+
+
+def _load_message(response):
+    return SimpleNamespace(content=[SimpleNamespace(type="text", text=response["text"])],
+                           usage=SimpleNamespace(**response["usage"]))
+
+
+class _StreamRecorder:
+    """messages.stream(...) 컨텍스트를 감싸 텍스트 조각과 도착 시각을 남깁니다. (동기/비동기 겸용)"""
+
+    def __init__(self, cassette, key, manager):
+        self.cassette, self.key, self.manager = cassette, key, manager
+        self.chunks = []
+        self.message = None
+
+    def _start(self, stream):
+        self.stream = stream
+        self.started = time.perf_counter()
+        return self
+
+    def _finish(self, exc_type):
+        if exc_type is None and self.message is not None:
+            response = {**_dump_message(self.message), "chunks": self.chunks}
+            self.cassette.record("claude_stream", self.key, response, time.perf_counter() - self.started)
+
+    def _chunk(self, text):
+        self.chunks.append([round(time.perf_counter() - self.started, 4), text])
+
+    def __enter__(self):
+        return self._start(self.manager.__enter__())
+
+    def __exit__(self, exc_type, exc, tb):
+        self._finish(exc_type)
+        return self.manager.__exit__(exc_type, exc, tb)
+
+    async def __aenter__(self):
+        return self._start(await self.manager.__aenter__())
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._finish(exc_type)
+        return await self.manager.__aexit__(exc_type, exc, tb)
+
+    @property
+    def text_stream(self):
+        if hasattr(self.stream.text_stream, "__aiter__"):
+            return self._atext()
+        return self._text()
+
+    def _text(self):
+        for text in self.stream.text_stream:
+            self._chunk(text)
+            yield text
+
+    async def _atext(self):
+        async for text in self.stream.text_stream:
+            self._chunk(text)
+            yield text
+
+    def get_final_message(self):
+        result = self.stream.get_final_message()
+        if asyncio.iscoroutine(result):
+            async def keep():
+                self.message = await result
+                return self.message
+            return keep()
+        self.message = result
+        return result
+
+
+class _StreamReplay:
+    """녹화된 조각을 같은 간격(× speed)으로 흘려 줍니다."""
+
+    def __init__(self, cassette, key):
+        self.cassette, self.key = cassette, key
+
+    def __enter__(self):
+        self.response = self.cassette.play("claude_stream", self.key, wait=False)["response"]
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, *exc):
+        return False
+
+    @property
+    def text_stream(self):
+        return _ReplayChunks(self.response["chunks"], self.cassette.speed)
+
+    def get_final_message(self):
+        return _load_message(self.response)
+
+
+class _ReplayChunks:
+    def __init__(self, chunks, speed):
+        self.chunks, self.speed = chunks, speed
+
+    def _delays(self):
+        previous = 0.0
+        for offset, text in self.chunks:
+            yield (offset - previous) * self.speed, text
+            previous = offset
+
+    def __iter__(self):
+        for delay, text in self._delays():
+            if delay > 0:
+                time.sleep(delay)
+            yield text
+
+    async def __aiter__(self):
+        for delay, text in self._delays():
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield text
+
+
+class _AsyncFinal:
+    """비동기 클라이언트에서는 get_final_message()를 await하므로 한 번 감쌉니다."""
+
+    def __init__(self, replay):
+        self.replay = replay
+
+    def __getattr__(self, name):
+        return getattr(self.replay, name)
+
+    async def __aenter__(self):
+        await self.replay.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def get_final_message(self):
+        return self.replay.get_final_message()
+
+
+class CassetteAnthropic:
+    """client.messages.create / client.messages.stream 만 흉내 냅니다. is_async면 AsyncAnthropic 자리."""
+
+    def __init__(self, cassette, client=None, is_async=False):
+        self.cassette = cassette
+        self.client = client
+        self.is_async = is_async
+        self.messages = self
+
+    def create(self, **kwargs):
+        if self.is_async:
+            return self._create_async(**kwargs)
+        key = _claude_key(kwargs)
+        if not self.cassette.recording:
+            return _load_message(self.cassette.play("claude", key)["response"])
+        started = time.perf_counter()
+        message = self.client.messages.create(**kwargs)
+        self.cassette.record("claude", key, _dump_message(message), time.perf_counter() - started)
+        return message
+
+    async def _create_async(self, **kwargs):
+        key = _claude_key(kwargs)
+        if not self.cassette.recording:
+            return _load_message((await self.cassette.play_async("claude", key))["response"])
+        started = time.perf_counter()
+        message = await self.client.messages.create(**kwargs)
+        self.cassette.record("claude", key, _dump_message(message), time.perf_counter() - started)
+        return message
+
+    def stream(self, **kwargs):
+        key = _claude_key(kwargs)
+        if self.cassette.recording:
+            return _StreamRecorder(self.cassette, key, self.client.messages.stream(**kwargs))
+        replay = _StreamReplay(self.cassette, key)
+        return _AsyncFinal(replay) if self.is_async else replay
+
+
+# --- painter ---
+
+class CassettePainter:
+    """녹화 중에는 실제 painter의 렌더 시간을 남기고, 재생 중에는 StubPainter로 1x1 PNG만 씁니다."""
+
+    def __init__(self, cassette, painter=None):
+        self.cassette = cassette
+        self.painter = painter
+
+    def generate_image(self, prompt, output_name=None):
+        key = request_key("painter", prompt)
+        if not self.cassette.recording:
+            from src.painter.painter_service import StubPainter
+            self.cassette.play("painter", key)
+            return StubPainter(delay=0).generate_image(prompt, output_name)
+        started = time.perf_counter()
+        result = self.painter.generate_image(prompt, output_name)
+        self.cassette.record("painter", key, {}, time.perf_counter() - started)
+        return result
+
+
+def install(manager, cassette):
+    """
+    GTBManager의 외부 클라이언트를 녹화/재생 래퍼로 바꿉니다.
+    HTTP 세션은 이후 get_session()으로 만들어지는 것부터 적용되므로 클라이언트를 만들기 전에 부릅니다.
+    """
+    recording = cassette.recording
+    set_session_factory(lambda host, new_session: CassetteSession(cassette, new_session(host) if recording else None))
+
+    analyzer = manager.analyzer
+    analyzer.model = CassetteGeminiModel(cassette, analyzer.model if recording else None)
+    processor = manager.processor
+    processor.client = CassetteAnthropic(cassette, processor.client if recording else None)
+    processor.async_client = CassetteAnthropic(cassette, processor.async_client if recording else None, is_async=True)
+    # 재생할 때는 GPU 모델을 아예 올리지 않음
+    manager.painter = CassettePainter(cassette, manager.painter if recording else None)
+    return cassette
+
+
+def uninstall():
+    set_session_factory(None)
@@ -0,0 +1,176 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.common import tracing
+from src.storage.migrations import migrate_local
+
+# 엔드포인트(호스트)별 신선도 유지 시간(초). 이 시간 안에는 네트워크 없이 캐시 사용,
+# 지나면 ETag/Last-Modified로 재검증(304면 본문 재다운로드/재파싱 없음)
+ENDPOINT_TTL = {
+    "old.reddit.com": 10 * 60,
+    "news.google.com": 15 * 60,
+}
+# 캐시 키에서 제외할 파라미터 (API 키가 로컬 캐시 파일에 남지 않도록)
+SECRET_PARAMS = ("key",)
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+_session_factory = None
+
+
+def _new_session(host):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=8)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def set_session_factory(factory=None):
+    """
+    이후 만들어지는 세션을 factory(host, new_session)의 반환값으로 바꿉니다. (녹화/재생: src/common/cassette.py)
+    None이면 기본 세션으로 되돌립니다. 이미 만든 세션은 버립니다.
+    """
+    global _session_factory
+    with _sessions_lock:
+        _session_factory = factory
+        _sessions.clear()
+
+
+def get_session(host):
+    """호스트별로 keep-alive 커넥션 풀을 가진 requests.Session을 공유합니다."""
+    with _sessions_lock:
+        session = _sessions.get(host)
+        if session is None:
+            if _session_factory:
+                session = _session_factory(host, _new_session)
+            else:
+                session = _new_session(host)
+            _sessions[host] = session
+        return session
+
+
+class CachedResponse:
+    """requests.Response와 같은 방식으로 쓰는 응답 객체 (status_code, text, json())"""
+
+    def __init__(self, status_code, content, headers, from_cache=False, not_modified=False, parsed=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+        self.from_cache = from_cache
+        self.not_modified = not_modified
+        self.parsed = parsed
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class HttpCache:
+    """
+    공유 커넥션 풀 + 디스크 응답 캐시.
+    TTL 안이면 캐시 적중, 지나면 조건부 GET(If-None-Match/If-Modified-Since)으로 재검증합니다.
+    재검증 결과가 304면 이전 파싱 결과(parsed)도 그대로 돌려주어 파싱까지 건너뛸 수 있습니다.
+    """
+
+    def __init__(self, db_path="data/http_cache.db"):
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        migrate_local(self.conn, "cache")
+        self.stats = {"hit": 0, "revalidated": 0, "miss": 0, "error": 0}
+
+    @staticmethod
+    def cache_key(url, params=None):
+        params = {k: v for k, v in (params or {}).items() if k not in SECRET_PARAMS}
+        return f"{url}?{urlencode(sorted(params.items()))}" if params else url
+
+    def _load(self, key):
+        with self.lock:
+            return self.conn.execute(
+                "SELECT etag, last_modified, status, headers, body, fetched_at, parsed FROM http_cache WHERE cache_key = ?",
+                (key,)
+            ).fetchone()
+
+    def get(self, url, params=None, headers=None, ttl=None, timeout=10):
+        host = urlsplit(url).netloc
+        ttl = ENDPOINT_TTL.get(host, 0) if ttl is None else ttl
+        key = self.cache_key(url, params)
+        entry = self._load(key)
+
+        if entry:
+            etag, last_modified, status, cached_headers, body, fetched_at, parsed = entry
+            parsed = json.loads(parsed) if parsed else None
+            if ttl and time.time() - fetched_at < ttl:
+                self.stats["hit"] += 1
+                tracing.count("cache_hit")
+                return CachedResponse(status, body, json.loads(cached_headers), from_cache=True, parsed=parsed)
+            headers = dict(headers or {})
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        try:
+            response = get_session(host).get(url, params=params, headers=headers, timeout=timeout)
+        except Exception:
+            self.stats["error"] += 1
+            tracing.count("http_errors")
+            raise
+
+        if response.status_code == 304 and entry:
+            self.stats["revalidated"] += 1
+            tracing.count("cache_revalidated")
+            with self.lock, self.conn:
+                self.conn.execute("UPDATE http_cache SET fetched_at = ? WHERE cache_key = ?", (time.time(), key))
+            return CachedResponse(status, body, json.loads(cached_headers), from_cache=True, not_modified=True, parsed=parsed)
+
+        self.stats["miss"] += 1
+        tracing.count("cache_miss")
+        tracing.count("bytes_in", len(response.content))
+        if response.status_code == 200:
+            kept_headers = {k: v for k, v in response.headers.items() if k.lower() in ("content-type", "etag", "last-modified")}
+            with self.lock, self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO http_cache VALUES (?, ?, ?, ?, ?, ?, ?, NULL)",
+                    (key, response.headers.get("ETag"), response.headers.get("Last-Modified"), 200,
+                     json.dumps(kept_headers), response.content, time.time())
+                )
+        return CachedResponse(response.status_code, response.content, dict(response.headers))
+
+    def store_parsed(self, url, parsed, params=None):
+        """본문을 파싱한 결과를 저장해 두면, 다음에 304/캐시 적중 시 response.parsed로 돌려받습니다."""
+        with self.lock, self.conn:
+            self.conn.execute("UPDATE http_cache SET parsed = ? WHERE cache_key = ?",
+                              (json.dumps(parsed, ensure_ascii=False), self.cache_key(url, params)))
+
+    def report(self):
+        s = self.stats
+        total = sum(s.values()) or 1
+        return (f"HTTP 캐시: 적중 {s['hit']} / 304 재검증 {s['revalidated']} / 다운로드 {s['miss']} / 오류 {s['error']} "
+                f"(재사용률 {(s['hit'] + s['revalidated']) / total:.0%})")
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_http_cache():
+    """프로세스 전체에서 공유하는 HttpCache 인스턴스"""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = HttpCache()
+        return _default_cache
@@ -0,0 +1,93 @@
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from src.storage.migrations import migrate_local
+
+
+class QuotaExceeded(Exception):
+    pass
+
+
+class DailyQuota:
+    """
+    유료 API의 일일 호출 수를 gtb_storage.db에 기록합니다.
+    한도에 닿으면 API를 부르기 전에 QuotaExceeded를 던져 바로 포기합니다.
+    """
+
+    def __init__(self, name, limit, db_path="data/gtb_storage.db"):
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.name = name
+        self.limit = limit
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        migrate_local(self.conn)
+
+    def _today(self):
+        return datetime.now().strftime("%Y-%m-%d")
+
+    def used(self):
+        row = self.conn.execute("SELECT used FROM api_quota WHERE name = ? AND day = ?", (self.name, self._today())).fetchone()
+        return row[0] if row else 0
+
+    def remaining(self):
+        return max(0, self.limit - self.used())
+
+    def acquire(self):
+        """호출 1회분을 차감합니다. 남은 한도가 없으면 QuotaExceeded."""
+        with self.lock, self.conn:
+            day = self._today()
+            self.conn.execute("INSERT OR IGNORE INTO api_quota (name, day, used) VALUES (?, ?, 0)", (self.name, day))
+            updated = self.conn.execute(
+                "UPDATE api_quota SET used = used + 1 WHERE name = ? AND day = ? AND used < ?",
+                (self.name, day, self.limit)
+            ).rowcount
+        if not updated:
+            raise QuotaExceeded(f"{self.name} 일일 한도({self.limit}회) 소진")
+
+
+class TokenBucket:
+    """
+    시간당 호출 한도가 있는 API용 토큰 버킷. 상태를 SQLite에 저장해 실행이 바뀌어도 한도가 이어집니다.
+    capacity개까지 모아 두고, 초당 capacity / per_seconds 개씩 다시 채웁니다.
+    """
+
+    def __init__(self, name, capacity, per_seconds, db_path="data/gtb_storage.db"):
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.name = name
+        self.capacity = capacity
+        self.rate = capacity / per_seconds
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        migrate_local(self.conn)
+
+    def _take(self):
+        """토큰 1개를 가져오면 0, 모자라면 다음 토큰까지 기다려야 할 초를 반환합니다."""
+        with self.lock, self.conn:
+            now = time.time()
+            row = self.conn.execute("SELECT tokens, updated_at FROM token_bucket WHERE name = ?", (self.name,)).fetchone()
+            tokens, updated_at = row if row else (self.capacity, now)
+            tokens = min(self.capacity, tokens + (now - updated_at) * self.rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / self.rate
+            self.conn.execute("INSERT OR REPLACE INTO token_bucket (name, tokens, updated_at) VALUES (?, ?, ?)",
+                              (self.name, tokens, now))
+            return wait
+
+    def acquire(self, timeout=0):
+        """토큰을 가져옵니다. timeout초 안에 못 가져오면 QuotaExceeded."""
+        deadline = time.time() + timeout
+        while True:
+            wait = self._take()
+            if not wait:
+                return
+            if time.time() + wait > deadline:
+                raise QuotaExceeded(f"{self.name} 호출 한도 초과 ({wait:.0f}초 후 가능)")
+            time.sleep(wait)
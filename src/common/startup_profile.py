@@ -0,0 +1,42 @@
+import importlib
+import sys
+import time
+from contextlib import contextmanager
+
+# 시작 비용의 대부분을 차지하는 무거운 의존성
+HEAVY_MODULES = ("torch", "diffusers", "anthropic", "google.generativeai", "PIL", "bs4")
+
+
+class StartupProfile:
+    """모듈 import와 단계별 클라이언트 생성에 걸린 시간을 모아 표로 출력합니다."""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.records = []
+
+    @contextmanager
+    def timed(self, kind, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.enabled:
+                self.records.append((kind, name, time.perf_counter() - started))
+
+    def build(self, name, module_path, class_name, *args, **kwargs):
+        """module_path를 import하고 class_name 인스턴스를 만듭니다. import/생성 시간을 따로 기록합니다."""
+        with self.timed("import", module_path):
+            module = importlib.import_module(module_path)
+        with self.timed("init", name):
+            return getattr(module, class_name)(*args, **kwargs)
+
+    def report(self):
+        if not self.enabled:
+            return
+        print("\n[startup-profile] 단계별 시작 비용")
+        for kind, name, seconds in sorted(self.records, key=lambda r: -r[2]):
+            print(f"  {kind:<7} {name:<40} {seconds * 1000:9.1f} ms")
+        total = sum(r[2] for r in self.records)
+        print(f"  {'total':<7} {'':<40} {total * 1000:9.1f} ms")
+        loaded = [m for m in HEAVY_MODULES if m in sys.modules]
+        print(f"  로드된 무거운 모듈: {', '.join(loaded) if loaded else '없음'}")
@@ -0,0 +1,230 @@
+"""
+파이프라인 단계별 소요 시간 추적.
+
+    with tracer.span("claude", sub="Gadgets", post_id="t3_abc"):
+        ...
+        tracing.count("output_tokens", 812)   # 현재 span에 카운터 누적 (HTTP 캐시, 토큰, 재시도 등)
+
+span은 contextvars로 부모를 찾으므로 asyncio 태스크 / asyncio.to_thread 안에서도 중첩 관계가 유지됩니다.
+(ThreadPoolExecutor.submit은 컨텍스트를 넘기지 않으므로 tracer.bind(fn)으로 감싸서 넘길 것)
+실행이 끝나면 runs / spans 테이블(gtb_storage.db)에 한 번에 기록하고, `python manager.py --report`로 집계합니다.
+"""
+import contextvars
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from src.storage.migrations import migrate_local
+
+_current = contextvars.ContextVar("tracing_span", default=None)
+
+
+def count(key, amount=1):
+    """현재 span의 카운터를 올립니다. 추적 중이 아니면 아무것도 하지 않습니다."""
+    span = _current.get()
+    if span is not None and amount:
+        with span.tracer.lock:
+            span.counters[key] = span.counters.get(key, 0) + amount
+
+
+class Span:
+    __slots__ = ("tracer", "id", "parent_id", "stage", "sub", "post_id", "started", "counters")
+
+    def __init__(self, tracer, span_id, parent_id, stage, sub, post_id):
+        self.tracer, self.id, self.parent_id = tracer, span_id, parent_id
+        self.stage, self.sub, self.post_id = stage, sub, post_id
+        self.started = time.perf_counter()
+        self.counters = {}
+
+
+class Tracer:
+    """
+    실행(run) 1회 동안 span을 메모리에 모았다가 end_run()에서 저장합니다.
+    profile_stages에 든 단계는 cProfile(또는 pyinstrument)로 감싸 data/profiles/에 결과를 남깁니다.
+    """
+
+    def __init__(self, db_path="data/gtb_storage.db", profile_stages=(), profiler="cprofile", profile_dir="data/profiles"):
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.db_path = db_path
+        self.profile_stages = set(profile_stages or ())
+        self.profiler = profiler
+        self.profile_dir = profile_dir
+        self.lock = threading.Lock()
+        self.run_id = None
+        self.records = []
+        self._next_id = 0
+        self._run_started = None
+        self._run_started_at = None
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path)
+        migrate_local(conn)
+        return conn
+
+    # --- 기록 ---
+
+    def start_run(self, mode="sync"):
+        self.records = []
+        self._next_id = 0
+        self._run_started = time.perf_counter()
+        self._run_started_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._connect() as conn:
+            self.run_id = conn.execute(
+                "INSERT INTO runs (mode, started_at, status) VALUES (?, ?, 'running')", (mode, self._run_started_at)
+            ).lastrowid
+        return self.run_id
+
+    @contextmanager
+    def span(self, stage, sub=None, post_id=None):
+        if self.run_id is None:
+            yield None
+            return
+        parent = _current.get()
+        # 자식 span은 부모의 sub / post_id를 물려받음
+        if parent is not None:
+            sub, post_id = sub or parent.sub, post_id or parent.post_id
+        with self.lock:
+            self._next_id += 1
+            span = Span(self, self._next_id, parent.id if parent else None, stage, sub, post_id)
+        token = _current.set(span)
+        status, error = "ok", None
+        profiler = self._start_profiler(stage)
+        try:
+            yield span
+        except BaseException as e:
+            status, error = "error", f"{type(e).__name__}: {e}"[:300]
+            raise
+        finally:
+            ended = time.perf_counter()
+            _current.reset(token)
+            self._stop_profiler(profiler, span)
+            with self.lock:
+                self.records.append((
+                    self.run_id, span.id, span.parent_id, stage, sub, post_id,
+                    span.started - self._run_started, ended - span.started, status, error,
+                    json.dumps(span.counters) if span.counters else None
+                ))
+
+    def bind(self, fn):
+        """현재 span을 부모로 유지한 채 다른 스레드에서 fn을 실행하도록 감쌉니다."""
+        context = contextvars.copy_context()
+        return lambda *args, **kwargs: context.run(fn, *args, **kwargs)
+
+    def end_run(self, status="ok", published=0):
+        if self.run_id is None:
+            return
+        with self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO spans VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", self.records)
+            conn.execute("UPDATE runs SET duration = ?, status = ?, published = ? WHERE id = ?",
+                         (time.perf_counter() - self._run_started, status, published, self.run_id))
+        self.run_id = None
+
+    # --- 프로파일링 ---
+
+    def _start_profiler(self, stage):
+        if stage not in self.profile_stages:
+            return None
+        if self.profiler == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+                profiler = Profiler(async_mode="enabled")
+                profiler.start()
+                return profiler
+            except ImportError:
+                print("[!] pyinstrument가 설치되지 않아 cProfile을 사용합니다.")
+            except RuntimeError:
+                # 다른 pyinstrument 프로파일러가 이미 돌고 있음 (동시에 도는 같은 단계)
+                return None
+        import cProfile
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # 다른 스레드/태스크에서 이미 cProfile이 켜져 있음
+            return None
+        return profiler
+
+    def _stop_profiler(self, profiler, span):
+        if profiler is None:
+            return
+        os.makedirs(self.profile_dir, exist_ok=True)
+        name = os.path.join(self.profile_dir, f"run{self.run_id}-{span.stage}-{span.id}")
+        if hasattr(profiler, "output_html"):
+            profiler.stop()
+            with open(f"{name}.html", "w", encoding="utf-8") as f:
+                f.write(profiler.output_html())
+        else:
+            profiler.disable()
+            profiler.dump_stats(f"{name}.prof")
+
+    # --- 리포트 ---
+
+    def report(self, last_runs=20):
+        """최근 실행들의 단계별 p50/p95와 가장 느린 실행의 임계 경로를 문자열로 돌려줍니다."""
+        with self._connect() as conn:
+            runs = conn.execute(
+                "SELECT id, mode, started_at, duration, status, published FROM runs "
+                "WHERE duration IS NOT NULL ORDER BY id DESC LIMIT ?", (last_runs,)
+            ).fetchall()
+            if not runs:
+                return "기록된 실행이 없습니다."
+            run_ids = [r[0] for r in runs]
+            marks = ", ".join("?" * len(run_ids))
+            spans = conn.execute(
+                f"SELECT run_id, span_id, parent_id, stage, sub, post_id, start_offset, duration, status, counters "
+                f"FROM spans WHERE run_id IN ({marks})", run_ids
+            ).fetchall()
+
+        lines = [f"최근 {len(runs)}회 실행 (run #{run_ids[-1]} ~ #{run_ids[0]})",
+                 f"  {'stage':<16}{'count':>7}{'p50':>10}{'p95':>10}{'max':>10}{'errors':>8}"]
+        by_stage = {}
+        for s in spans:
+            by_stage.setdefault(s[3], []).append(s)
+        for stage, rows in sorted(by_stage.items(), key=lambda kv: -_percentile([r[7] for r in kv[1]], 95)):
+            durations = sorted(r[7] for r in rows)
+            errors = sum(1 for r in rows if r[8] != "ok")
+            lines.append(f"  {stage:<16}{len(rows):>7}{_percentile(durations, 50):>9.2f}s"
+                         f"{_percentile(durations, 95):>9.2f}s{durations[-1]:>9.2f}s{errors:>8}")
+
+        slowest = max(runs, key=lambda r: r[3])
+        lines.append(f"\n가장 느린 실행 #{slowest[0]} ({slowest[1]}, {slowest[2]}, {slowest[3]:.1f}s, "
+                     f"{slowest[5] or 0}개 발행) 임계 경로:")
+        path = critical_path([s for s in spans if s[0] == slowest[0]])
+        for s in path:
+            where = "/".join(str(x) for x in (s[4], s[5]) if x)
+            counters = f"  {s[9]}" if s[9] else ""
+            lines.append(f"  {s[6]:>8.2f}s +{s[7]:>7.2f}s  {s[3]:<16}{where}{counters}")
+        return "\n".join(lines)
+
+
+def _percentile(values, pct):
+    """nearest-rank 백분위수"""
+    values = sorted(values)
+    if not values:
+        return 0.0
+    rank = max(1, -(-len(values) * pct // 100))
+    return values[int(rank) - 1]
+
+
+def critical_path(spans):
+    """
+    자식이 없는 span들 중에서, 실행 끝에서부터 '가장 늦게 끝난 span → 그 span이 시작하기 전에 가장 늦게 끝난 span' 순으로
+    거슬러 올라간 체인. 병렬 구간에서는 실제로 전체 시간을 붙잡고 있던 쪽이 남습니다.
+    """
+    parents = {s[2] for s in spans if s[2] is not None}
+    leaves = [s for s in spans if s[1] not in parents]
+    path = []
+    limit = float("inf")
+    while True:
+        candidates = [s for s in leaves if s[6] + s[7] <= limit + 1e-6 and s not in path]
+        if not candidates:
+            break
+        last = max(candidates, key=lambda s: s[6] + s[7])
+        path.append(last)
+        limit = last[6]
+    return list(reversed(path))
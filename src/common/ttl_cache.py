@@ -0,0 +1,48 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from src.common import tracing
+from src.storage.migrations import migrate_local
+
+
+class TTLCache:
+    """
+    SQLite 기반 키-값 캐시. namespace별로 항목을 나누고 만료 시각이 지나면 없는 것으로 취급합니다.
+    값은 JSON으로 직렬화 가능한 객체여야 합니다.
+    """
+
+    def __init__(self, namespace, ttl, db_path="data/cache.db"):
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.namespace = namespace
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        migrate_local(self.conn, "cache")
+        self.stats = {"hit": 0, "miss": 0}
+
+    def get(self, key):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT value FROM kv_cache WHERE namespace = ? AND key = ? AND expires_at > ?",
+                (self.namespace, key, time.time())
+            ).fetchone()
+        self.stats["hit" if row else "miss"] += 1
+        tracing.count("cache_hit" if row else "cache_miss")
+        return json.loads(row[0]) if row else None
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO kv_cache (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (self.namespace, key, json.dumps(value, ensure_ascii=False), expires_at)
+            )
+
+    def purge_expired(self):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM kv_cache WHERE namespace = ? AND expires_at <= ?", (self.namespace, time.time()))
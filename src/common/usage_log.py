@@ -0,0 +1,53 @@
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from src.common import tracing
+from src.storage.migrations import migrate_local
+
+USAGE_FIELDS = ("input_tokens", "output_tokens", "cache_creation_input_tokens", "cache_read_input_tokens")
+
+
+class UsageLog:
+    """
+    LLM 호출별 토큰 사용량(입력/출력/캐시 쓰기/캐시 읽기)을 llm_usage 테이블에 남기고 실행 단위 합계를 보여 줍니다.
+    """
+
+    def __init__(self, db_path="data/gtb_storage.db"):
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        migrate_local(self.conn)
+        self.totals = dict.fromkeys(USAGE_FIELDS, 0)
+        self.calls = 0
+
+    def record(self, model, call, usage, seconds=None):
+        """usage는 Anthropic 응답의 usage 객체 (없는 필드는 0으로 기록)"""
+        values = {field: getattr(usage, field, None) or 0 for field in USAGE_FIELDS}
+        for field, value in values.items():
+            tracing.count(field, value)
+        with self.lock:
+            self.calls += 1
+            for field, value in values.items():
+                self.totals[field] += value
+            with self.conn:
+                self.conn.execute(
+                    "INSERT INTO llm_usage (model, call, input_tokens, output_tokens, cache_creation_input_tokens, "
+                    "cache_read_input_tokens, seconds, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (model, call, *values.values(), seconds, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+                )
+        return values
+
+    def report(self):
+        t = self.totals
+        prompt_tokens = t["input_tokens"] + t["cache_creation_input_tokens"] + t["cache_read_input_tokens"]
+        hit_rate = t["cache_read_input_tokens"] / prompt_tokens * 100 if prompt_tokens else 0
+        return (f"LLM 사용량 {self.calls}회: 입력 {t['input_tokens']:,} / 출력 {t['output_tokens']:,} / "
+                f"캐시 쓰기 {t['cache_creation_input_tokens']:,} / 캐시 읽기 {t['cache_read_input_tokens']:,} "
+                f"(프롬프트의 {hit_rate:.0f}% 캐시 적중)")
+
+    def close(self):
+        self.conn.close()
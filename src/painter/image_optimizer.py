@@ -0,0 +1,223 @@
+"""
+썸네일 후처리: 원본 PNG를 반응형 크기별 WebP/AVIF로 변환하고 LQIP(저화질 미리보기)를 만듭니다.
+출력 파일명은 원본 내용의 해시라서 같은 이미지는 한 번만 저장됩니다.
+
+    python -m src.painter.image_optimizer --migrate              # public/images/*.png 일괄 변환
+    python -m src.painter.image_optimizer --migrate --update-d1  # D1 posts.image_url/image_meta도 교체
+
+사이트는 posts.image_meta(picture_meta)의 형식별 srcset과 LQIP로 <picture>를 그립니다. (src/components/Picture.astro)
+"""
+import argparse
+import base64
+import glob
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from src.storage.migrations import migrate_local
+
+WIDTHS = (480, 768, 1024)
+WEBP_QUALITY = 80
+AVIF_QUALITY = 55
+LQIP_WIDTH = 16
+OUTPUT_DIR = "public/images/opt"
+URL_PREFIX = "/images/opt"
+
+
+def _avif_supported():
+    from PIL import features
+    if features.check("avif"):
+        return True
+    try:
+        import pillow_avif  # noqa: F401  (Pillow 11.3 미만용 플러그인)
+        return True
+    except ImportError:
+        return False
+
+
+def optimize_file(src_path, out_dir=OUTPUT_DIR, widths=WIDTHS):
+    """
+    원본 1장을 변환합니다. (프로세스 풀에서 실행되는 함수)
+    이미 같은 해시의 결과 파일이 있으면 다시 인코딩하지 않습니다.
+    """
+    from PIL import Image
+
+    with open(src_path, "rb") as f:
+        raw = f.read()
+    content_hash = hashlib.sha256(raw).hexdigest()[:16]
+    os.makedirs(out_dir, exist_ok=True)
+
+    formats = [("webp", WEBP_QUALITY)] + ([("avif", AVIF_QUALITY)] if _avif_supported() else [])
+    image = Image.open(io.BytesIO(raw)).convert("RGB")
+    variants = []
+    for width in sorted({min(w, image.width) for w in widths}):
+        resized = None
+        for fmt, quality in formats:
+            name = f"{content_hash}-{width}.{fmt}"
+            path = os.path.join(out_dir, name)
+            if not os.path.exists(path):
+                if resized is None:
+                    height = round(image.height * width / image.width)
+                    resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+                save_args = {"quality": quality, "method": 6} if fmt == "webp" else {"quality": quality}
+                resized.save(path, fmt.upper(), **save_args)
+            variants.append({"format": fmt, "width": width, "file": name, "bytes": os.path.getsize(path)})
+
+    lqip_img = image.resize((LQIP_WIDTH, max(1, round(image.height * LQIP_WIDTH / image.width))), Image.BILINEAR)
+    buf = io.BytesIO()
+    lqip_img.save(buf, "WEBP", quality=30)
+    lqip = "data:image/webp;base64," + base64.b64encode(buf.getvalue()).decode("ascii")
+
+    return {
+        "source": os.path.basename(src_path),
+        "content_hash": content_hash,
+        "width": image.width,
+        "height": image.height,
+        "source_bytes": len(raw),
+        "variants": variants,
+        "lqip": lqip,
+    }
+
+
+def default_url(result):
+    """image_url에 넣을 대표 이미지 경로 (가장 큰 WebP)"""
+    webps = [v for v in result["variants"] if v["format"] == "webp"]
+    best = max(webps, key=lambda v: v["width"])
+    return f"{URL_PREFIX}/{best['file']}"
+
+
+def picture_meta(result):
+    """posts.image_meta에 넣을 JSON: 원본 크기, LQIP, 형식별 srcset ("경로 480w, ...")"""
+    meta = {"width": result["width"], "height": result["height"], "lqip": result["lqip"]}
+    for fmt in ("avif", "webp"):
+        variants = sorted((v for v in result["variants"] if v["format"] == fmt), key=lambda v: v["width"])
+        if variants:
+            meta[fmt] = ", ".join(f"{URL_PREFIX}/{v['file']} {v['width']}w" for v in variants)
+    return json.dumps(meta)
+
+
+def asset_paths(image_url, public_dir="public"):
+    """image_url(대표 이미지)에 딸린 실제 파일 경로 목록. 변환된 이미지면 같은 해시의 모든 크기/형식"""
+    if image_url.startswith(URL_PREFIX + "/"):
+        content_hash = os.path.basename(image_url).split("-", 1)[0]
+        return sorted(glob.glob(os.path.join(OUTPUT_DIR, f"{content_hash}-*")))
+    path = os.path.join(public_dir, image_url.lstrip("/"))
+    return [path] if os.path.exists(path) else []
+
+
+class ImageOptimizer:
+    def __init__(self, db_path="data/gtb_storage.db", out_dir=OUTPUT_DIR, max_workers=None):
+        self.out_dir = out_dir
+        self.max_workers = max_workers
+        self.pool = None
+        # 발행 스레드 여러 개(비동기 파이프라인의 asyncio.to_thread)가 같은 연결과 풀을 씀
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        migrate_local(self.conn)
+
+    def _record(self, result):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO image_variants (content_hash, width, height, lqip, variants, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (result["content_hash"], result["width"], result["height"], result["lqip"],
+                 json.dumps(result["variants"]), datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            )
+            self.conn.execute("INSERT OR REPLACE INTO image_sources (source, content_hash) VALUES (?, ?)",
+                              (result["source"], result["content_hash"]))
+
+    def optimize_many(self, paths):
+        """여러 장을 프로세스 풀에서 병렬로 변환하고 결과를 기록합니다. 실패한 파일은 건너뜁니다."""
+        with self.lock:
+            if self.pool is None:
+                # fork는 grpc(Gemini)/스레드 풀이 떠 있는 프로세스에서 자식이 멈출 수 있어 spawn으로 고정 (Windows와 동일)
+                self.pool = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                mp_context=multiprocessing.get_context("spawn"))
+        futures = {path: self.pool.submit(optimize_file, path, self.out_dir) for path in paths}
+        results = {}
+        for path, future in futures.items():
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"[!] 이미지 최적화 실패 ({path}): {e}")
+                continue
+            self._record(result)
+            results[path] = result
+        return results
+
+    def optimize(self, path):
+        return self.optimize_many([path]).get(path)
+
+    def meta_for(self, image_url):
+        """변환된 대표 이미지 URL의 picture_meta. 변환 기록이 없는 이미지(원본 PNG 등)면 None"""
+        if not image_url or not image_url.startswith(URL_PREFIX + "/"):
+            return None
+        content_hash = os.path.basename(image_url).split("-", 1)[0]
+        with self.lock:
+            row = self.conn.execute("SELECT width, height, lqip, variants FROM image_variants WHERE content_hash = ?",
+                                    (content_hash,)).fetchone()
+        if not row:
+            return None
+        return picture_meta({"width": row[0], "height": row[1], "lqip": row[2], "variants": json.loads(row[3])})
+
+    def close(self):
+        if self.pool:
+            self.pool.shutdown()
+        self.conn.close()
+
+
+def migrate(source_glob="public/images/*.png", update_d1=False, delete_originals=False):
+    if delete_originals and not update_d1:
+        # D1 image_url이 아직 원본 PNG를 가리키므로 지우면 사이트 이미지가 깨짐
+        raise ValueError("원본 삭제(delete_originals)는 D1 image_url 교체(update_d1)와 함께만 할 수 있습니다.")
+    optimizer = ImageOptimizer()
+    paths = sorted(glob.glob(source_glob))
+    print(f"[*] 기존 썸네일 {len(paths)}개 변환 시작...")
+    results = optimizer.optimize_many(paths)
+    optimizer.close()
+
+    unique = {r["content_hash"]: r for r in results.values()}
+    before = sum(r["source_bytes"] for r in results.values())
+    after = sum(v["bytes"] for r in unique.values() for v in r["variants"])
+    print(f"[+] 변환 완료: {len(results)}개 (고유 이미지 {len(unique)}개), "
+          f"원본 {before / 1e6:.1f}MB → 전체 변형 {after / 1e6:.1f}MB")
+
+    if update_d1 and results:
+        from src.publisher.d1_client import D1Client
+        client = D1Client()
+        client.batch([
+            ("UPDATE posts SET image_url = ?, image_meta = ?, updated_at = CURRENT_TIMESTAMP WHERE image_url = ?",
+             (default_url(r), picture_meta(r), f"/images/{os.path.basename(path)}"))
+            for path, r in results.items()
+        ], idempotent=True)
+        client.close()
+        print(f"[+] D1 posts.image_url/image_meta {len(results)}건 갱신 요청 완료")
+
+    if delete_originals:
+        for path in results:
+            os.remove(path)
+        print(f"[+] 원본 PNG {len(results)}개 삭제")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="썸네일 WebP/AVIF 변환")
+    parser.add_argument("--migrate", action="store_true", help="public/images의 기존 PNG 일괄 변환")
+    parser.add_argument("--update-d1", action="store_true", help="D1 posts.image_url을 최적화 이미지로 교체")
+    parser.add_argument("--delete-originals", action="store_true", help="변환 후 원본 PNG 삭제 (--update-d1 필요)")
+    parser.add_argument("files", nargs="*")
+    args = parser.parse_args()
+    if args.delete_originals and not args.update_d1:
+        parser.error("--delete-originals는 --update-d1과 함께만 쓸 수 있습니다. (D1이 아직 원본 PNG를 가리킴)")
+
+    if args.migrate:
+        migrate(update_d1=args.update_d1, delete_originals=args.delete_originals)
+    elif args.files:
+        optimizer = ImageOptimizer()
+        for path, result in optimizer.optimize_many(args.files).items():
+            print(f"{path} → {default_url(result)}")
+        optimizer.close()
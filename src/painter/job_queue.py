@@ -0,0 +1,125 @@
+import os
+import sqlite3
+import threading
+import time
+
+from src.storage.migrations import migrate_local
+
+
+class QueueFull(Exception):
+    pass
+
+
+class RenderQueue:
+    """
+    painter 서비스와 manager가 함께 쓰는 SQLite 기반 렌더 작업 큐.
+    우선순위가 높은 작업부터, 같은 우선순위 안에서는 들어온 순서(FIFO)대로 처리합니다.
+    """
+
+    def __init__(self, db_path="data/painter_queue.db", max_pending=20, max_attempts=3):
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.max_pending = max_pending
+        self.max_attempts = max_attempts
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # render_jobs / painter_workers 테이블은 migrations/painter가 만듦
+        migrate_local(self.conn, "painter")
+
+    # 연결 하나를 서비스/클라이언트 스레드가 함께 쓰므로 모든 메서드가 self.lock 안에서만 연결을 만짐
+    # (claim_next의 BEGIN IMMEDIATE 사이에 다른 스레드 문장이 끼어들지 않도록)
+    def _pending_count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM render_jobs WHERE status IN ('queued', 'running')").fetchone()[0]
+
+    def pending_count(self):
+        with self.lock:
+            return self._pending_count()
+
+    def submit(self, prompt, output_name, priority=0, block=False, timeout=300):
+        """작업을 넣고 job id를 반환합니다. 대기 작업이 max_pending 이상이면 QueueFull (block=True면 자리가 날 때까지 대기)."""
+        deadline = time.time() + timeout
+        while True:
+            with self.lock:
+                if self._pending_count() < self.max_pending:
+                    cursor = self.conn.execute(
+                        "INSERT INTO render_jobs (prompt, output_name, priority, created_at) VALUES (?, ?, ?, ?)",
+                        (prompt, output_name, priority, time.time())
+                    )
+                    return cursor.lastrowid
+            if not block or time.time() > deadline:
+                raise QueueFull(f"렌더 대기열이 가득 찼습니다 ({self.max_pending}개)")
+            time.sleep(1)
+
+    def claim_next(self):
+        """가장 앞선 대기 작업 1개를 running으로 바꿔 가져옵니다. 없으면 None."""
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self.conn.execute(
+                    "SELECT * FROM render_jobs WHERE status = 'queued' ORDER BY priority DESC, id LIMIT 1"
+                ).fetchone()
+                if row:
+                    self.conn.execute(
+                        "UPDATE render_jobs SET status = 'running', attempts = attempts + 1, started_at = ? WHERE id = ?",
+                        (time.time(), row["id"])
+                    )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        return dict(row) if row else None
+
+    def complete(self, job_id, result_path):
+        with self.lock:
+            self.conn.execute(
+                "UPDATE render_jobs SET status = 'done', result_path = ?, finished_at = ? WHERE id = ?",
+                (result_path, time.time(), job_id)
+            )
+
+    def fail(self, job_id, error):
+        """실패한 작업은 시도 횟수가 남아 있으면 다시 대기열로, 아니면 failed로 둡니다."""
+        with self.lock:
+            self.conn.execute(
+                "UPDATE render_jobs SET status = CASE WHEN attempts < ? THEN 'queued' ELSE 'failed' END, "
+                "error = ?, finished_at = ? WHERE id = ?",
+                (self.max_attempts, str(error), time.time(), job_id)
+            )
+
+    def recover(self):
+        """서비스가 작업 도중 죽었을 때 running으로 남은 작업을 되돌립니다. 되돌린 개수를 반환합니다."""
+        with self.lock:
+            return self.conn.execute(
+                "UPDATE render_jobs SET status = CASE WHEN attempts < ? THEN 'queued' ELSE 'failed' END "
+                "WHERE status = 'running'",
+                (self.max_attempts,)
+            ).rowcount
+
+    def cancel(self, job_id, error):
+        """아직 아무도 가져가지 않은 작업을 failed로 돌립니다. (기다리던 쪽이 포기할 때)"""
+        with self.lock:
+            return self.conn.execute(
+                "UPDATE render_jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ? AND status = 'queued'",
+                (str(error), time.time(), job_id)
+            ).rowcount
+
+    def heartbeat(self, pid=None):
+        """서비스 프로세스가 살아 있다고 기록합니다."""
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO painter_workers (pid, beat_at) VALUES (?, ?)",
+                              (pid or os.getpid(), time.time()))
+
+    def last_heartbeat(self):
+        """가장 최근 생존 신호 시각 (서비스가 한 번도 뜬 적 없으면 None)"""
+        with self.lock:
+            return self.conn.execute("SELECT MAX(beat_at) FROM painter_workers").fetchone()[0]
+
+    def get(self, job_id):
+        with self.lock:
+            row = self.conn.execute("SELECT * FROM render_jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
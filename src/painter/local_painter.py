@@ -2,10 +2,6 @@ import torch
 from diffusers import FluxPipeline
 import os
 from datetime import datetime
-from dotenv import load_dotenv
-
-# .env 파일 로드
-load_dotenv()
 
 # CUDA 메모리 파편화 방지 설정
 os.environ["PYTORCH_CUDA_ALLOC_CONF"] = "expandable_segments:True"
@@ -66,6 +62,8 @@ class LocalPainter:
             return None
 
 if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
     painter = LocalPainter()
     # Claude가 추천한 고퀄리티 프롬프트
     test_prompt = "A high-quality 3D medical illustration of vitamin D and K2 capsules. Showing healthy bone structure and clear arterial pathways, cinematic lighting, professional medical blog style, 8k resolution."
@@ -0,0 +1,175 @@
+"""
+FLUX 파이프라인을 한 번만 올려 두고 렌더 작업 큐(RenderQueue)를 계속 처리하는 상주 서비스.
+
+    python -m src.painter.painter_service          # 실제 FLUX (GPU)
+    python -m src.painter.painter_service --stub   # CPU 전용 스텁 (큐/재시작 동작 확인용)
+
+manager 쪽에서는 PAINTER_MODE=service로 실행하면 LocalPainter 대신 PainterClient를 씁니다.
+"""
+import argparse
+import asyncio
+import os
+import struct
+import threading
+import time
+import zlib
+from datetime import datetime
+
+from src.painter.job_queue import RenderQueue
+
+
+class StubPainter:
+    """GPU 없이 큐 동작을 확인하기 위한 가짜 painter. delay초 기다린 뒤 1x1 PNG를 씁니다."""
+
+    def __init__(self, delay=0.5, output_dir="data/images"):
+        self.delay = delay
+        self.output_dir = output_dir
+
+    def generate_image(self, prompt, output_name):
+        time.sleep(self.delay)
+        os.makedirs(self.output_dir, exist_ok=True)
+        file_path = os.path.join(self.output_dir, output_name)
+
+        def chunk(tag, data):
+            return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+        png = (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", 1, 1, 8, 2, 0, 0, 0))
+               + chunk(b"IDAT", zlib.compress(b"\x00\x80\x80\x80")) + chunk(b"IEND", b""))
+        with open(file_path, "wb") as f:
+            f.write(png)
+        return file_path
+
+
+class PainterService:
+    def __init__(self, queue=None, painter_factory=None, heartbeat_interval=5):
+        self.queue = queue or RenderQueue()
+        self.painter_factory = painter_factory
+        self.painter = None
+        self.heartbeat_interval = heartbeat_interval
+        self.stopped = threading.Event()
+
+    def _beat(self):
+        # 렌더 한 장이 오래 걸려도 생존 신호가 끊기지 않도록 별도 스레드에서 기록
+        while not self.stopped.wait(self.heartbeat_interval):
+            self.queue.heartbeat()
+
+    def start(self):
+        """모델을 한 번 올리고, 이전 실행에서 끊긴 작업을 되살립니다."""
+        self.queue.heartbeat()
+        recovered = self.queue.recover()
+        if recovered:
+            print(f"[*] 중단됐던 렌더 작업 {recovered}개를 대기열로 되돌렸습니다.")
+        if self.painter_factory is None:
+            from src.painter.local_painter import LocalPainter
+            self.painter_factory = LocalPainter
+        self.painter = self.painter_factory()
+
+    def run_once(self):
+        """대기 작업 1개를 처리합니다. 처리할 작업이 없으면 False."""
+        job = self.queue.claim_next()
+        if not job:
+            return False
+        print(f"[*] 렌더 작업 #{job['id']} 시작 (우선순위 {job['priority']}): {job['output_name']}")
+        try:
+            path = self.painter.generate_image(job["prompt"], job["output_name"])
+            if not path:
+                raise RuntimeError("이미지 생성 결과가 없습니다.")
+            self.queue.complete(job["id"], path)
+        except Exception as e:
+            print(f"[!] 렌더 작업 #{job['id']} 실패: {e}")
+            self.queue.fail(job["id"], e)
+        return True
+
+    def serve_forever(self, poll_interval=1.0):
+        # 모델을 올리는 동안에도 클라이언트가 서비스를 살아 있는 것으로 보도록 생존 신호부터 시작
+        threading.Thread(target=self._beat, daemon=True).start()
+        self.start()
+        print("[+] painter 서비스 대기 중...")
+        while not self.stopped.is_set():
+            if not self.run_once():
+                time.sleep(poll_interval)
+
+    def stop(self):
+        self.stopped.set()
+
+
+class PainterClient:
+    """
+    manager 쪽 painter. LocalPainter와 같은 generate_image()를 제공하지만
+    실제 렌더링은 상주 서비스에 맡기고 결과만 기다립니다.
+    서비스의 생존 신호가 heartbeat_timeout초 넘게 없으면 timeout까지 기다리지 않고 바로 None을 돌려줍니다.
+    """
+
+    def __init__(self, queue=None, timeout=600, poll_interval=0.5, heartbeat_timeout=30):
+        self.queue = queue or RenderQueue()
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.heartbeat_timeout = heartbeat_timeout
+
+    def worker_alive(self):
+        beat = self.queue.last_heartbeat()
+        return beat is not None and time.time() - beat < self.heartbeat_timeout
+
+    def submit(self, prompt, output_name, priority=0):
+        return self.queue.submit(prompt, output_name, priority=priority, block=True)
+
+    def _result(self, job_id):
+        job = self.queue.get(job_id)
+        if job["status"] == "done":
+            return True, job["result_path"]
+        if job["status"] == "failed":
+            print(f"[!] 렌더 작업 #{job_id} 최종 실패: {job['error']}")
+            return True, None
+        if not self.worker_alive():
+            # 서비스가 꺼져 있으면 작업을 취소해 나중에 뜬 서비스가 주인 없는 작업을 그리지 않도록 함
+            self.queue.cancel(job_id, "painter 서비스 응답 없음")
+            print(f"[!] painter 서비스가 응답하지 않아 렌더 작업 #{job_id}을 취소합니다.")
+            return True, None
+        return False, None
+
+    def wait(self, job_id):
+        deadline = time.time() + self.timeout
+        while time.time() < deadline:
+            finished, path = self._result(job_id)
+            if finished:
+                return path
+            time.sleep(self.poll_interval)
+        print(f"[!] 렌더 작업 #{job_id} 대기 시간 초과")
+        return None
+
+    async def wait_async(self, job_id):
+        deadline = time.time() + self.timeout
+        while time.time() < deadline:
+            finished, path = self._result(job_id)
+            if finished:
+                return path
+            await asyncio.sleep(self.poll_interval)
+        print(f"[!] 렌더 작업 #{job_id} 대기 시간 초과")
+        return None
+
+    def _submit_if_alive(self, prompt, output_name, priority):
+        """서비스가 떠 있을 때만 작업을 넣습니다. (꺼져 있으면 대기열이 차서 submit이 막히기 전에 None)"""
+        if not self.worker_alive():
+            print("[!] painter 서비스가 실행 중이 아닙니다. (python -m src.painter.painter_service)")
+            return None
+        return self.submit(prompt, output_name, priority)
+
+    def generate_image(self, prompt, output_name=None, priority=0):
+        output_name = output_name or f"image_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
+        job_id = self._submit_if_alive(prompt, output_name, priority)
+        return self.wait(job_id) if job_id else None
+
+    async def generate_image_async(self, prompt, output_name=None, priority=0):
+        output_name = output_name or f"image_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
+        job_id = await asyncio.to_thread(self._submit_if_alive, prompt, output_name, priority)
+        return await self.wait_async(job_id) if job_id else None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="FLUX painter 상주 서비스")
+    parser.add_argument("--stub", action="store_true", help="GPU 없이 스텁 painter로 실행")
+    parser.add_argument("--stub-delay", type=float, default=0.5)
+    args = parser.parse_args()
+
+    factory = (lambda: StubPainter(args.stub_delay)) if args.stub else None
+    PainterService(painter_factory=factory).serve_forever()
@@ -0,0 +1,249 @@
+import asyncio
+import contextvars
+import os
+import time
+from datetime import datetime
+
+# 단계별 동시 실행 한도 (각 API 쿼터/로컬 GPU 한계에 맞춤)
+DEFAULT_LIMITS = {
+    "collect": 8,   # 레딧/구글 뉴스 RSS
+    "gemini": 2,    # 주제 선정
+    "google": 2,    # Custom Search (유료 일일 쿼터)
+    "claude": 2,    # 본문 생성
+    "coupang": 1,   # 파트너스 API (시간당 호출 제한)
+    "painter": 1,   # 로컬 GPU는 한 번에 한 장만
+    "publish": 1,   # D1 + git push는 순서대로
+}
+
+_DONE = object()
+
+
+def _report_orphan(task):
+    """기다리는 쪽이 없어진 썸네일 태스크의 예외를 회수합니다. ('Task exception was never retrieved' 방지)"""
+    if not task.cancelled() and task.exception() is not None:
+        print(f"[!] 썸네일 생성 실패 (다음 시도에서 다시 그림): {task.exception()}")
+
+
+class AsyncPipeline:
+    """
+    GTBManager.run_pipeline을 단계별 큐로 나눈 비동기 버전입니다.
+
+    수집 → 선정(전 카테고리 Gemini 1회) → 작성(검색/Claude/쿠팡) → 이미지(FLUX) → 발행 순서로 흐르며,
+    단계 사이에는 크기 제한이 있는 큐를 두어 N+1번째 글의 LLM/HTTP 작업이
+    N번째 글의 이미지 생성과 겹쳐서 진행됩니다.
+    """
+
+    def __init__(self, manager, limits=None, queue_size=2, subs=None):
+        self.manager = manager
+        self.subs = subs or manager.target_subreddits
+        self.limits = dict(DEFAULT_LIMITS, **(limits or {}))
+        self.queue_size = queue_size
+        self.today_str = datetime.now().strftime("%Y%m%d")
+        self.published = []
+
+    async def run(self):
+        print("\n" + "="*60)
+        print(f"🚀 GTB 비동기 파이프라인 시작: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print("="*60)
+        started = time.perf_counter()
+
+        self.sem = {name: asyncio.Semaphore(n) for name, n in self.limits.items()}
+        write_q = asyncio.Queue(maxsize=self.queue_size)
+        paint_q = asyncio.Queue(maxsize=self.queue_size)
+        publish_q = asyncio.Queue(maxsize=self.queue_size)
+
+        n_writers = self.limits["claude"]
+        writers = [asyncio.create_task(self._write_worker(write_q, paint_q)) for _ in range(n_writers)]
+        painter = asyncio.create_task(self._paint_worker(paint_q, publish_q, n_writers))
+        publisher = asyncio.create_task(self._publish_worker(publish_q))
+
+        # 이전 실행에서 끝나지 않은 글은 수집/선정과 겹쳐서 마지막 단계부터 이어서 진행
+        for job in await asyncio.to_thread(self.manager.resume_posts):
+            if job['stage'] == "published":
+                self.manager.pending_posts.append(job)
+            else:
+                await write_q.put((job['sub'], job))
+
+        self.manager.last_poll = {}
+        collected = await asyncio.gather(*(self._collect(sub) for sub in self.subs))
+        with self.manager.tracer.span("dedup"):
+            candidates_by_sub = await asyncio.to_thread(self.manager.drop_duplicate_topics, dict(collected))
+        await self._rank(candidates_by_sub, write_q)
+        for _ in writers:
+            await write_q.put(_DONE)
+        await asyncio.gather(*writers, painter, publisher)
+
+        self.published = await asyncio.to_thread(self.manager.flush_posts)
+        if self.published:
+            await asyncio.to_thread(self.manager.update_sitemap)
+        await asyncio.to_thread(self.manager.publish_assets)
+        self.manager.print_run_reports()
+
+        print("\n" + "="*60)
+        print(f"✅ 모든 작업 완료. ({len(self.published)}개 발행, {time.perf_counter() - started:.1f}초)")
+        print("="*60)
+        return self.published
+
+    async def _collect(self, sub):
+        """서브레딧 1개를 수집해 아직 처리하지 않은 후보를 (sub, candidates)로 반환합니다."""
+        m = self.manager
+        try:
+            with m.tracer.span("collect", sub=sub):
+                async with self.sem["collect"]:
+                    posts = await m.collector.fetch_top_posts_async(sub, limit=10)
+                m.last_poll[sub] = None if posts is None else [p['id'] for p in posts]
+
+                candidates = await asyncio.to_thread(m.filter_new_candidates, posts or [])
+            if not candidates:
+                print(f"[-] {sub} 카테고리에 새로운 후보가 없습니다.")
+            return sub, candidates
+        except Exception as e:
+            print(f"[!] {sub} 수집 단계 실패: {e}")
+            m.last_poll[sub] = None
+            return sub, []
+
+    async def _rank(self, candidates_by_sub, write_q):
+        """모든 카테고리 후보를 Gemini 요청 1회로 선정해 작성 큐에 넣습니다."""
+        total = sum(len(c) for c in candidates_by_sub.values())
+        if not total:
+            return
+        print(f"[*] Gemini가 {total}개의 후보 중 카테고리별 '황금 주제' 분석 중...")
+        try:
+            interest = await asyncio.to_thread(self.manager.reader_interest)
+            async with self.sem["gemini"]:
+                with self.manager.tracer.span("gemini_rank"):
+                    selected_by_sub = await self.manager.analyzer.rank_categories_async(candidates_by_sub, interest)
+        except Exception as e:
+            print(f"[!] 주제 선정 단계 실패: {e}")
+            return
+        for sub, selected_posts in selected_by_sub.items():
+            # 동기 버전처럼 1순위가 이미 쓴 비교 글이면 다음 후보로, 카테고리당 1개만 작성 큐에 넣음
+            for post in selected_posts:
+                print(f"[!] 최종 당첨! ({sub}): {post['title']}")
+                if await asyncio.to_thread(self.manager.is_repeated_comparison, post):
+                    continue
+                await write_q.put((sub, await asyncio.to_thread(self.manager.jobs.select, sub, post)))
+                break
+
+    async def _render(self, post, img_prompt):
+        """썸네일 생성 + WebP/AVIF 변환. 이미지 URL을 post_jobs에 저장하고 반환합니다."""
+        m = self.manager
+        image_filename = f"thumb_{post['id']}.png"
+        img_prompt = img_prompt or "Professional photography"
+        # 이전 실행에서 그려 두고 변환 전에 멈춘 썸네일이 있으면 다시 그리지 않음
+        if not os.path.exists(f"data/images/{image_filename}"):
+            async with self.sem["painter"]:
+                with m.tracer.span("painter"):
+                    if hasattr(m.painter, "generate_image_async"):
+                        await m.painter.generate_image_async(img_prompt, image_filename)
+                    else:
+                        await asyncio.to_thread(m.painter.generate_image, img_prompt, image_filename)
+        # WebP/AVIF 변환은 프로세스 풀에서 돌고, 그동안 다음 글 렌더링을 막지 않음
+        image_url = await asyncio.to_thread(m.publish_image, image_filename)
+        await asyncio.to_thread(m.jobs.save, post['id'], image_url=image_url)
+        return image_url
+
+    async def _find_items(self, parsed_data):
+        m = self.manager
+        async with self.sem["coupang"]:
+            with m.tracer.span("coupang"):
+                return m._affiliate_result(
+                    await m.affiliate.search_first_available_async(m.pick_affiliate_keywords(parsed_data), limit=3))
+
+    async def _write_worker(self, write_q, paint_q):
+        """
+        트렌드 검색 → Claude 스트리밍 작성을 처리합니다.
+        IMAGE_PROMPT / KEYWORDS 섹션이 끝나는 즉시 썸네일 생성과 쿠팡 조회를 태스크로 띄워 본문 생성과 겹치게 합니다.
+        이어서 진행하는 job은 결과물이 이미 있는 단계(post_jobs)를 건너뜁니다.
+        """
+        m = self.manager
+        while True:
+            item = await write_q.get()
+            if item is _DONE:
+                await paint_q.put(_DONE)
+                return
+            sub, job = item
+            post = job['post']
+            tasks, done = {}, {}
+            post_context = None
+
+            def spawn(coro):
+                # claude span 밖(post span)에서 잡아 둔 컨텍스트로 띄워야 썸네일/쿠팡 span이 claude의 자식이 되지 않음
+                return asyncio.create_task(coro, context=post_context.copy())
+
+            def on_section(name, value):
+                done[name] = value
+                if name == "image_prompt" and value and job['image_url'] is None:
+                    tasks["image"] = spawn(self._render(post, value))
+                elif name == "keywords" and value and job['coupang'] is None:
+                    tasks["coupang"] = spawn(self._find_items(dict(done)))
+
+            try:
+                with m.tracer.span("post", sub=sub, post_id=post['id']):
+                    post_context = contextvars.copy_context()
+                    if not job['searched']:
+                        async with self.sem["google"]:
+                            with m.tracer.span("google_search"):
+                                korean_trends = await m.searcher.search_korean_trends_many_async(m.pick_search_queries(post))
+                        job = await asyncio.to_thread(m.jobs.save, post['id'], trends=korean_trends)
+
+                    if job['parsed'] is None:
+                        async with self.sem["claude"]:
+                            with m.tracer.span("claude"):
+                                parser = await m.processor.stream_post_async(post, korean_trends=job['trends'], on_section=on_section)
+                        if not parser:
+                            # 이미 시작한 썸네일은 끝까지 그려 post_jobs에 저장되고 다음 시도에서 씀
+                            raise RuntimeError("Claude 글 생성 실패")
+                        job = await asyncio.to_thread(m.jobs.save, post['id'], parsed=m._fill_keywords(parser.close()))
+                    parsed_data = job['parsed']
+
+                    if "image" not in tasks and job['image_url'] is None:
+                        tasks["image"] = spawn(self._render(post, parsed_data.get('image_prompt')))
+                    if job['coupang'] is None:
+                        coupang_items = await (tasks.get("coupang") or self._find_items(parsed_data))
+                        job = await asyncio.to_thread(m.jobs.save, post['id'], coupang=coupang_items)
+                await paint_q.put((sub, job, tasks.get("image")))
+            except Exception as e:
+                coupang = tasks.get("coupang")
+                if coupang:
+                    coupang.cancel()
+                image = tasks.get("image")
+                if image:
+                    # 이미 시작한 썸네일은 끝까지 그려 post_jobs에 저장되고 다음 시도에서 씀. 실패는 여기서 회수해 기록
+                    image.add_done_callback(_report_orphan)
+                await asyncio.to_thread(m.jobs.fail, post['id'], e)
+                print(f"[!] {sub} 작성 단계 실패: {e}")
+
+    async def _paint_worker(self, paint_q, publish_q, n_writers):
+        """작성 단계에서 먼저 띄운 썸네일 태스크가 끝나기를 기다려 발행 큐로 넘깁니다."""
+        remaining = n_writers
+        while remaining:
+            item = await paint_q.get()
+            if item is _DONE:
+                remaining -= 1
+                continue
+            sub, job, image_task = item
+            try:
+                if image_task:
+                    await image_task
+                    job = await asyncio.to_thread(self.manager.jobs.get, job['reddit_id'])
+                await publish_q.put((sub, job))
+            except Exception as e:
+                await asyncio.to_thread(self.manager.jobs.fail, job['reddit_id'], e)
+                print(f"[!] {sub} 이미지 단계 실패: {e}")
+        await publish_q.put(_DONE)
+
+    async def _publish_worker(self, publish_q):
+        m = self.manager
+        while True:
+            item = await publish_q.get()
+            if item is _DONE:
+                return
+            sub, job = item
+            try:
+                async with self.sem["publish"]:
+                    with m.tracer.span("publish", sub=sub, post_id=job['reddit_id']):
+                        await asyncio.to_thread(m.publish_post, job, self.today_str)
+            except Exception as e:
+                await asyncio.to_thread(m.jobs.fail, job['reddit_id'], e)
+                print(f"[!] {sub} 발행 단계 실패: {e}")
@@ -0,0 +1,138 @@
+"""
+서브레딧별 수집 주기를 따로 두는 스케줄러 (manager.py --daemon).
+
+작업 스케줄러가 매시간 8개 서브레딧을 한꺼번에 수집하면 새 글이 많은 곳은 놓치고 조용한 곳은 헛걸음합니다.
+여기서는 서브레딧마다 다음 수집 시각을 두고, 수집할 때 피드에 처음 보인 글 수에 맞춰 간격을 조절합니다.
+('처리하지 않은 후보' 수는 실행마다 서브레딧당 1개만 발행하므로 늘 높게 나와 간격 조절 신호로 쓸 수 없음)
+
+- 처음 본 글이 target_new보다 많으면 간격을 줄이고(최대 절반), 없으면 늘림(최대 1.5배), min/max 사이로 제한
+- 여러 서브레딧이 같은 시각에 몰리지 않도록 다음 시각에 ±jitter 비율의 무작위 오차를 줌
+- 한 번에 돌리는 서브레딧 수는 max_in_flight개까지 (글 생성/GPU 작업이 한꺼번에 쌓이지 않도록)
+- 학습한 간격은 gtb_storage.db의 poll_schedule에, 서브레딧별로 본 글 ID는 poll_seen에 저장해 재시작해도 이어서 씀
+  (poll_seen은 seen_ttl보다 오래된 ID를 지움. 그만큼 지난 글은 피드(하루 인기글)에 다시 나오지 않음)
+
+clock / sleep / rng를 바꿔 끼우면 실제 시간을 기다리지 않고 며칠치를 시뮬레이션할 수 있습니다. (benchmarks/bench_scheduler.py)
+"""
+import math
+import os
+import random
+import sqlite3
+import time
+from datetime import datetime
+
+from src.storage.migrations import migrate_local
+
+
+class PollScheduler:
+    def __init__(self, subs, db_path="data/gtb_storage.db", clock=time.time, sleep=time.sleep, rng=None,
+                 min_interval=None, max_interval=None, initial_interval=3600, jitter=0.1,
+                 target_new=2, max_in_flight=None, seen_ttl=7 * 86400):
+        self.subs = list(subs)
+        self.clock = clock
+        self.sleep = sleep
+        self.rng = rng or random.Random()
+        self.min_interval = min_interval or float(os.getenv("POLL_MIN_INTERVAL", "900"))
+        self.max_interval = max_interval or float(os.getenv("POLL_MAX_INTERVAL", str(6 * 3600)))
+        self.initial_interval = min(max(initial_interval, self.min_interval), self.max_interval)
+        self.jitter = jitter
+        self.target_new = target_new
+        self.max_in_flight = max_in_flight or int(os.getenv("DAEMON_MAX_IN_FLIGHT", "4"))
+        self.seen_ttl = seen_ttl
+
+        if db_path != ":memory:" and os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        migrate_local(self.conn)
+        saved = {r[0]: r[1:] for r in self.conn.execute(
+            "SELECT sub, interval, next_poll_at, polls, new_ids, errors FROM poll_schedule")}
+        now = self.clock()
+        self.state = {}
+        for sub in self.subs:
+            interval, next_poll_at, polls, new_ids, errors = saved.get(sub, (self.initial_interval, now, 0, 0, 0))
+            # 처음 보는 서브레딧과 재시작 사이에 시각이 지난 서브레딧은 바로 수집
+            self.state[sub] = {"interval": interval, "next_poll_at": min(next_poll_at, now + interval),
+                               "polls": polls, "new_ids": new_ids, "errors": errors}
+
+    def due(self):
+        """지금 수집할 서브레딧 (가장 오래 밀린 순, 최대 max_in_flight개)"""
+        now = self.clock()
+        ready = sorted((s["next_poll_at"], sub) for sub, s in self.state.items() if s["next_poll_at"] <= now)
+        return [sub for _, sub in ready[:self.max_in_flight]]
+
+    def next_wakeup(self):
+        """가장 가까운 다음 수집까지 남은 초"""
+        return max(0.0, min(s["next_poll_at"] for s in self.state.values()) - self.clock())
+
+    def observe(self, sub, ids):
+        """수집한 피드의 글 ID 중 이 서브레딧에서 처음 본 것을 기록하고 그 수를 반환합니다."""
+        now = self.clock()
+        ids = list(dict.fromkeys(ids))
+        with self.conn:
+            seen = set()
+            for i in range(0, len(ids), 900):
+                chunk = ids[i:i + 900]
+                seen.update(r[0] for r in self.conn.execute(
+                    f"SELECT reddit_id FROM poll_seen WHERE sub = ? AND reddit_id IN ({','.join('?' * len(chunk))})",
+                    (sub, *chunk)))
+            new = [i for i in ids if i not in seen]
+            self.conn.executemany("INSERT INTO poll_seen (sub, reddit_id, seen_at) VALUES (?, ?, ?)",
+                                  [(sub, i, now) for i in new])
+            self.conn.execute("DELETE FROM poll_seen WHERE sub = ? AND seen_at < ?", (sub, now - self.seen_ttl))
+        return len(new)
+
+    def record(self, sub, new_count):
+        """
+        수집 결과를 반영해 다음 수집 시각을 정합니다. new_count는 지난 수집 이후 피드에 처음 보인 글 수(observe),
+        수집 자체가 실패했으면 None (간격은 그대로 두고 min_interval 뒤에 다시 시도)
+        """
+        s = self.state[sub]
+        now = self.clock()
+        if new_count is None:
+            s["errors"] += 1
+            delay = min(s["interval"], self.min_interval)
+        else:
+            s["polls"] += 1
+            s["new_ids"] += new_count
+            # 새 후보 target_new개가 모일 즈음 다시 오도록. 한 번에 너무 크게 흔들리지 않게 제곱근으로 완화
+            factor = 1.5 if new_count == 0 else math.sqrt(self.target_new / new_count)
+            s["interval"] = min(self.max_interval, max(self.min_interval, s["interval"] * min(1.5, max(0.5, factor))))
+            delay = s["interval"]
+        s["next_poll_at"] = now + delay * (1 + self.rng.uniform(-self.jitter, self.jitter))
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO poll_schedule (sub, interval, next_poll_at, polls, new_ids, errors, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (sub, s["interval"], s["next_poll_at"], s["polls"], s["new_ids"], s["errors"],
+                 datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            )
+
+    def run(self, poll, max_ticks=None, should_stop=None):
+        """
+        돌아온 서브레딧마다 poll(subs) → {sub: 피드에 보인 글 ID 목록 (실패면 None)}을 부르고,
+        처음 본 글 수로 다음 시각을 정합니다.
+        할 일이 없으면 다음 시각까지 sleep. max_ticks번 poll하거나 should_stop()이 참이면 끝냅니다.
+        """
+        ticks = 0
+        while not (should_stop and should_stop()) and (max_ticks is None or ticks < max_ticks):
+            subs = self.due()
+            if not subs:
+                self.sleep(self.next_wakeup())
+                continue
+            ticks += 1
+            feeds = poll(subs) or {}
+            for sub in subs:
+                ids = feeds.get(sub)
+                self.record(sub, None if ids is None else self.observe(sub, ids))
+            print(self.report())
+
+    def report(self):
+        now = self.clock()
+        lines = ["[*] 다음 수집 일정"]
+        for sub, s in sorted(self.state.items(), key=lambda item: item[1]["next_poll_at"]):
+            per_poll = s["new_ids"] / s["polls"] if s["polls"] else 0
+            lines.append(f"  {sub:<20}{max(0, s['next_poll_at'] - now) / 60:>7.0f}분 후  간격 {s['interval'] / 60:>5.0f}분  "
+                         f"수집 {s['polls']}회, 회당 새 글 {per_poll:.1f}개")
+        return "\n".join(lines)
+
+    def close(self):
+        self.conn.close()
@@ -1,19 +1,115 @@
 import os
+import time
 import anthropic
-from dotenv import load_dotenv
 
-load_dotenv()
+from src.common.usage_log import UsageLog
+from src.processor.section_parser import SectionParser
+
+# 매 호출마다 똑같은 지시문. system 블록에 cache_control을 걸어 두 번째 호출부터는 캐시 읽기 요금/지연으로 처리됨
+# 모델별 최소 캐시 길이(Sonnet 1024토큰)보다 짧으면 캐시가 조용히 꺼지므로 작성 규칙과 출력 예시까지 넣어 넉넉히 넘김
+# (_record_usage가 cache_* 값이 0이면 경고, benchmarks/check_prompt_cache.py로 토큰 수 확인)
+# 출력 형식에서 IMAGE_PROMPT/KEYWORDS를 CONTENT 앞에 두어야 스트리밍 중에 이미지·쿠팡 작업을 먼저 시작할 수 있음
+SYSTEM_PROMPT = """당신은 해당 분야에서 10년 이상 경력을 가진 전문 비교 분석가입니다.
+독자가 "A vs B" 검색 시 가장 먼저 찾게 되는, 압도적으로 유용한 비교 분석글을 작성합니다.
+사용자가 [분석 대상 데이터]로 Reddit 원문, 트렌드 키워드, 선정 이유, 비교 대상, 한국 시장 트렌드를 제공합니다.
+
+[작성 원칙]
+1. **제목 형식:** 반드시 "A vs B: 핵심 차이점과 선택 가이드" 형태로 작성. 비교 대상이 명확해야 함.
+2. **객관적 비교:** 감정이 아닌 데이터와 스펙 기반으로 비교. 각 항목별 마크다운 표 필수 포함.
+3. **구조화된 본문:**
+   - 서론: 왜 이 비교가 중요한지 (검색 의도 충족)
+   - 핵심 비교표: 가격, 성능, 특징 등 항목별 비교
+   - 상세 분석: 각 항목을 깊이 있게 설명
+   - 결론: "이런 사람은 A, 저런 사람은 B" 명확한 추천
+4. **SEO 키워드 자연 삽입:** "A vs B", "A B 비교", "A B 차이" 등의 검색 키워드를 본문에 자연스럽게 포함.
+5. **말투:** "~합니다"와 "~이죠"를 섞어 권위 있되 읽기 편한 어조. 이모지는 섹션당 최대 1개.
+6. **한국 맥락 적용:** 한국 소비자 관점에서 가격, 구매처, 사용 환경 등을 고려하여 분석.
+
+[본문 구조 - 반드시 준수]
+## 서론 (왜 비교해야 하는가)
+## 한눈에 보는 비교표
+## 상세 비교 분석
+### 항목 1
+### 항목 2
+### 항목 3
+## 결론: 당신에게 맞는 선택은?
+
+[비교표 작성 규칙]
+- 첫 열은 비교 항목, 둘째·셋째 열은 A와 B. 헤더 행 다음 줄은 반드시 |---|---|---| 구분선.
+- 항목은 5~8개: 가격(원화 기준 대략적인 범위), 핵심 성능/효과, 사용 편의성, 유지 비용, 국내 구매 용이성 등.
+- 칸 안에는 짧은 구(句)만 쓰고 문장 설명은 표 아래 본문에서 풀어 씀. 확인되지 않은 수치는 "약", "~대"로 표현.
+- 표 바로 아래에 "한 줄 정리:" 문장을 하나 둠.
+
+[피해야 할 것]
+- 출처 없는 단정적 수치, 특정 브랜드 비방, 의학적 진단·처방처럼 읽히는 표현.
+- "결론적으로", "요약하자면" 같은 상투구 반복, 같은 키워드의 과도한 반복.
+- 섹션 헤더(VS_TITLE:, TITLE:, SUMMARY:, IMAGE_PROMPT:, KEYWORDS:, CONTENT:)를 본문 안에 다시 쓰는 것.
+- 출력 형식 앞뒤의 인사말, 설명, 코드 블록 감싸기.
+
+[출력 형식 - 반드시 이 형식을 따르세요]
+VS_TITLE: [A vs B 형식의 비교 대상 명시, 예: "에어팟 프로 vs 갤럭시 버즈"]
+---
+TITLE: [A vs B: 부제목 형식의 제목]
+---
+SUMMARY: [비교 핵심 요약 2-3문장]
+---
+IMAGE_PROMPT: [두 제품/개념이 나란히 비교되는 전문적이고 깔끔한 사진 프롬프트]
+---
+KEYWORDS: [A vs B, A B 비교, A B 차이 등 검색 의도 키워드]
+---
+CONTENT: [본문 - 비교표 포함 마크다운]
+
+[출력 예시 - 형식 참고용. 실제 글은 주어진 데이터로 새로 쓰고, 상세 분석은 항목마다 2~3문단으로 더 깊이 작성]
+VS_TITLE: 마그네슘 글리시네이트 vs 마그네슘 산화물
+---
+TITLE: 마그네슘 글리시네이트 vs 산화물: 흡수율과 가격으로 본 선택 가이드
+---
+SUMMARY: 같은 마그네슘이라도 결합 형태에 따라 흡수율, 위장 부담, 가격이 크게 다릅니다. 수면과 근육 이완이 목적이라면 글리시네이트, 가격 대비 함량이 중요하다면 산화물이 유리하죠. 한국에서 구하기 쉬운 제품 기준으로 정리했습니다.
+---
+IMAGE_PROMPT: Two supplement bottles side by side on a clean white marble counter, one labeled glycinate and one labeled oxide, soft natural window light, minimal, professional product photography
+---
+KEYWORDS: 마그네슘 글리시네이트 vs 산화물, 마그네슘 글리시네이트 산화물 비교, 마그네슘 종류 차이, 마그네슘 흡수율
+---
+CONTENT: ## 서론 (왜 비교해야 하는가)
+마그네슘 영양제를 고를 때 가장 먼저 마주치는 선택지가 바로 글리시네이트와 산화물입니다. 라벨의 함량 숫자만 보면 산화물이 훨씬 많아 보이지만, 실제로 몸에 흡수되는 양은 전혀 다른 이야기이죠. 이 글에서는 "마그네슘 글리시네이트 vs 산화물"을 흡수율, 부작용, 가격, 구매처 기준으로 비교합니다.
+
+## 한눈에 보는 비교표
+| 항목 | 마그네슘 글리시네이트 | 마그네슘 산화물 |
+|---|---|---|
+| 원소 마그네슘 함량 | 약 14% | 약 60% |
+| 흡수율 | 높은 편 | 낮은 편 |
+| 위장 부담 | 적음 | 설사 가능성 있음 |
+| 한 달 비용 | 약 2~3만 원대 | 약 1만 원 안팎 |
+| 국내 구매 | 해외 직구 위주 | 약국·온라인 쉽게 구매 |
+한 줄 정리: 흡수와 편안함은 글리시네이트, 가격과 접근성은 산화물입니다.
+
+## 상세 비교 분석
+### 흡수율
+글리시네이트는 아미노산(글리신)과 결합해 장에서 비교적 잘 흡수되는 형태로 알려져 있습니다. 함량 숫자는 낮아도 실제로 이용되는 양은 산화물보다 많을 수 있어, 라벨의 mg만으로 비교하면 오해하기 쉽죠.
+
+### 부작용과 복용 편의성
+산화물은 흡수되지 않은 양이 장에 남아 묽은 변을 유발할 수 있어, 변비 완화 목적이 아니라면 나눠 먹는 것이 좋습니다. 반면 글리시네이트는 공복에 먹어도 속이 편한 편이라 저녁 루틴에 넣기 쉽습니다.
+
+### 가격과 구매처
+국내 약국과 오픈마켓에서는 산화물 제품이 대부분이고, 글리시네이트는 해외 직구 비중이 높습니다. 배송 기간과 관부가세 기준을 함께 고려하면 한 번에 2~3개월 분량을 사는 편이 유리하죠.
+
+## 결론: 당신에게 맞는 선택은?
+잠들기 어렵거나 근육 경련이 잦아 꾸준히 먹을 분이라면 글리시네이트, 가끔 변비가 있고 비용이 우선이라면 산화물을 추천합니다. 신장 질환이 있다면 어떤 형태든 복용 전에 전문가와 상담하세요.
+"""
+
 
 class ClaudeProcessor:
-    def __init__(self):
+    def __init__(self, usage_log=None):
         api_key = os.getenv("ANTHROPIC_API_KEY")
         self.client = anthropic.Anthropic(api_key=api_key)
+        self.async_client = anthropic.AsyncAnthropic(api_key=api_key)
         self.model = "claude-sonnet-4-5"
+        self.system = [{"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}]
+        self.usage_log = usage_log or UsageLog()
+        self.cache_warned = False
 
-    def process_post(self, raw_post, korean_trends=None):
-        """
-        Reddit 원문과 한국 트렌드를 결합하여 'A vs B 비교 분석글'을 생성합니다.
-        """
+    def _build_prompt(self, raw_post, korean_trends=None):
+        """글마다 달라지는 데이터만 user 메시지로 보냅니다. (지시문은 SYSTEM_PROMPT)"""
         trend_context = ""
         if korean_trends:
             trend_context = f"\n[참고: 현재 한국 시장의 관심 키워드 및 트렌드]\n{korean_trends}\n"
@@ -24,63 +120,103 @@ class ClaudeProcessor:
         if compare_a and compare_b:
             compare_context = f"\n[비교 대상]\nA: {compare_a}\nB: {compare_b}\n"
 
-        prompt = f"""
-        당신은 해당 분야에서 10년 이상 경력을 가진 전문 비교 분석가입니다.
-        독자가 "A vs B" 검색 시 가장 먼저 찾게 되는, 압도적으로 유용한 비교 분석글을 작성합니다.
-
-        [분석 대상 데이터]
-        제목: {raw_post['title']}
-        핵심 내용: {raw_post['content']}
-        트렌드 키워드: {raw_post.get('target_keywords', '')}
-        선정이유: {raw_post.get('analysis_reason', '')}
-        {compare_context}
-        {trend_context}
-
-        [작성 원칙]
-        1. **제목 형식:** 반드시 "A vs B: 핵심 차이점과 선택 가이드" 형태로 작성. 비교 대상이 명확해야 함.
-        2. **객관적 비교:** 감정이 아닌 데이터와 스펙 기반으로 비교. 각 항목별 마크다운 표 필수 포함.
-        3. **구조화된 본문:**
-           - 서론: 왜 이 비교가 중요한지 (검색 의도 충족)
-           - 핵심 비교표: 가격, 성능, 특징 등 항목별 비교
-           - 상세 분석: 각 항목을 깊이 있게 설명
-           - 결론: "이런 사람은 A, 저런 사람은 B" 명확한 추천
-        4. **SEO 키워드 자연 삽입:** "A vs B", "A B 비교", "A B 차이" 등의 검색 키워드를 본문에 자연스럽게 포함.
-        5. **말투:** "~합니다"와 "~이죠"를 섞어 권위 있되 읽기 편한 어조. 이모지는 섹션당 최대 1개.
-        6. **한국 맥락 적용:** 한국 소비자 관점에서 가격, 구매처, 사용 환경 등을 고려하여 분석.
-
-        [본문 구조 - 반드시 준수]
-        ## 서론 (왜 비교해야 하는가)
-        ## 한눈에 보는 비교표
-        ## 상세 비교 분석
-        ### 항목 1
-        ### 항목 2
-        ### 항목 3
-        ## 결론: 당신에게 맞는 선택은?
-
-        [출력 형식 - 반드시 이 형식을 따르세요]
-        VS_TITLE: [A vs B 형식의 비교 대상 명시, 예: "에어팟 프로 vs 갤럭시 버즈"]
-        ---
-        TITLE: [A vs B: 부제목 형식의 제목]
-        ---
-        SUMMARY: [비교 핵심 요약 2-3문장]
-        ---
-        CONTENT: [본문 - 비교표 포함 마크다운]
-        ---
-        IMAGE_PROMPT: [두 제품/개념이 나란히 비교되는 전문적이고 깔끔한 사진 프롬프트]
-        ---
-        KEYWORDS: [A vs B, A B 비교, A B 차이 등 검색 의도 키워드]
-        """
+        prompt = f"""[분석 대상 데이터]
+제목: {raw_post['title']}
+핵심 내용: {raw_post['content']}
+트렌드 키워드: {raw_post.get('target_keywords', '')}
+선정이유: {raw_post.get('analysis_reason', '')}
+{compare_context}
+{trend_context}
+위 데이터로 비교 분석글을 출력 형식에 맞춰 작성하세요."""
+        return prompt
+
+    def _request(self, prompt):
+        return dict(
+            model=self.model,
+            max_tokens=4000,
+            temperature=0.7,
+            system=self.system,
+            messages=[{"role": "user", "content": prompt}]
+        )
 
+    def _record_usage(self, call, message, started):
+        try:
+            values = self.usage_log.record(self.model, call, message.usage, time.perf_counter() - started)
+        except Exception as e:
+            print(f"[!] 토큰 사용량 기록 실패: {e}")
+            return
+        # 캐시 쓰기도 읽기도 없으면 cache_control이 무시된 것 (최소 캐시 길이 미달 등). 실행마다 한 번만 알림
+        if not values["cache_creation_input_tokens"] and not values["cache_read_input_tokens"] \
+                and not self.cache_warned:
+            self.cache_warned = True
+            print(f"[!] 시스템 프롬프트 캐시가 적용되지 않았습니다 (입력 {values['input_tokens']:,}토큰). "
+                  f"최소 캐시 길이를 넘는지 확인하세요: python -m benchmarks.check_prompt_cache")
+
+    def process_post(self, raw_post, korean_trends=None):
+        """
+        Reddit 원문과 한국 트렌드를 결합하여 'A vs B 비교 분석글'을 생성합니다.
+        """
+        prompt = self._build_prompt(raw_post, korean_trends)
         print(f"[*] Claude가 비교 분석 콘텐츠를 생성 중...")
 
         try:
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=4000,
-                temperature=0.7,
-                messages=[{"role": "user", "content": prompt}]
-            )
+            started = time.perf_counter()
+            message = self.client.messages.create(**self._request(prompt))
+            self._record_usage("process_post", message, started)
             return message.content[0].text
         except Exception as e:
             print(f"Error: {str(e)}")
             return None
+
+    def _report_stream(self, parser, first_token_s):
+        m = parser.metrics
+        first_section = f"{m['first_section_s']:.1f}s" if m["first_section_s"] is not None else "-"
+        print(f"[*] Claude 스트리밍 완료: 첫 토큰 {first_token_s or 0:.1f}s, 첫 섹션 {first_section}, "
+              f"전체 {time.perf_counter() - parser.started:.1f}s, 파싱 {m['parse_s'] * 1000:.1f}ms ({m['chunks']}청크)")
+
+    def stream_post(self, raw_post, korean_trends=None, on_section=None):
+        """
+        process_post의 스트리밍 버전. 토큰이 오는 대로 SectionParser에 넣고, 섹션이 끝날 때마다 on_section(name, value)를 부릅니다.
+        완료된 SectionParser(.sections / .metrics)를 반환하고 실패하면 None.
+        """
+        prompt = self._build_prompt(raw_post, korean_trends)
+        print(f"[*] Claude가 비교 분석 콘텐츠를 생성 중... (stream)")
+
+        parser = SectionParser(on_section)
+        first_token_s = None
+        try:
+            with self.client.messages.stream(**self._request(prompt)) as stream:
+                for text in stream.text_stream:
+                    if first_token_s is None:
+                        first_token_s = time.perf_counter() - parser.started
+                    parser.feed(text)
+                self._record_usage("stream_post", stream.get_final_message(), parser.started)
+            parser.close()
+            parser.metrics["first_token_s"] = first_token_s
+            self._report_stream(parser, first_token_s)
+            return parser
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            return None
+
+    async def stream_post_async(self, raw_post, korean_trends=None, on_section=None):
+        """stream_post의 비동기 버전. on_section은 이벤트 루프 안에서 호출되므로 바로 태스크를 만들 수 있습니다."""
+        prompt = self._build_prompt(raw_post, korean_trends)
+        print(f"[*] Claude가 비교 분석 콘텐츠를 생성 중... (async stream)")
+
+        parser = SectionParser(on_section)
+        first_token_s = None
+        try:
+            async with self.async_client.messages.stream(**self._request(prompt)) as stream:
+                async for text in stream.text_stream:
+                    if first_token_s is None:
+                        first_token_s = time.perf_counter() - parser.started
+                    parser.feed(text)
+                self._record_usage("stream_post", await stream.get_final_message(), parser.started)
+            parser.close()
+            parser.metrics["first_token_s"] = first_token_s
+            self._report_stream(parser, first_token_s)
+            return parser
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            return None
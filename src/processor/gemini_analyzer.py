@@ -1,30 +1,80 @@
 import os
-import re
+import json
 import google.generativeai as genai
-from dotenv import load_dotenv
 
-load_dotenv()
+_STRING = {"type": "string"}
+# Gemini structured output schema; the same dict is used to validate the reply
+RANKING_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "categories": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "category": _STRING,
+                    "winner_index": {"type": "integer"},
+                    "reason": _STRING,
+                    "compare_a": _STRING,
+                    "compare_b": _STRING,
+                    "target_keywords": _STRING,
+                    "scores": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {"index": {"type": "integer"}, "score": {"type": "number"}},
+                            "required": ["index", "score"],
+                        },
+                    },
+                },
+                "required": ["category", "winner_index", "reason", "compare_a", "compare_b", "target_keywords", "scores"],
+            },
+        }
+    },
+    "required": ["categories"],
+}
+_TYPES = {"object": dict, "array": list, "string": str, "integer": int, "number": (int, float)}
+
+
+def validate(value, schema, path="$"):
+    """Minimal check for the subset of JSON schema used by RANKING_SCHEMA. Raises ValueError."""
+    expected = _TYPES[schema["type"]]
+    if not isinstance(value, expected) or (isinstance(value, bool) and schema["type"] != "boolean"):
+        raise ValueError(f"{path}: expected {schema['type']}, got {type(value).__name__}")
+    if schema["type"] == "object":
+        for key in schema.get("required", []):
+            if key not in value:
+                raise ValueError(f"{path}: missing '{key}'")
+        for key, sub_schema in schema.get("properties", {}).items():
+            if key in value:
+                validate(value[key], sub_schema, f"{path}.{key}")
+    elif schema["type"] == "array":
+        for i, item in enumerate(value):
+            validate(item, schema["items"], f"{path}[{i}]")
+
 
 class GeminiAnalyzer:
     def __init__(self):
         api_key = os.getenv("GEMINI_API_KEY")
         genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-1.5-flash')
-
-    def analyze_and_rank_topics(self, raw_posts):
-        """
-        Analyze topics and pick the best one for a comparison-style article (A vs B).
-        """
-        if not raw_posts:
-            return []
+        self.model = genai.GenerativeModel(
+            'gemini-1.5-flash',
+            generation_config={"response_mime_type": "application/json", "response_schema": RANKING_SCHEMA},
+        )
 
+    def _build_prompt(self, candidates_by_category, interest=None):
         topics_str = ""
-        for i, post in enumerate(raw_posts):
-            topics_str += f"[{i}] Title: {post['title']}\n"
+        for category, raw_posts in candidates_by_category.items():
+            topics_str += f"\n[Category: {category}]\n"
+            for i, post in enumerate(raw_posts):
+                topics_str += f"[{i}] Title: {post['title']}\n"
+            # Our own best-read articles in this category (stats_daily rollup), if any
+            for past in (interest or {}).get(category, []):
+                topics_str += f"(Past hit: \"{past['title']}\" - {past['visits']} visits, {past['clicks']} Coupang clicks)\n"
 
         prompt = f"""
         You are a top-tier SEO strategist specializing in Korean search market.
-        Your goal: find the topic BEST suited for an "A vs B" comparison article that will rank high on Google Korea.
+        For EACH category below, find the topic BEST suited for an "A vs B" comparison article that will rank high on Google Korea.
 
         [Selection Criteria]
         1. Comparison Potential: Can we extract TWO comparable products, methods, or technologies from this topic?
@@ -32,50 +82,115 @@ class GeminiAnalyzer:
         3. Content Gap: Lack of quality Korean comparison content on this topic.
         4. Profitability: Links well to Coupang products (both A and B sides).
         5. E-E-A-T: We can provide expert-level comparison with data.
+        6. Proven Reader Interest: where "Past hit" lines are given, prefer topics close to what our readers already visit and click, without repeating the same comparison.
 
         [Topics List]
         {topics_str}
 
-        [Output Format - STRICT]
-        WINNER_INDEX: [Index Number]
-        REASON: [Short analysis in Korean on why this is the best comparison topic]
-        COMPARE_A: [First item/product/method to compare - in Korean]
-        COMPARE_B: [Second item/product/method to compare - in Korean]
-        TARGET_KEYWORDS: [3 comparison-focused long-tail keywords in Korean, comma separated, must include "vs" or "비교"]
+        [Output - JSON]
+        One entry in "categories" per category above, with "category" copied exactly as given:
+        - winner_index: index of the best topic within that category
+        - reason: short analysis in Korean on why this is the best comparison topic
+        - compare_a / compare_b: the two items/products/methods to compare, in Korean
+        - target_keywords: 3 comparison-focused long-tail keywords in Korean, comma separated, must include "vs" or "비교"
+        - scores: every topic of that category as {{"index", "score"}}, score 0-100 by the criteria above
         """
+        return prompt
 
-        try:
-            response = self.model.generate_content(prompt)
-            result_text = response.text
-
-            winner_match = re.search(r'WINNER_INDEX:\s*(\d+)', result_text)
-            if winner_match:
-                winner_idx = int(winner_match.group(1))
-                if winner_idx >= len(raw_posts):
-                    winner_idx = 0
-
-                reason = re.search(r'REASON:\s*(.*)', result_text, re.MULTILINE)
-                keywords = re.search(r'TARGET_KEYWORDS:\s*(.*)', result_text, re.MULTILINE)
-                compare_a = re.search(r'COMPARE_A:\s*(.*)', result_text, re.MULTILINE)
-                compare_b = re.search(r'COMPARE_B:\s*(.*)', result_text, re.MULTILINE)
-
-                winner_post = raw_posts[winner_idx]
-                winner_post['analysis_reason'] = reason.group(1).strip() if reason else "Selected for high comparison potential."
-                winner_post['target_keywords'] = keywords.group(1).strip() if keywords else ""
-                winner_post['compare_a'] = compare_a.group(1).strip() if compare_a else ""
-                winner_post['compare_b'] = compare_b.group(1).strip() if compare_b else ""
-
-                print(f"[*] Gemini selected comparison topic: '{winner_post['title'][:30]}...'")
-                if winner_post.get('compare_a') and winner_post.get('compare_b'):
-                    print(f"    → {winner_post['compare_a']} vs {winner_post['compare_b']}")
-                return [winner_post]
+    def _parse(self, candidates_by_category, result_text):
+        """Validate the JSON reply and return {category: entry}. Categories missing from the reply are left out."""
+        data = json.loads(result_text)
+        validate(data, RANKING_SCHEMA)
+        entries = {}
+        for entry in data["categories"]:
+            raw_posts = candidates_by_category.get(entry["category"])
+            if raw_posts is None:
+                continue
+            if not 0 <= entry["winner_index"] < len(raw_posts):
+                print(f"[!] Gemini returned out-of-range winner {entry['winner_index']} for {entry['category']}")
+                continue
+            entries.setdefault(entry["category"], entry)
+        return entries
 
+    def _pick_winner(self, category, raw_posts, entry):
+        if entry is None:
+            print(f"[!] No valid Gemini ranking for {category}; falling back to candidate 0")
             return [raw_posts[0]]
+
+        for score in entry["scores"]:
+            if 0 <= score["index"] < len(raw_posts):
+                raw_posts[score["index"]]['rank_score'] = float(score["score"])
+
+        winner_post = raw_posts[entry["winner_index"]]
+        winner_post['analysis_reason'] = entry["reason"].strip() or "Selected for high comparison potential."
+        winner_post['target_keywords'] = entry["target_keywords"].strip()
+        winner_post['compare_a'] = entry["compare_a"].strip()
+        winner_post['compare_b'] = entry["compare_b"].strip()
+
+        print(f"[*] Gemini selected comparison topic ({category}): '{winner_post['title'][:30]}...'")
+        if winner_post.get('compare_a') and winner_post.get('compare_b'):
+            print(f"    → {winner_post['compare_a']} vs {winner_post['compare_b']}")
+        return [winner_post]
+
+    def _pick_winners(self, candidates_by_category, result_text):
+        try:
+            entries = self._parse(candidates_by_category, result_text)
+        except ValueError as e:  # json.JSONDecodeError is a ValueError too
+            print(f"[!] Gemini ranking reply failed validation: {e}")
+            entries = {}
+        return {
+            category: self._pick_winner(category, raw_posts, entries.get(category))
+            for category, raw_posts in candidates_by_category.items()
+        }
+
+    def rank_categories(self, candidates_by_category, interest=None):
+        """
+        Rank every category's candidates in a single Gemini request.
+        interest: optional {category: [{"title", "visits", "clicks"}]} of past popular articles.
+        Returns {category: [winner_post]} for each non-empty category.
+        """
+        candidates_by_category = {c: p for c, p in candidates_by_category.items() if p}
+        if not candidates_by_category:
+            return {}
+
+        try:
+            response = self.model.generate_content(self._build_prompt(candidates_by_category, interest))
+            return self._pick_winners(candidates_by_category, response.text)
         except Exception as e:
             print(f"[!] Gemini analysis error: {e}")
-            return [raw_posts[0]]
+            return {c: [p[0]] for c, p in candidates_by_category.items()}
+
+    async def rank_categories_async(self, candidates_by_category, interest=None):
+        """
+        Async variant of rank_categories (uses generate_content_async).
+        """
+        candidates_by_category = {c: p for c, p in candidates_by_category.items() if p}
+        if not candidates_by_category:
+            return {}
+
+        try:
+            response = await self.model.generate_content_async(self._build_prompt(candidates_by_category, interest))
+            return self._pick_winners(candidates_by_category, response.text)
+        except Exception as e:
+            print(f"[!] Gemini analysis error: {e}")
+            return {c: [p[0]] for c, p in candidates_by_category.items()}
+
+    def analyze_and_rank_topics(self, raw_posts):
+        """
+        Analyze topics and pick the best one for a comparison-style article (A vs B).
+        Single-category wrapper around rank_categories.
+        """
+        return self.rank_categories({"topics": raw_posts}).get("topics", [])
+
+    async def analyze_and_rank_topics_async(self, raw_posts):
+        """
+        Async variant of analyze_and_rank_topics.
+        """
+        return (await self.rank_categories_async({"topics": raw_posts})).get("topics", [])
 
 if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
     analyzer = GeminiAnalyzer()
     test_posts = [{"title": "Best magnesium for sleep?"}, {"title": "OLED vs IPS for work"}]
     print(analyzer.analyze_and_rank_topics(test_posts))
@@ -0,0 +1,236 @@
+"""
+발행할 때 한 번만 계산해 posts 테이블에 같이 넣는 파생 필드.
+
+- content_html: 쿠팡 CTA까지 합친 본문 마크다운을 HTML로 렌더링하고 허용 목록 밖의 태그/속성을 걸러 낸 것
+  (엣지에서 요청마다 marked.parse를 돌리지 않고 이 값을 그대로 씀)
+- excerpt: 목록 카드용 평문 발췌 (제목/표 제외, EXCERPT_CHARS자 안쪽에서 단어 경계로 자름)
+- reading_minutes: 한글은 글자 수, 영문은 단어 수 기준 예상 읽기 시간(분)
+- toc: h2/h3 목차 JSON [{"level": 2, "id": "...", "text": "..."}]
+
+이미 발행된 글은 아래 명령으로 배치 단위로 채웁니다. (처리한 행은 updated_at을 갱신해 미러/사이트맵에 반영)
+
+    python -m src.processor.post_renderer --backfill              # content_html이 비어 있는 글만
+    python -m src.processor.post_renderer --backfill --all        # 렌더러가 바뀌었을 때 전체 다시
+"""
+import argparse
+import json
+import re
+import time
+from html import escape
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+import markdown
+from markdown.extensions.toc import slugify_unicode
+
+# posts 테이블에 추가되는 컬럼 (schema.sql과 같게 유지)
+# image_meta: 썸네일 변형(srcset/LQIP) JSON (src/painter/image_optimizer.py picture_meta)
+RENDER_COLUMNS = {"content_html": "TEXT", "excerpt": "TEXT", "reading_minutes": "INTEGER", "toc": "TEXT",
+                  "image_meta": "TEXT"}
+EXCERPT_CHARS = 160
+# 분당 읽는 양 (한글 글자 / 영문 단어)
+HANGUL_PER_MINUTE = 500
+WORDS_PER_MINUTE = 220
+
+ALLOWED_TAGS = {
+    "a": ("href", "title"), "img": ("src", "alt", "title"),
+    "th": ("style",), "td": ("style",), "h2": ("id",), "h3": ("id",), "h4": ("id",),
+    **{tag: () for tag in ("p", "br", "hr", "h1", "h5", "h6", "strong", "em", "b", "i", "del", "code", "pre",
+                           "blockquote", "ul", "ol", "li", "table", "thead", "tbody", "tr")},
+}
+VOID_TAGS = {"br", "hr", "img"}
+# 내용째 버리는 태그
+DROP_CONTENT = {"script", "style", "iframe", "object", "embed", "template", "noscript"}
+SAFE_SCHEMES = {"", "http", "https", "mailto"}
+# 제휴 링크는 검색엔진 지침대로 sponsored 표시
+SPONSORED_HOSTS = ("coupang.com",)
+_TEXT_ALIGN = re.compile(r"^text-align:\s*(left|right|center);?$")
+_HANGUL = re.compile(r"[가-힣]")
+_WORD = re.compile(r"[A-Za-z0-9]+(?:['’.-][A-Za-z0-9]+)*")
+
+
+class _Sanitizer(HTMLParser):
+    """허용 목록에 있는 태그/속성만 남기고 다시 직렬화합니다. 발췌용 평문도 같이 모읍니다."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.out = []
+        self.text = []         # 본문 문단/목록의 평문 (제목, 표, 코드는 제외)
+        self.all_text = []     # 읽기 시간 계산용 전체 평문
+        self.open = []
+        self.dropping = 0
+        self.skip_text = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROP_CONTENT:
+            self.dropping += 1
+            return
+        if self.dropping or tag not in ALLOWED_TAGS:
+            return
+        kept = []
+        for name, value in attrs:
+            if name not in ALLOWED_TAGS[tag] or value is None:
+                continue
+            if name in ("href", "src") and urlsplit(value.strip()).scheme.lower() not in SAFE_SCHEMES:
+                continue
+            if name == "style" and not _TEXT_ALIGN.match(value.strip()):
+                continue
+            kept.append((name, value))
+        if tag == "a":
+            host = urlsplit(dict(kept).get("href", "")).netloc.lower()
+            if host:
+                rel = "sponsored nofollow noopener" if host.endswith(SPONSORED_HOSTS) else "nofollow noopener"
+                kept += [("rel", rel), ("target", "_blank")]
+        self.out.append(f"<{tag}" + "".join(f' {n}="{escape(v)}"' for n, v in kept) + ">")
+        if tag in VOID_TAGS:
+            return
+        self.open.append(tag)
+        if tag in ("h1", "h2", "h3", "h4", "h5", "h6", "table", "pre", "code"):
+            self.skip_text += 1
+        if tag in ("p", "li", "br", "blockquote"):
+            self.text.append(" ")
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag in self.open and tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in DROP_CONTENT:
+            self.dropping = max(0, self.dropping - 1)
+            return
+        if self.dropping or tag not in self.open:
+            return
+        # 닫히지 않은 안쪽 태그까지 같이 닫음
+        while self.open:
+            inner = self.open.pop()
+            self.out.append(f"</{inner}>")
+            if inner in ("h1", "h2", "h3", "h4", "h5", "h6", "table", "pre", "code"):
+                self.skip_text -= 1
+            if inner == tag:
+                break
+        self.all_text.append(" ")
+
+    def handle_data(self, data):
+        if self.dropping:
+            return
+        self.out.append(escape(data, quote=False))
+        self.all_text.append(data)
+        if not self.skip_text:
+            self.text.append(data)
+
+    def close(self):
+        super().close()
+        while self.open:
+            self.out.append(f"</{self.open.pop()}>")
+
+
+def sanitize_html(html):
+    """허용 목록 밖의 태그/속성/스킴(javascript: 등)을 걸러 낸 HTML"""
+    parser = _Sanitizer()
+    parser.feed(html)
+    parser.close()
+    return "".join(parser.out)
+
+
+def make_excerpt(text, limit=EXCERPT_CHARS):
+    text = " ".join(text.split())
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    # 단어 중간에서 자르지 않도록 마지막 공백까지 (공백이 너무 앞이면 그냥 자름)
+    space = cut.rfind(" ")
+    return (cut[:space] if space > limit * 0.6 else cut).rstrip(" ,.·-") + "…"
+
+
+def reading_minutes(text):
+    hangul = len(_HANGUL.findall(text))
+    words = len(_WORD.findall(_HANGUL.sub(" ", text)))
+    return max(1, round(hangul / HANGUL_PER_MINUTE + words / WORDS_PER_MINUTE))
+
+
+def _flatten_toc(tokens, levels=(2, 3)):
+    items = []
+    for token in tokens:
+        if token["level"] in levels:
+            items.append({"level": token["level"], "id": token["id"], "text": token["name"]})
+        items += _flatten_toc(token["children"], levels)
+    return items
+
+
+def render_post(content):
+    """
+    본문 마크다운 → {content_html, excerpt, reading_minutes, toc(JSON 문자열)}
+    제목 id는 한글이 남도록 유니코드 slug를 쓰고, 같은 제목이 반복되면 _1, _2가 붙습니다.
+    """
+    md = markdown.Markdown(extensions=["tables", "sane_lists", "toc"],
+                           extension_configs={"toc": {"slugify": slugify_unicode}})
+    html = md.convert(content or "")
+    parser = _Sanitizer()
+    parser.feed(html)
+    parser.close()
+    body_text = "".join(parser.text)
+    return {
+        "content_html": "".join(parser.out),
+        "excerpt": make_excerpt(body_text),
+        "reading_minutes": reading_minutes("".join(parser.all_text)),
+        "toc": json.dumps(_flatten_toc(md.toc_tokens), ensure_ascii=False),
+    }
+
+
+def ensure_columns(db):
+    """posts에 렌더링 컬럼이 없으면 추가합니다. (migrations/d1/0002, 0005) 추가한 컬럼 목록을 반환합니다."""
+    existing = {row["name"] for row in db.query("PRAGMA table_info(posts)")}
+    added = [name for name in RENDER_COLUMNS if name not in existing]
+    for name in added:
+        db.query(f"ALTER TABLE posts ADD COLUMN {name} {RENDER_COLUMNS[name]}")
+    return added
+
+
+def backfill(db, batch_size=50, rerender=False):
+    """
+    content_html이 비어 있는(rerender면 모든) 글을 id 순으로 batch_size개씩 렌더링해 UPDATE 배치 1회로 저장합니다.
+    id 커서로 넘어가므로 도중에 끊겨도 다시 실행하면 남은 글부터 이어서 합니다. 처리한 글 수를 반환합니다.
+    렌더링 컬럼은 D1 마이그레이션(python -m src.storage.migrations --target d1)이 만듭니다.
+    """
+    where = "" if rerender else "AND content_html IS NULL"
+    last_id, done = 0, 0
+    while True:
+        rows = db.query(f"SELECT id, content FROM posts WHERE id > ? {where} ORDER BY id LIMIT ?", (last_id, batch_size))
+        if not rows:
+            return done
+        statements = []
+        for row in rows:
+            fields = render_post(row["content"])
+            statements.append((
+                "UPDATE posts SET content_html = ?, excerpt = ?, reading_minutes = ?, toc = ?, "
+                "updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                (fields["content_html"], fields["excerpt"], fields["reading_minutes"], fields["toc"], row["id"])
+            ))
+        # 같은 값으로 덮어쓰는 UPDATE라 5xx 뒤 재전송해도 안전
+        db.batch(statements, idempotent=True)
+        last_id = rows[-1]["id"]
+        done += len(rows)
+        print(f"[*] {done}개 렌더링 완료 (id {last_id}까지)")
+        if len(rows) < batch_size:
+            return done
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
+    from src.publisher.d1_client import D1Client
+
+    parser = argparse.ArgumentParser(description="posts 본문 HTML/발췌/읽기 시간/목차 채우기")
+    parser.add_argument("--backfill", action="store_true", help="비어 있는 글을 배치 단위로 렌더링해 저장")
+    parser.add_argument("--all", action="store_true", help="이미 렌더링한 글도 다시 (렌더러를 바꿨을 때)")
+    parser.add_argument("--batch", type=int, default=50)
+    args = parser.parse_args()
+    if not args.backfill:
+        parser.error("--backfill을 지정하세요.")
+
+    client = D1Client()
+    started = time.perf_counter()
+    count = backfill(client, args.batch, rerender=args.all)
+    print(f"[+] 백필 완료: {count}개 ({time.perf_counter() - started:.1f}s)")
+    client.close()
@@ -0,0 +1,103 @@
+"""
+Claude 출력(VS_TITLE / TITLE / SUMMARY / CONTENT / IMAGE_PROMPT / KEYWORDS 블록)을 한 번만 훑어 나누는 파서.
+스트리밍 토큰을 feed()로 밀어 넣으면 섹션이 끝나는 즉시 콜백을 부릅니다.
+"""
+import re
+import time
+
+SECTIONS = ("vs_title", "title", "summary", "content", "image_prompt", "keywords")
+_HEADER = re.compile(r"^\s*\**\s*(VS_TITLE|TITLE|SUMMARY|CONTENT|IMAGE_PROMPT|KEYWORDS)\s*\**\s*:\s*\**\s*(.*)$", re.IGNORECASE)
+_SEPARATOR = re.compile(r"^\s*---\s*$")
+
+
+class SectionParser:
+    """
+    줄 단위로 헤더(`TITLE:` 등)를 찾아 섹션을 나눕니다. 헤더 순서는 상관없습니다.
+    CONTENT가 시작된 뒤로는 아직 나오지 않은 섹션의 헤더만, `---` 구분선 바로 다음 줄이거나
+    대문자 IMAGE_PROMPT: / KEYWORDS:로 시작하는 줄일 때만 섹션 경계로 봅니다. (예전 순서 CONTENT → IMAGE_PROMPT → KEYWORDS 응답용)
+    그 밖에는 본문 줄이 "Summary: ..."처럼 시작해도 본문으로 받습니다.
+    섹션 사이의 `---`는 바로 다음 줄이 헤더일 때만 구분선으로 보고, 본문 안의 `---`(가로줄)는 그대로 둡니다.
+
+    metrics: first_section_s(시작 → 첫 섹션 완료), sections(섹션별 완료 시각), parse_s(파싱에 쓴 누적 시간)
+    """
+
+    def __init__(self, on_section=None):
+        self.on_section = on_section
+        self.sections = {}
+        self.started = time.perf_counter()
+        self.metrics = {"first_section_s": None, "sections": {}, "parse_s": 0.0, "chunks": 0}
+        self._partial = ""
+        self._current = None
+        self._lines = []
+        self._held_separator = None
+        self._closed = False
+
+    def feed(self, chunk):
+        started = time.perf_counter()
+        self.metrics["chunks"] += 1
+        lines = (self._partial + chunk).split("\n")
+        self._partial = lines.pop()
+        for line in lines:
+            self._line(line)
+        self.metrics["parse_s"] += time.perf_counter() - started
+
+    def close(self):
+        """남은 줄을 처리하고 마지막 섹션을 마감합니다. 섹션 dict(없는 섹션은 "")를 반환합니다."""
+        if not self._closed:
+            started = time.perf_counter()
+            self._closed = True
+            if self._partial:
+                self._line(self._partial)
+                self._partial = ""
+            self._held_separator = None
+            self._finish()
+            self.metrics["parse_s"] += time.perf_counter() - started
+        return {key: self.sections.get(key, "") for key in SECTIONS}
+
+    def _line(self, line):
+        header = _HEADER.match(line) if ":" in line else None
+        if header and self._current == "content" and not self._ends_content(header, line):
+            header = None
+        if header:
+            self._held_separator = None
+            self._finish()
+            self._current = header.group(1).lower()
+            self._lines = [header.group(2)]
+            return
+        if self._held_separator is not None:
+            # 구분선 다음이 헤더가 아니었으므로 본문의 일부
+            self._lines.append(self._held_separator)
+            self._held_separator = None
+        if _SEPARATOR.match(line):
+            self._held_separator = line
+        elif self._current:
+            self._lines.append(line)
+
+    def _ends_content(self, header, line):
+        name = header.group(1).lower()
+        if name in self.sections or name == "content":
+            return False
+        return self._held_separator is not None or line.startswith(("IMAGE_PROMPT:", "KEYWORDS:"))
+
+    def _finish(self):
+        if self._current is None:
+            return
+        name, value = self._current, "\n".join(self._lines).strip()
+        self._current, self._lines = None, []
+        # 같은 헤더가 두 번 나오면 처음 것을 유지 (기존 정규식 파서와 동일)
+        if name in self.sections:
+            return
+        self.sections[name] = value
+        elapsed = time.perf_counter() - self.started
+        self.metrics["sections"][name] = elapsed
+        if self.metrics["first_section_s"] is None:
+            self.metrics["first_section_s"] = elapsed
+        if self.on_section:
+            self.on_section(name, value)
+
+
+def parse_sections(text):
+    """완성된 응답 전체를 한 번에 파싱합니다."""
+    parser = SectionParser()
+    parser.feed(text)
+    return parser.close()
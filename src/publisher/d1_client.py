@@ -0,0 +1,123 @@
+import os
+import re
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.common import tracing
+
+DEFAULT_API_BASE = "https://api.cloudflare.com/client/v4"
+# 다시 보내도 결과가 같은 읽기 문장
+_READ = re.compile(r"^\s*(SELECT|PRAGMA|EXPLAIN)\b", re.IGNORECASE)
+
+
+class D1Error(Exception):
+    pass
+
+
+class D1Client:
+    """
+    Cloudflare D1 REST API 클라이언트.
+    `npx wrangler d1 execute` 대신 HTTP 세션 하나로 바인딩 파라미터 쿼리와 배치 실행을 처리합니다.
+
+    필요한 환경변수: CLOUDFLARE_ACCOUNT_ID, CLOUDFLARE_D1_DATABASE_ID, CLOUDFLARE_API_TOKEN
+    D1_API_BASE를 지정하면 로컬 대역 서버(src/publisher/d1_local_server.py)로 붙습니다.
+
+    재시도: 연결 실패와 429(요청이 처리되지 않음)는 항상 다시 보냅니다.
+    5xx/응답 대기 중 끊김은 D1이 이미 반영했을 수 있으므로 멱등 요청(읽기, 또는 idempotent=True로 표시한
+    UPSERT/조건부 UPDATE)만 다시 보냅니다. INSERT 배치가 두 번 들어가는 일을 막기 위함입니다.
+    """
+
+    def __init__(self, account_id=None, database_id=None, api_token=None, api_base=None, timeout=30,
+                 server_retries=3, backoff=0.5):
+        self.account_id = account_id or os.getenv("CLOUDFLARE_ACCOUNT_ID")
+        self.database_id = database_id or os.getenv("CLOUDFLARE_D1_DATABASE_ID")
+        self.api_token = api_token or os.getenv("CLOUDFLARE_API_TOKEN")
+        self.api_base = (api_base or os.getenv("D1_API_BASE") or DEFAULT_API_BASE).rstrip("/")
+        self.timeout = timeout
+        self.server_retries = server_retries
+        self.backoff = backoff
+        self.pending = []
+
+        self.session = requests.Session()
+        # 어댑터 재시도는 요청이 처리되지 않은 경우만 (연결 실패, 429). 읽기 오류는 다시 보내지 않음
+        retry = Retry(total=3, connect=3, read=0, status=3, backoff_factor=backoff, status_forcelist=(429,),
+                      allowed_methods=None)
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=4, max_retries=retry))
+        self.session.mount("http://", HTTPAdapter(pool_maxsize=4, max_retries=retry))
+        self.session.headers.update({
+            "Authorization": f"Bearer {self.api_token}",
+            "Content-Type": "application/json",
+        })
+
+    @property
+    def endpoint(self):
+        return f"{self.api_base}/accounts/{self.account_id}/d1/database/{self.database_id}/query"
+
+    def _post(self, body, idempotent=False):
+        if not self.account_id or not self.database_id:
+            raise D1Error("CLOUDFLARE_ACCOUNT_ID / CLOUDFLARE_D1_DATABASE_ID가 설정되지 않았습니다.")
+        attempts = self.server_retries + 1 if idempotent else 1
+        for attempt in range(attempts):
+            try:
+                response = self.session.post(self.endpoint, json=body, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt + 1 == attempts:
+                    raise
+            else:
+                if response.status_code < 500 or attempt + 1 == attempts:
+                    break
+            tracing.count("retries", 1)
+            time.sleep(self.backoff * 2 ** attempt)
+        retries = getattr(response.raw, "retries", None)
+        tracing.count("retries", len(retries.history) if retries else 0)
+        tracing.count("bytes_out", len(response.request.body or b""))
+        tracing.count("bytes_in", len(response.content))
+        try:
+            data = response.json()
+        except ValueError:
+            raise D1Error(f"D1 응답 파싱 실패 ({response.status_code}): {response.text[:200]}")
+        if response.status_code != 200 or not data.get("success"):
+            errors = data.get("errors") or response.text[:200]
+            raise D1Error(f"D1 쿼리 실패 ({response.status_code}): {errors}")
+        return data.get("result", [])
+
+    def query(self, sql, params=None, idempotent=None):
+        """단일 문장을 실행하고 결과 행(dict 리스트)을 반환합니다. idempotent를 생략하면 읽기 문장만 멱등으로 봅니다."""
+        if idempotent is None:
+            idempotent = bool(_READ.match(sql))
+        result = self._post({"sql": sql, "params": list(params or [])}, idempotent)
+        return result[0].get("results", []) if result else []
+
+    def batch(self, statements, idempotent=None):
+        """(sql, params) 목록을 한 번의 요청으로 실행합니다. 문장별 결과 행 리스트를 반환합니다."""
+        if not statements:
+            return []
+        if idempotent is None:
+            idempotent = all(_READ.match(sql) for sql, _ in statements)
+        body = {"batch": [{"sql": sql, "params": list(params or [])} for sql, params in statements]}
+        return [r.get("results", []) for r in self._post(body, idempotent)]
+
+    def enqueue(self, sql, params=None):
+        """flush() 때 한 번에 보낼 문장을 쌓아 둡니다."""
+        self.pending.append((sql, params))
+
+    def flush(self):
+        """쌓아 둔 문장을 배치 1회로 전송합니다. 실패하면 대기열을 그대로 남겨 둡니다."""
+        if not self.pending:
+            return []
+        results = self.batch(self.pending)
+        self.pending = []
+        return results
+
+    def close(self):
+        self.session.close()
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
+    client = D1Client()
+    print(client.query("SELECT COUNT(*) AS count FROM posts"))
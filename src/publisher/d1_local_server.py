@@ -0,0 +1,116 @@
+"""
+Cloudflare D1 REST API(/accounts/{id}/d1/database/{id}/query)를 흉내 내는 로컬 SQLite 대역 서버.
+네트워크 없이 D1Client를 붙여 보거나 파이프라인을 리허설할 때 사용합니다.
+
+    python -m src.publisher.d1_local_server --db data/d1_local.db --port 8787
+    set D1_API_BASE=http://127.0.0.1:8787/client/v4
+"""
+import argparse
+import json
+import re
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.storage.migrations import split_statements
+
+SCHEMA_PATH = "schema.sql"
+QUERY_PATH = re.compile(r"^/client/v4/accounts/[^/]+/d1/database/[^/]+/query$")
+
+
+class LocalD1:
+    """D1 한 개에 해당하는 SQLite 파일. 배치는 D1처럼 하나의 트랜잭션으로 실행합니다."""
+
+    def __init__(self, db_path=":memory:", schema_path=SCHEMA_PATH):
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.lock = threading.Lock()
+        if schema_path:
+            with open(schema_path, encoding="utf-8") as f:
+                self.conn.executescript(f.read())
+
+    def _run(self, sql, params):
+        started = time.perf_counter()
+        changes_before = self.conn.total_changes
+        try:
+            cursor = self.conn.execute(sql, params)
+        except sqlite3.ProgrammingError:
+            # 파라미터 없는 다중 문장 (wrangler --command와 동일)
+            # executescript는 먼저 COMMIT해 배치 트랜잭션을 깨므로 한 문장씩 같은 트랜잭션 안에서 실행
+            if params:
+                raise
+            cursor = None
+            for statement in split_statements(sql):
+                cursor = self.conn.execute(statement)
+        rows = [dict(r) for r in cursor.fetchall()] if cursor and cursor.description else []
+        return {
+            "results": rows,
+            "success": True,
+            "meta": {
+                "changes": self.conn.total_changes - changes_before,
+                "last_row_id": cursor.lastrowid if cursor else None,
+                "rows_read": len(rows),
+                "duration": (time.perf_counter() - started) * 1000,
+            },
+        }
+
+    def execute(self, statements):
+        with self.lock:
+            self.conn.execute("BEGIN")
+            try:
+                results = [self._run(s["sql"], s.get("params") or []) for s in statements]
+                self.conn.execute("COMMIT")
+                return results
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+
+
+class _Handler(BaseHTTPRequestHandler):
+    d1 = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, body):
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        if not QUERY_PATH.match(self.path):
+            return self._reply(404, {"success": False, "errors": [{"code": 7003, "message": "No route"}]})
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+            statements = body["batch"] if "batch" in body else [body]
+            result = self.d1.execute(statements)
+        except Exception as e:
+            return self._reply(400, {"success": False, "errors": [{"code": 7500, "message": str(e)}], "result": []})
+        self._reply(200, {"success": True, "errors": [], "messages": [], "result": result})
+
+
+def start_local_server(db_path=":memory:", port=0, schema_path=SCHEMA_PATH):
+    """백그라운드 스레드로 대역 서버를 띄우고 (server, api_base)를 반환합니다."""
+    handler = type("D1Handler", (_Handler,), {"d1": LocalD1(db_path, schema_path)})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/client/v4"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="로컬 D1 대역 서버")
+    parser.add_argument("--db", default="data/d1_local.db")
+    parser.add_argument("--port", type=int, default=8787)
+    args = parser.parse_args()
+
+    server, api_base = start_local_server(args.db, args.port)
+    print(f"[+] 로컬 D1 대역 서버 가동: {api_base}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,154 @@
+"""
+썸네일/사이트맵을 git으로 배포하는 발행기.
+
+글마다 add/commit/push를 하면 실행 1번에 push가 최대 9번 일어나고, push마다 Cloudflare Pages가 다시 빌드되며
+파이프라인도 네트워크 push가 끝날 때까지 멈춥니다. 여기서는
+
+- 이번 실행에서 새로 만든 파일 경로만 모아 두었다가 (git add public/images/* 대신)
+- 실행 1번(또는 GIT_COMMIT_WINDOW초)마다 커밋 1개로 묶고
+- push는 백그라운드 스레드에서 보내며, 원격이 앞서 있어 거절되면 pull --rebase 후 다시 시도합니다.
+
+    python -m benchmarks.bench_git_publisher    # 로컬 bare 저장소로 글마다 push vs 묶음 push 비교
+"""
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# push가 이 문구와 함께 실패하면 원격에 새 커밋이 있는 것이라 rebase 후 다시 보냄
+_REJECTED = ("[rejected]", "non-fast-forward", "fetch first", "failed to push some refs")
+
+
+class GitError(Exception):
+    pass
+
+
+def run_git(args, cwd):
+    return subprocess.run(args, cwd=cwd, capture_output=True, text=True, encoding="utf-8", errors="replace")
+
+
+class GitPublisher:
+    def __init__(self, repo_dir=".", remote="origin", branch="main", window=None, max_push_attempts=3,
+                 retry_delay=2.0, runner=None):
+        self.repo_dir = repo_dir
+        self.remote = remote
+        self.branch = branch
+        # 0이면 실행마다 커밋. 데몬 모드에서 여러 실행을 커밋 1개로 묶고 싶을 때 늘림
+        self.window = window if window is not None else float(os.getenv("GIT_COMMIT_WINDOW", "0"))
+        self.max_push_attempts = max_push_attempts
+        self.retry_delay = retry_delay
+        self.runner = runner or run_git
+        self.staged = {}     # 경로 -> None (넣은 순서 유지)
+        self.labels = []
+        self.last_commit_at = 0.0
+        # 커밋과 백그라운드 push/rebase가 index를 동시에 건드리지 않도록
+        self.lock = threading.Lock()
+        self.pusher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="git-push")
+        self.push_future = None
+
+    def _git(self, *args, check=True):
+        result = self.runner(["git", *args], self.repo_dir)
+        if check and result.returncode != 0:
+            raise GitError(f"git {args[0]} 실패 ({result.returncode}): {(result.stderr or result.stdout).strip()[:300]}")
+        return result
+
+    # --- 커밋 ---
+
+    def stage(self, paths, label):
+        """다음 커밋에 넣을 파일 경로(저장소 기준 상대 경로)와 커밋 메시지에 적을 한 줄을 모아 둡니다."""
+        for path in paths:
+            self.staged[path.replace(os.sep, "/")] = None
+        if label:
+            self.labels.append(label)
+
+    def has_staged(self):
+        return bool(self.staged)
+
+    def due(self):
+        return time.time() - self.last_commit_at >= self.window
+
+    def commit(self):
+        """
+        모아 둔 경로만 커밋 1개로 만듭니다. (다른 변경이 index에 있어도 섞지 않음)
+        커밋한 sha를 반환하고, 이미 모두 커밋된 상태라 바뀐 게 없으면 None.
+        """
+        if not self.staged:
+            return None
+        paths = list(self.staged)
+        present = [p for p in paths if os.path.exists(os.path.join(self.repo_dir, p))]
+        missing = [p for p in paths if p not in present]
+        with self.lock:
+            if present:
+                self._git("add", "--", *present)
+            if missing:
+                # 지운 사이트맵 샤드 등
+                self._git("rm", "--cached", "--ignore-unmatch", "-q", "--", *missing)
+            changed = self._git("diff", "--cached", "--name-only", "-z", "--", *paths).stdout.split("\0")
+            changed = [p for p in changed if p]
+            if changed:
+                self._git("commit", "-m", self._message(), "--", *changed)
+                sha = self._git("rev-parse", "HEAD").stdout.strip()
+            else:
+                sha = None
+        self.staged, self.labels = {}, []
+        self.last_commit_at = time.time()
+        return sha
+
+    def _message(self):
+        images = sum(1 for label in self.labels if label.startswith("Image:"))
+        subject = f"Publish {images} post image(s)" if images else "Publish assets"
+        if any(label.startswith("Update sitemap") for label in self.labels):
+            subject += " and sitemap"
+        return subject + "\n\n" + "\n".join(f"- {label}" for label in self.labels)
+
+    # --- push ---
+
+    def unpushed(self):
+        """원격 브랜치보다 앞선 로컬 커밋 수 (원격 추적 브랜치가 없으면 0)"""
+        result = self._git("rev-list", "--count", f"{self.remote}/{self.branch}..HEAD", check=False)
+        return int(result.stdout.strip() or 0) if result.returncode == 0 else 0
+
+    def push(self):
+        """push하고, 원격이 앞서 있어 거절되면 pull --rebase 후 다시 보냅니다. 끝내 실패하면 GitError"""
+        error = None
+        for attempt in range(1, self.max_push_attempts + 1):
+            with self.lock:
+                result = self._git("push", self.remote, f"HEAD:{self.branch}", check=False)
+                if result.returncode == 0:
+                    return True
+                output = f"{result.stdout}\n{result.stderr}"
+                error = output.strip()[:300]
+                if any(marker in output for marker in _REJECTED):
+                    print(f"[*] git push 거절됨, 원격 변경을 rebase 후 다시 시도 ({attempt}/{self.max_push_attempts})")
+                    rebase = self._git("pull", "--rebase", "--autostash", self.remote, self.branch, check=False)
+                    if rebase.returncode != 0:
+                        self._git("rebase", "--abort", check=False)
+                        raise GitError(f"rebase 충돌, 직접 해결이 필요합니다: {(rebase.stderr or rebase.stdout).strip()[:300]}")
+                    continue
+            # 네트워크 오류 등은 잠시 쉬었다가 다시
+            if attempt < self.max_push_attempts:
+                time.sleep(self.retry_delay * 2 ** (attempt - 1))
+        raise GitError(f"git push {self.max_push_attempts}번 실패: {error}")
+
+    def push_async(self):
+        """백그라운드에서 push합니다. 앞선 push가 아직 진행 중이면 그 뒤에 이어서 보냅니다."""
+        def push():
+            try:
+                return self.push()
+            except Exception as e:
+                # 커밋은 로컬에 남아 다음 push 때 같이 올라감
+                print(f"[!] git push 실패: {e}")
+                return False
+        self.push_future = self.pusher.submit(push)
+        return self.push_future
+
+    def wait(self, timeout=None):
+        """진행 중인 push가 끝날 때까지 기다립니다. push 성공 여부 (보낼 게 없었으면 True)"""
+        if self.push_future is None:
+            return True
+        return self.push_future.result(timeout)
+
+    def close(self):
+        self.wait()
+        self.pusher.shutdown()
@@ -0,0 +1,187 @@
+"""
+D1 posts/stats 테이블의 로컬 읽기 전용 사본 (data/d1_mirror.db).
+id / updated_at 워터마크 이후의 행만 받아 오는 증분 동기화이며, 페이지마다 워터마크를 같이 커밋하므로
+도중에 끊겨도 다음 sync()가 이어서 받습니다.
+
+    python -m src.storage.d1_mirror          # 증분 동기화
+    python -m src.storage.d1_mirror --full   # 워터마크 초기화 후 전체 동기화
+"""
+import argparse
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+SCHEMA_PATH = "schema.sql"
+
+
+class D1Mirror:
+    """
+    sitemap / 중복 검사 / 통계 / 오프라인 도구가 원격 D1 대신 읽는 로컬 SQLite.
+    query()는 D1Client.query()와 같은 형태(dict 리스트)를 돌려주므로 그대로 바꿔 끼울 수 있습니다.
+    """
+
+    PAGE_SIZE = 500
+    # updated_at(UTC, 초 단위)이 이만큼 지난 수정은 더 늦게 커밋될 수 없다고 봄
+    SETTLE_SECONDS = 120
+
+    def __init__(self, client=None, db_path="data/d1_mirror.db", schema_path=SCHEMA_PATH, page_size=None):
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._client = client
+        self.page_size = page_size or self.PAGE_SIZE
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with open(schema_path, encoding="utf-8") as f:
+            self.conn.executescript(f.read())
+        self.conn.execute("""CREATE TABLE IF NOT EXISTS sync_state (
+            name TEXT PRIMARY KEY, last_id INTEGER DEFAULT 0, last_updated TEXT DEFAULT '', synced_at REAL)""")
+        self.conn.commit()
+
+    @property
+    def client(self):
+        if self._client is None:
+            from src.publisher.d1_client import D1Client
+            self._client = D1Client()
+        return self._client
+
+    # --- 로컬 읽기 ---
+
+    def query(self, sql, params=None):
+        with self.lock:
+            return [dict(r) for r in self.conn.execute(sql, list(params or [])).fetchall()]
+
+    # --- 동기화 ---
+
+    def _state(self, name):
+        row = self.conn.execute("SELECT last_id, last_updated FROM sync_state WHERE name = ?", (name,)).fetchone()
+        return (row["last_id"], row["last_updated"]) if row else (0, "")
+
+    def _add_missing_columns(self, table, columns):
+        """원격에만 있는 컬럼(새로 추가된 컬럼)을 로컬 테이블에도 붙입니다."""
+        local = {r["name"] for r in self.conn.execute(f"PRAGMA table_info({table})")}
+        for column in columns:
+            if column not in local:
+                self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {column}")
+
+    def _save_page(self, table, rows, name, last_id, last_updated):
+        """한 페이지의 행과 워터마크를 같은 트랜잭션으로 기록합니다."""
+        columns = list(rows[0].keys())
+        with self.lock, self.conn:
+            self._add_missing_columns(table, columns)
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                [tuple(row[c] for c in columns) for row in rows]
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sync_state (name, last_id, last_updated, synced_at) VALUES (?, ?, ?, ?)",
+                (name, last_id, last_updated, time.time())
+            )
+
+    def _pull_new(self, table):
+        """id 워터마크 이후에 추가된 행을 페이지 단위로 받습니다."""
+        name = f"{table}:id"
+        last_id, _ = self._state(name)
+        pulled = 0
+        while True:
+            rows = self.client.query(f"SELECT * FROM {table} WHERE id > ? ORDER BY id LIMIT ?", (last_id, self.page_size))
+            if not rows:
+                return pulled
+            last_id = rows[-1]["id"]
+            self._save_page(table, rows, name, last_id, "")
+            pulled += len(rows)
+            if len(rows) < self.page_size:
+                return pulled
+
+    def _changed_cursor(self, table):
+        """
+        수정분 조회를 시작할 (updated_at, id) 커서.
+        updated_at은 초 단위라 같은 초에 나중에 커밋된 수정이 있을 수 있어, 워터마크가 최근이면 그 초를 처음부터 다시 읽습니다.
+        """
+        cursor_id, last_updated = self._state(f"{table}:updated_at")
+        settled = (datetime.now(timezone.utc) - timedelta(seconds=self.SETTLE_SECONDS)).strftime("%Y-%m-%d %H:%M:%S")
+        return last_updated, (cursor_id if last_updated < settled else 0)
+
+    def _pull_changed(self, table):
+        """이미 받은 행(id 워터마크 이하) 중 updated_at 워터마크 이후에 수정된 행을 받습니다."""
+        name = f"{table}:updated_at"
+        max_id, _ = self._state(f"{table}:id")
+        last_updated, cursor_id = self._changed_cursor(table)
+        pulled = 0
+        while max_id:
+            rows = self.client.query(
+                f"SELECT * FROM {table} WHERE id <= ? AND (updated_at > ? OR (updated_at = ? AND id > ?)) "
+                f"ORDER BY updated_at, id LIMIT ?",
+                (max_id, last_updated, last_updated, cursor_id, self.page_size)
+            )
+            if not rows:
+                break
+            last_updated, cursor_id = rows[-1]["updated_at"], rows[-1]["id"]
+            self._save_page(table, rows, name, cursor_id, last_updated)
+            pulled += len(rows)
+            if len(rows) < self.page_size:
+                break
+        return pulled
+
+    def _advance_updated_watermark(self, table):
+        """새로 받은 행까지 포함해 updated_at 커서를 로컬 최댓값으로 올립니다 (다음 sync에서 새 행을 다시 받지 않도록)."""
+        with self.lock, self.conn:
+            row = self.conn.execute(
+                f"SELECT updated_at, id FROM {table} WHERE updated_at IS NOT NULL ORDER BY updated_at DESC, id DESC LIMIT 1"
+            ).fetchone()
+            cursor_id, last_updated = self._state(f"{table}:updated_at")
+            if row and (row["updated_at"], row["id"]) > (last_updated, cursor_id):
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO sync_state (name, last_id, last_updated, synced_at) VALUES (?, ?, ?, ?)",
+                    (f"{table}:updated_at", row["id"], row["updated_at"], time.time())
+                )
+
+    def _prune_deleted(self, table):
+        """원격보다 로컬 행이 많을 때만 id 목록을 비교해 삭제된 행을 지웁니다."""
+        remote = self.client.query(f"SELECT COUNT(*) AS count FROM {table}")[0]["count"]
+        local = self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        if local <= remote:
+            return 0
+        remote_ids = {r["id"] for r in self.client.query(f"SELECT id FROM {table}")}
+        local_ids = {r[0] for r in self.conn.execute(f"SELECT id FROM {table}")}
+        stale = [(i,) for i in local_ids - remote_ids]
+        with self.lock, self.conn:
+            self.conn.executemany(f"DELETE FROM {table} WHERE id = ?", stale)
+        return len(stale)
+
+    def sync(self, prune=True):
+        """posts는 추가/수정/삭제, stats는 추가분만 (로그성 테이블) 받아 옵니다. 테이블별 받은 행 수를 반환합니다."""
+        # 수정분을 먼저 받고(기존 행만) 새 행을 받은 뒤 워터마크를 올려야 새 행을 두 번 받지 않음
+        counts = {"posts": self._pull_changed("posts") + self._pull_new("posts")}
+        self._advance_updated_watermark("posts")
+        counts["stats"] = self._pull_new("stats")
+        if prune:
+            counts["posts_deleted"] = self._prune_deleted("posts")
+        return counts
+
+    def reset(self):
+        """워터마크를 지워 다음 sync()가 처음부터 다시 받게 합니다."""
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM sync_state")
+
+    def close(self):
+        self.conn.close()
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="D1 posts/stats 로컬 사본 동기화")
+    parser.add_argument("--full", action="store_true", help="워터마크를 초기화하고 처음부터 받기")
+    args = parser.parse_args()
+
+    mirror = D1Mirror()
+    if args.full:
+        mirror.reset()
+    started = time.perf_counter()
+    print(f"[+] 동기화 완료 {mirror.sync()} ({time.perf_counter() - started:.2f}s)")
+    mirror.close()
@@ -0,0 +1,233 @@
+"""
+번호 붙은 스키마 마이그레이션 (migrations/d1, migrations/local, migrations/cache, migrations/painter).
+
+- 파일 이름은 NNNN_설명.sql 또는 NNNN_설명.py. 번호 순으로 아직 적용하지 않은 것만 실행합니다.
+- .sql은 문장 전체와 적용 기록을 한 트랜잭션으로 실행합니다. (D1은 배치 1회, SQLite는 BEGIN/COMMIT)
+- .py는 up(db)를 부르고 끝나면 기록합니다. 조건부 변경(이미 있을 수 있는 컬럼 추가 등)용이라 여러 번 돌아도 안전하게 씁니다.
+- 적용한 번호/이름/체크섬은 대상 DB의 schema_migrations에 남고, 적용 뒤에 파일이 바뀌면 경고합니다.
+
+대상은 네 곳입니다.
+- d1: Cloudflare D1 (사이트 posts/stats). schema.sql은 모든 마이그레이션을 적용한 최신 스키마를 그대로 유지합니다.
+- local: data/gtb_storage.db (처리 이력, post_jobs, 실행 기록, 쿼터 등. 테이블을 쓰는 클래스가 연결을 열 때 자동 적용)
+- cache: data/http_cache.db, data/cache.db (HttpCache / TTLCache가 열 때 자동 적용)
+- painter: data/painter_queue.db (렌더 큐와 서비스 생존 신호. RenderQueue가 열 때 자동 적용)
+
+    python -m src.storage.migrations --status             # 대상별 적용/대기 목록
+    python -m src.storage.migrations --dry-run            # 실행할 문장만 출력
+    python -m src.storage.migrations --target d1          # D1에만 적용
+"""
+import argparse
+import hashlib
+import importlib.util
+import os
+import re
+import sqlite3
+import threading
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "migrations")
+DIRECTORIES = {name: os.path.join(ROOT, name) for name in ("d1", "local", "cache", "painter")}
+TABLE = "schema_migrations"
+_NAME = re.compile(r"^(\d{4})_(\w+)\.(sql|py)$")
+
+
+class MigrationError(Exception):
+    pass
+
+
+def split_statements(sql):
+    """세미콜론으로 문장을 나눕니다. 문자열/주석/트리거 안의 세미콜론은 sqlite3.complete_statement로 걸러 냄"""
+    statements, buffer = [], ""
+    for part in sql.split(";"):
+        buffer += part + ";"
+        if sqlite3.complete_statement(buffer):
+            # 주석만 있는 조각은 버림
+            code = "\n".join(line for line in buffer.splitlines() if not line.strip().startswith("--"))
+            if code.strip(" \n;"):
+                statements.append(buffer.strip())
+            buffer = ""
+    if buffer.strip(" \n;"):
+        raise MigrationError(f"끝나지 않은 SQL 문장: {buffer.strip()[:80]}")
+    return statements
+
+
+class Migration:
+    def __init__(self, path):
+        match = _NAME.match(os.path.basename(path))
+        if not match:
+            raise MigrationError(f"마이그레이션 파일 이름은 NNNN_설명.sql|py 형식이어야 합니다: {path}")
+        self.version = int(match.group(1))
+        self.name = os.path.basename(path)
+        self.kind = match.group(3)
+        self.path = path
+        with open(path, "rb") as f:
+            source = f.read()
+        self.source = source.decode("utf-8")
+        self.checksum = hashlib.sha256(source).hexdigest()[:16]
+
+    def statements(self):
+        return split_statements(self.source) if self.kind == "sql" else []
+
+    def describe(self):
+        """드라이런 출력용: SQL 문장 목록 또는 .py의 설명 한 줄"""
+        if self.kind == "sql":
+            return self.statements()
+        module = self._load()
+        return [f"up(db): {(module.__doc__ or '').strip().splitlines()[0] if module.__doc__ else self.name}"]
+
+    def _load(self):
+        spec = importlib.util.spec_from_file_location(f"migration_{self.version:04d}", self.path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    def run(self, db):
+        self._load().up(db)
+
+
+def discover(directory):
+    migrations = [Migration(os.path.join(directory, name)) for name in sorted(os.listdir(directory))
+                  if _NAME.match(name)]
+    seen = {}
+    for migration in migrations:
+        if migration.version in seen:
+            raise MigrationError(f"같은 번호의 마이그레이션: {seen[migration.version]}, {migration.name}")
+        seen[migration.version] = migration.name
+    return migrations
+
+
+class SQLiteTarget:
+    """로컬 SQLite 연결 (gtb_storage.db, 미러, 테스트용 대역)"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def query(self, sql, params=None):
+        cursor = self.conn.execute(sql, list(params or []))
+        if cursor.description is None:
+            return []
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def batch(self, statements):
+        """문장들을 한 트랜잭션으로 실행합니다. (D1 배치와 같은 의미)"""
+        if self.conn.in_transaction:
+            self.conn.commit()
+        self.conn.execute("BEGIN")
+        try:
+            results = [self.query(sql, params) for sql, params in statements]
+        except Exception:
+            self.conn.rollback()
+            raise
+        self.conn.commit()
+        return results
+
+
+class MigrationRunner:
+    def __init__(self, db, directory):
+        # db: SQLiteTarget 또는 D1Client (query/batch)
+        self.db = db
+        self.directory = directory
+        self.migrations = discover(directory)
+
+    def applied(self):
+        """{번호: {"name", "checksum", "applied_at"}}"""
+        self.db.query(f"CREATE TABLE IF NOT EXISTS {TABLE} (version INTEGER PRIMARY KEY, name TEXT NOT NULL, "
+                      f"checksum TEXT, applied_at TEXT DEFAULT CURRENT_TIMESTAMP)")
+        return {r["version"]: r for r in self.db.query(f"SELECT version, name, checksum, applied_at FROM {TABLE}")}
+
+    def pending(self, applied=None):
+        applied = self.applied() if applied is None else applied
+        for migration in self.migrations:
+            record = applied.get(migration.version)
+            if record and record["checksum"] != migration.checksum:
+                print(f"[!] {migration.name}: 적용한 뒤에 파일이 바뀌었습니다. (바꾸지 말고 새 번호로 추가하세요)")
+        return [m for m in self.migrations if m.version not in applied]
+
+    def _record(self, migration):
+        return (f"INSERT INTO {TABLE} (version, name, checksum) VALUES (?, ?, ?)",
+                (migration.version, migration.name, migration.checksum))
+
+    def migrate(self, dry_run=False, quiet=False):
+        """대기 중인 마이그레이션을 번호 순으로 적용하고 적용한(dry_run이면 적용할) 목록을 반환합니다."""
+        pending = self.pending()
+        for migration in pending:
+            if dry_run:
+                print(f"[dry-run] {migration.name}")
+                for statement in migration.describe():
+                    print("    " + statement.replace("\n", "\n    ") + (";" if migration.kind == "sql" else ""))
+                continue
+            if not quiet:
+                print(f"[*] 마이그레이션 적용: {migration.name}")
+            try:
+                if migration.kind == "sql":
+                    self.db.batch([(statement, None) for statement in migration.statements()] + [self._record(migration)])
+                else:
+                    migration.run(self.db)
+                    self.db.batch([self._record(migration)])
+            except Exception as e:
+                raise MigrationError(f"{migration.name} 적용 실패: {e}") from e
+        return pending
+
+    def status(self):
+        applied = self.applied()
+        lines = []
+        for migration in self.migrations:
+            record = applied.get(migration.version)
+            state = f"적용됨 {record['applied_at']}" if record else "대기"
+            if record and record["checksum"] != migration.checksum:
+                state += " (파일 변경됨)"
+            lines.append(f"  {migration.name:<40}{state}")
+        return "\n".join(lines)
+
+
+_migrated = set()
+_migrate_lock = threading.Lock()
+
+
+def migrate_local(conn, target="local", quiet=True):
+    """
+    로컬 SQLite 연결에 target 마이그레이션을 적용합니다. (테이블을 쓰는 클래스가 연결을 열 때)
+    같은 파일은 프로세스에서 한 번만 확인하고, 동시에 여러 스레드가 열어도 한 번만 적용합니다.
+    """
+    path = next((r[2] for r in conn.execute("PRAGMA database_list") if r[1] == "main"), "")
+    # 같은 경로에 새로 만든 파일(테스트/벤치의 임시 DB)은 다시 확인하도록 inode도 키에 넣음
+    key = (os.path.realpath(path), os.stat(path).st_ino, target) if path else None
+    with _migrate_lock:
+        if key in _migrated:
+            return []
+        applied = MigrationRunner(SQLiteTarget(conn), DIRECTORIES[target]).migrate(quiet=quiet)
+        if key:
+            _migrated.add(key)
+    return applied
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="스키마 마이그레이션")
+    parser.add_argument("--target", choices=("all", "local", "d1"), default="all")
+    parser.add_argument("--db", default="data/gtb_storage.db", help="local 대상 SQLite 파일")
+    parser.add_argument("--dry-run", action="store_true", help="적용하지 않고 실행할 문장만 출력")
+    parser.add_argument("--status", action="store_true", help="적용/대기 목록만 출력")
+    args = parser.parse_args()
+
+    targets = ("local", "d1") if args.target == "all" else (args.target,)
+    for target in targets:
+        if target == "local":
+            if os.path.dirname(args.db):
+                os.makedirs(os.path.dirname(args.db), exist_ok=True)
+            db = SQLiteTarget(sqlite3.connect(args.db))
+        else:
+            from src.publisher.d1_client import D1Client
+            db = D1Client()
+        runner = MigrationRunner(db, DIRECTORIES[target])
+        print(f"[{target}]")
+        if args.status:
+            print(runner.status())
+            continue
+        done = runner.migrate(dry_run=args.dry_run)
+        if not done:
+            print("  적용할 마이그레이션이 없습니다.")
+        elif not args.dry_run:
+            print(f"[+] {len(done)}개 적용 완료")
@@ -0,0 +1,189 @@
+"""
+선정된 글 1개를 발행까지 끌고 가는 단계별 체크포인트 (gtb_storage.db의 post_jobs).
+
+    selected → searched → written → painted → affiliated → published → committed
+
+단계마다 결과물(검색 요약, Claude 파싱 결과, 이미지 URL, 쿠팡 상품, slug)을 저장해 두고,
+중간에 실패하면 다음 실행이 마지막으로 끝낸 단계 다음부터 이어서 진행합니다. (이미 돈을 쓴 Claude/FLUX는 다시 부르지 않음)
+실패한 단계는 backoff × 2^(시도-1)초 뒤에 다시 시도하고 max_attempts번 연속 실패하면 failed로 멈춥니다.
+
+    python -m src.storage.post_jobs              # 끝나지 않은 글 목록
+    python -m src.storage.post_jobs --retry ID   # failed 글을 다시 시도 대상으로
+"""
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from src.storage.migrations import migrate_local
+
+STAGES = ("selected", "searched", "written", "painted", "affiliated", "published", "committed")
+# 단계별로 채워져야 하는 컬럼 (selected는 post 자체)
+_STAGE_COLUMNS = {
+    "searched": "trends",
+    "written": "parsed",
+    "painted": "image_url",
+    "affiliated": "coupang",
+    "published": "slug",
+    "committed": "committed_at",
+}
+_JSON_COLUMNS = ("post", "trends", "parsed", "coupang")
+
+
+class PostJobs:
+    def __init__(self, db_path="data/gtb_storage.db", max_attempts=3, backoff=300):
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        migrate_local(self.conn)
+
+    @staticmethod
+    def _now():
+        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    @staticmethod
+    def _job(row):
+        job = dict(row)
+        for column in _JSON_COLUMNS:
+            job[column] = json.loads(job[column]) if job[column] is not None else None
+        # trends는 검색을 건너뛴 경우 None이 정상값이라 '검색함' 여부를 따로 둠
+        job["searched"] = row["trends"] is not None
+        return job
+
+    def _stage(self, row):
+        """결과물이 빈틈없이 채워진 마지막 단계. (쿠팡이 썸네일보다 먼저 끝나도 단계는 순서대로만 올라감)"""
+        stage = "selected"
+        for name in STAGES[1:]:
+            if row[_STAGE_COLUMNS[name]] is None:
+                break
+            stage = name
+        return stage
+
+    def get(self, reddit_id):
+        with self.lock:
+            row = self.conn.execute("SELECT * FROM post_jobs WHERE reddit_id = ?", (reddit_id,)).fetchone()
+        return self._job(row) if row else None
+
+    def select(self, sub, post):
+        """Gemini가 고른 글을 selected로 기록하고 job을 반환합니다. 이미 있으면 기존 job 그대로"""
+        now = self._now()
+        with self.lock:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO post_jobs (reddit_id, sub, post, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                    (post['id'], sub, json.dumps(post, ensure_ascii=False), now, now)
+                )
+        return self.get(post['id'])
+
+    def save(self, reddit_id, **artifacts):
+        """
+        단계 결과물(trends, parsed, image_url, coupang, slug, committed_at)을 저장하고 갱신된 job을 반환합니다.
+        단계가 올라가면 재시도 횟수를 초기화합니다.
+        """
+        unknown = set(artifacts) - set(_STAGE_COLUMNS.values())
+        if unknown:
+            raise ValueError(f"알 수 없는 단계 결과물: {', '.join(sorted(unknown))}")
+        values = {k: json.dumps(v, ensure_ascii=False) if k in _JSON_COLUMNS else v for k, v in artifacts.items()}
+        with self.lock:
+            with self.conn:
+                if values:
+                    assignments = ", ".join(f"{k} = ?" for k in values)
+                    self.conn.execute(f"UPDATE post_jobs SET {assignments} WHERE reddit_id = ?",
+                                      (*values.values(), reddit_id))
+                row = self.conn.execute("SELECT * FROM post_jobs WHERE reddit_id = ?", (reddit_id,)).fetchone()
+                if row is None:
+                    raise KeyError(reddit_id)
+                stage = self._stage(row)
+                if stage != row["stage"]:
+                    self.conn.execute(
+                        "UPDATE post_jobs SET stage = ?, status = 'active', attempts = 0, next_attempt_at = 0, "
+                        "error = NULL, updated_at = ? WHERE reddit_id = ?",
+                        (stage, self._now(), reddit_id)
+                    )
+                    row = self.conn.execute("SELECT * FROM post_jobs WHERE reddit_id = ?", (reddit_id,)).fetchone()
+        return self._job(row)
+
+    def fail(self, reddit_id, error):
+        """현재 단계 실패를 기록하고 다음 시도 시각을 뒤로 미룹니다. max_attempts번째 실패면 failed로 멈춥니다."""
+        with self.lock:
+            with self.conn:
+                row = self.conn.execute("SELECT attempts, stage FROM post_jobs WHERE reddit_id = ?", (reddit_id,)).fetchone()
+                if row is None:
+                    return
+                attempts = row["attempts"] + 1
+                status = "failed" if attempts >= self.max_attempts else "active"
+                next_attempt_at = time.time() + self.backoff * 2 ** (attempts - 1)
+                self.conn.execute(
+                    "UPDATE post_jobs SET attempts = ?, status = ?, next_attempt_at = ?, error = ?, updated_at = ? "
+                    "WHERE reddit_id = ?",
+                    (attempts, status, next_attempt_at, str(error)[:500], self._now(), reddit_id)
+                )
+        if status == "failed":
+            print(f"[!] {reddit_id}: '{row['stage']}' 다음 단계가 {attempts}번 실패해 중단합니다. (--retry로 재개)")
+        else:
+            print(f"[!] {reddit_id}: '{row['stage']}' 다음 단계 실패 ({attempts}/{self.max_attempts}), "
+                  f"{self.backoff * 2 ** (attempts - 1)}초 뒤 재시도: {error}")
+
+    def resumable(self, now=None):
+        """다시 시도할 때가 된, 끝나지 않은 job 목록 (오래된 순)"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT * FROM post_jobs WHERE status = 'active' AND stage != 'committed' AND next_attempt_at <= ? "
+                "ORDER BY created_at",
+                (time.time() if now is None else now,)
+            ).fetchall()
+        return [self._job(r) for r in rows]
+
+    def filter_new(self, reddit_ids):
+        """job이 없는 ID만 원래 순서대로 반환합니다. (진행 중인 글이 다시 후보로 뽑히지 않도록)"""
+        reddit_ids = list(reddit_ids)
+        known = set()
+        with self.lock:
+            for i in range(0, len(reddit_ids), 900):
+                chunk = reddit_ids[i:i + 900]
+                rows = self.conn.execute(
+                    f"SELECT reddit_id FROM post_jobs WHERE reddit_id IN ({','.join('?' * len(chunk))})", chunk)
+                known.update(r[0] for r in rows)
+        return [i for i in reddit_ids if i not in known]
+
+    def retry(self, reddit_id):
+        with self.lock:
+            with self.conn:
+                return self.conn.execute(
+                    "UPDATE post_jobs SET status = 'active', attempts = 0, next_attempt_at = 0 WHERE reddit_id = ?",
+                    (reddit_id,)
+                ).rowcount
+
+    def open_jobs(self):
+        with self.lock:
+            return self.conn.execute(
+                "SELECT reddit_id, sub, stage, status, attempts, error, updated_at FROM post_jobs "
+                "WHERE stage != 'committed' ORDER BY created_at"
+            ).fetchall()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="글 단계별 체크포인트")
+    parser.add_argument("--db", default="data/gtb_storage.db")
+    parser.add_argument("--retry", metavar="REDDIT_ID", help="failed로 멈춘 글을 다음 실행에서 다시 시도")
+    args = parser.parse_args()
+
+    jobs = PostJobs(args.db)
+    if args.retry:
+        print(f"[+] 재시도 예약: {args.retry}" if jobs.retry(args.retry) else f"[!] 없는 글: {args.retry}")
+    for row in jobs.open_jobs():
+        print(f"{row['reddit_id']:<24}{row['sub'] or '':<20}{row['stage']:<12}{row['status']:<8}"
+              f"시도 {row['attempts']}  {row['updated_at']}  {row['error'] or ''}")
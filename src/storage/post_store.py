@@ -0,0 +1,141 @@
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from src.storage.migrations import migrate_local
+
+
+class BloomFilter:
+    """처리 완료 ID가 많아졌을 때 set 대신 쓰는 고정 크기 블룸 필터 (오탐률 약 1%)"""
+
+    def __init__(self, capacity, error_rate=0.01):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, int(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    @classmethod
+    def from_bytes(cls, size, hash_count, bits):
+        bloom = cls.__new__(cls)
+        bloom.size, bloom.hash_count, bloom.bits = size, hash_count, bytearray(bits)
+        return bloom
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, key):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class PostStore:
+    """
+    gtb_storage.db의 posts(처리 이력) 테이블 접근 계층.
+    실행 내내 WAL 모드 연결 1개를 유지하고, 처리된 reddit_id를 메모리 인덱스로 올려 둡니다.
+    """
+
+    # 이 개수를 넘으면 set 대신 블룸 필터 + DB 확인으로 전환
+    BLOOM_THRESHOLD = 200_000
+    # SQLite 바인딩 변수 한도(기본 999) 아래로 IN (...) 쿼리를 나눔
+    IN_CHUNK = 900
+
+    def __init__(self, db_path="data/gtb_storage.db", bloom_threshold=None):
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.db_path = db_path
+        self.bloom_threshold = bloom_threshold or self.BLOOM_THRESHOLD
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        # posts / posts_bloom 테이블은 migrations/local이 만듦
+        migrate_local(self.conn)
+        self._load_index()
+
+    def _load_index(self):
+        count = self.conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+        if count < self.bloom_threshold:
+            self.ids = {r[0] for r in self.conn.execute("SELECT reddit_id FROM posts")}
+            self.bloom = None
+            return
+
+        self.ids = None
+        saved = self.conn.execute("SELECT row_count, size, hash_count, bits FROM posts_bloom WHERE id = 1").fetchone()
+        if saved and saved[0] == count:
+            # 저장해 둔 필터가 최신이면 100만 건을 다시 해싱하지 않음
+            self.bloom = BloomFilter.from_bytes(saved[1], saved[2], saved[3])
+            return
+
+        self.bloom = BloomFilter(count * 2)
+        for (reddit_id,) in self.conn.execute("SELECT reddit_id FROM posts"):
+            self.bloom.add(reddit_id)
+        with self.conn:
+            self._save_bloom(count)
+
+    def _save_bloom(self, row_count):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO posts_bloom (id, row_count, size, hash_count, bits) VALUES (1, ?, ?, ?, ?)",
+            (row_count, self.bloom.size, self.bloom.hash_count, bytes(self.bloom.bits))
+        )
+
+    def _query_existing(self, ids):
+        found = set()
+        for i in range(0, len(ids), self.IN_CHUNK):
+            chunk = ids[i:i + self.IN_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(f"SELECT reddit_id FROM posts WHERE reddit_id IN ({placeholders})", chunk)
+            found.update(r[0] for r in rows)
+        return found
+
+    def is_processed(self, reddit_id):
+        return not self.filter_unprocessed([reddit_id])
+
+    def filter_unprocessed(self, reddit_ids):
+        """아직 처리하지 않은 ID만 원래 순서대로 반환합니다. 블룸 필터 모드에서는 양성만 IN 쿼리 1회로 확인합니다."""
+        with self.lock:
+            if self.ids is not None:
+                return [i for i in reddit_ids if i not in self.ids]
+            maybe = [i for i in reddit_ids if i in self.bloom]
+            existing = self._query_existing(maybe) if maybe else set()
+            return [i for i in reddit_ids if i not in existing]
+
+    def mark_processed_many(self, rows):
+        """(reddit_id, title, file_path) 목록을 트랜잭션 1개로 기록합니다."""
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        rows = [(reddit_id, title, now, file_path) for reddit_id, title, file_path in rows]
+        if not rows:
+            return
+        with self.lock:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO posts (reddit_id, title, processed_date, file_path) VALUES (?, ?, ?, ?)",
+                    rows
+                )
+                for reddit_id, *_ in rows:
+                    if self.ids is not None:
+                        self.ids.add(reddit_id)
+                    else:
+                        self.bloom.add(reddit_id)
+                if self.bloom is not None:
+                    self._save_bloom(self.conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0])
+
+    def mark_processed(self, reddit_id, title, file_path):
+        self.mark_processed_many([(reddit_id, title, file_path)])
+
+    def titles(self):
+        """(reddit_id, 발행 제목) 전체 목록"""
+        with self.lock:
+            return self.conn.execute("SELECT reddit_id, title FROM posts WHERE title IS NOT NULL").fetchall()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
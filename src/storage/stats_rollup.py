@@ -0,0 +1,126 @@
+"""
+D1 stats(방문/클릭 원본 이벤트)를 일별 집계 stats_daily로 모으고 오래된 원본을 지우는 작업.
+
+- id 워터마크(rollup_state) 이후의 원본만 batch_size개 id 구간씩 집계합니다.
+  집계 UPSERT와 워터마크 갱신을 D1 배치 1회(한 트랜잭션)로 보내고, 워터마크가 읽은 값 그대로일 때만 반영되므로
+  도중에 끊기거나 두 곳에서 동시에 돌려도 두 번 세지 않습니다.
+- 집계가 끝난(워터마크 이하) 원본 중 retention_days가 지난 행은 batch_size개씩 나눠 지웁니다.
+- 날짜는 한국 시간 기준 (created_at은 UTC)
+- 글별 인기(최근 days일 방문/클릭)는 Gemini 주제 선정에 참고 자료로 넘깁니다. (GTBManager.reader_interest)
+
+admin / popular 페이지는 stats_daily + 워터마크 이후의 원본만 읽습니다.
+두 테이블은 D1 마이그레이션(migrations/d1/0003_stats_rollup.sql)이 만듭니다.
+
+    python -m src.storage.stats_rollup                  # 집계 + 오래된 원본 정리
+    python -m src.storage.stats_rollup --no-prune --batch 2000
+"""
+import argparse
+import os
+import time
+
+STATE_NAME = "stats"
+# created_at(UTC)을 한국 날짜로
+LOCAL_DATE = "date(created_at, '+9 hours')"
+
+
+class StatsRollup:
+    def __init__(self, db, batch_size=5000, retention_days=None):
+        # db: D1Client 또는 같은 query/batch를 가진 객체
+        self.db = db
+        self.batch_size = batch_size
+        self.retention_days = retention_days if retention_days is not None else int(os.getenv("STATS_RETENTION_DAYS", "30"))
+
+    def watermark(self):
+        rows = self.db.query("SELECT last_id FROM rollup_state WHERE name = ?", (STATE_NAME,))
+        return rows[0]["last_id"] if rows else 0
+
+    def rollup(self):
+        """워터마크 이후의 원본을 모두 집계합니다. 집계한 원본 행 수를 반환합니다."""
+        self.db.query("INSERT OR IGNORE INTO rollup_state (name, last_id) VALUES (?, 0)", (STATE_NAME,), idempotent=True)
+        max_id = self.db.query("SELECT COALESCE(MAX(id), 0) AS max_id FROM stats")[0]["max_id"]
+        last_id = self.watermark()
+        rolled = 0
+        while last_id < max_id:
+            upto = min(max_id, last_id + self.batch_size)
+            counted, _, applied = self.db.batch([
+                ("SELECT COUNT(*) AS count FROM stats WHERE id > ? AND id <= ?", (last_id, upto)),
+                (f"INSERT INTO stats_daily (date, type, path, label, count) "
+                 f"SELECT {LOCAL_DATE}, type, COALESCE(path, ''), COALESCE(label, ''), COUNT(*) FROM stats "
+                 f"WHERE id > ? AND id <= ? AND (SELECT last_id FROM rollup_state WHERE name = ?) = ? "
+                 f"GROUP BY 1, 2, 3, 4 "
+                 f"ON CONFLICT (date, type, path, label) DO UPDATE SET count = count + excluded.count",
+                 (last_id, upto, STATE_NAME, last_id)),
+                ("UPDATE rollup_state SET last_id = ?, updated_at = CURRENT_TIMESTAMP WHERE name = ? AND last_id = ? "
+                 "RETURNING last_id", (upto, STATE_NAME, last_id)),
+            ], idempotent=True)  # 워터마크 조건 때문에 다시 보내도 두 번 세지 않음
+            if not applied:
+                # 다른 실행이 먼저 이 구간을 집계함. 그쪽 워터마크부터 이어서
+                last_id = self.watermark()
+                continue
+            last_id = upto
+            rolled += counted[0]["count"]
+        return rolled
+
+    def prune(self):
+        """집계가 끝났고 retention_days가 지난 원본을 batch_size개씩 지웁니다. 지운 행 수를 반환합니다."""
+        if self.retention_days <= 0:
+            return 0
+        cutoff = f"-{self.retention_days} days"
+        last_id = self.watermark()
+        deleted = 0
+        while True:
+            rows = self.db.query(
+                "SELECT id FROM stats WHERE id <= ? AND created_at < datetime('now', ?) ORDER BY id LIMIT ?",
+                (last_id, cutoff, self.batch_size)
+            )
+            if not rows:
+                return deleted
+            # 이 페이지의 마지막 id까지만 지우므로 한 번에 batch_size개를 넘지 않음
+            self.db.query("DELETE FROM stats WHERE id <= ? AND created_at < datetime('now', ?)", (rows[-1]["id"], cutoff),
+                          idempotent=True)
+            deleted += len(rows)
+            if len(rows) < self.batch_size:
+                return deleted
+
+    def popularity(self, days=30, per_category=3):
+        """
+        최근 days일 방문이 많은 글을 카테고리별로 per_category개씩.
+        {category: [{"title", "visits", "clicks"}]} (집계 전의 최근 원본은 빠지므로 대략적인 값)
+        """
+        rows = self.db.query(
+            "SELECT p.category, p.title, "
+            "SUM(CASE WHEN d.type = 'visit' THEN d.count ELSE 0 END) AS visits, "
+            "SUM(CASE WHEN d.type = 'click' THEN d.count ELSE 0 END) AS clicks "
+            "FROM stats_daily d JOIN posts p ON d.path = '/blog/' || p.slug "
+            f"WHERE d.date >= date('now', '+9 hours', ?) GROUP BY p.id ORDER BY visits DESC, clicks DESC",
+            (f"-{days} days",)
+        )
+        interest = {}
+        for row in rows:
+            top = interest.setdefault(row["category"] or "인사이트", [])
+            if len(top) < per_category and row["visits"]:
+                top.append({"title": row["title"], "visits": row["visits"], "clicks": row["clicks"]})
+        return interest
+
+    def run(self, prune=True):
+        started = time.perf_counter()
+        rolled = self.rollup()
+        deleted = self.prune() if prune else 0
+        print(f"[+] 통계 집계 {rolled}건, 오래된 원본 정리 {deleted}건 ({time.perf_counter() - started:.1f}s)")
+        return rolled, deleted
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
+    from src.publisher.d1_client import D1Client
+
+    parser = argparse.ArgumentParser(description="stats → stats_daily 집계 및 원본 정리")
+    parser.add_argument("--batch", type=int, default=5000, help="한 번에 집계/삭제할 원본 id 구간 크기")
+    parser.add_argument("--retention-days", type=int, help="집계 후 원본을 남겨 둘 기간 (기본 STATS_RETENTION_DAYS=30)")
+    parser.add_argument("--no-prune", action="store_true", help="집계만 하고 원본은 지우지 않음")
+    args = parser.parse_args()
+
+    client = D1Client()
+    StatsRollup(client, args.batch, args.retention_days).run(prune=not args.no_prune)
+    client.close()
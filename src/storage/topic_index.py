@@ -0,0 +1,229 @@
+"""
+이미 다룬 주제와 거의 같은 후보를 찾는 유사도 인덱스 (MinHash + LSH, 글자 n-gram shingle).
+
+같은 기사가 여러 매체/서브레딧에 올라오면 reddit_id가 달라 정확 일치 중복 검사(PostStore)를 통과하고
+Gemini + Claude + FLUX 비용을 다시 씁니다. 여기서는 다음 두 종류의 문서를 색인합니다.
+
+    source: 수집한 원문 제목 (Gemini 순위 선정 전에 후보를 거름)
+    pair:   비교 대상 "A | B" (정렬해서 B vs A도 같은 글로 봄, Claude 작성 전에 거름)
+    summary: 발행한 글의 한국어 요약 (Claude 작성 뒤에야 생기므로 실행 중 거르지는 않고 --query로 조회)
+
+    python -m src.storage.topic_index --rebuild    # 처리 이력 + D1 로컬 사본 제목으로 pair 색인 재구성
+    python -m src.storage.topic_index --query "Magnesium glycinate vs citrate for sleep?"
+"""
+import argparse
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from array import array
+from datetime import datetime
+from functools import lru_cache
+
+from src.storage.migrations import migrate_local
+
+KINDS = ("source", "pair", "summary")
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def normalize(text):
+    """NFKC + 소문자 + 구두점 제거 + 공백 정리"""
+    text = unicodedata.normalize("NFKC", text or "").casefold()
+    return " ".join(_NON_WORD.sub(" ", text).replace("_", " ").split())
+
+
+def pair_text(compare_a, compare_b):
+    """비교 대상 두 개를 순서와 상관없이 같은 문자열로"""
+    return " | ".join(sorted((normalize(compare_a), normalize(compare_b))))
+
+
+def pair_from_title(title):
+    """'A vs B: 부제' 형식의 발행 제목에서 비교 대상을 꺼냅니다. 형식이 아니면 None"""
+    head = (title or "").split(":", 1)[0]
+    parts = re.split(r"\s+vs\.?\s+", head, maxsplit=1, flags=re.IGNORECASE)
+    if len(parts) != 2 or not all(p.strip() for p in parts):
+        return None
+    return pair_text(*parts)
+
+
+@lru_cache(maxsize=4096)
+def _signature(text, num_perm, shingle):
+    """
+    one permutation hashing: shingle 해시 1개로 bin(하위 비트)을 고르고 bin마다 최솟값을 남깁니다.
+    (순열 64개를 도는 고전 MinHash보다 몇 배 빠름) 빈 bin은 오른쪽으로 가장 가까운 bin 값을 빌리고
+    거리를 하위 비트에 붙여 구분합니다. (rotation densification)
+    같은 제목을 영구 색인과 실행 중 색인에 번갈아 조회하므로 결과를 캐시합니다. (반환값은 수정하지 않음)
+    """
+    text = normalize(text)
+    if len(text) <= shingle:
+        shingles = {text} if text else set()
+    else:
+        shingles = {text[i:i + shingle] for i in range(len(text) - shingle + 1)}
+    n, bits = num_perm, num_perm.bit_length() - 1
+    empty = 1 << 64
+    bins = [empty] * n
+    for s in shingles:
+        h = int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little")
+        b, v = h & (n - 1), h >> bits
+        if v < bins[b]:
+            bins[b] = v
+    if bins.count(empty) == n:
+        return None
+    signature = array("Q", bytes(8 * n))
+    for i in range(n):
+        distance = 0
+        while bins[(i + distance) % n] == empty:
+            distance += 1
+        signature[i] = (bins[(i + distance) % n] << bits) | distance
+    return signature
+
+
+class TopicIndex:
+    """
+    문서마다 num_perm칸짜리 MinHash 서명을 만들고, bands개 구간으로 나눈 해시 버킷(LSH)으로 후보만 추려
+    서명 일치 비율(자카드 유사도 추정치)이 threshold 이상이면 중복으로 봅니다.
+    서명은 gtb_storage.db의 topic_docs에 저장해 두고 시작할 때 메모리 버킷으로 올립니다.
+    """
+
+    def __init__(self, db_path="data/gtb_storage.db", threshold=None, num_perm=64, bands=16, shingle=3):
+        if num_perm & (num_perm - 1) or not 8 <= num_perm <= 64 or num_perm % bands:
+            raise ValueError("num_perm은 8~64 사이의 2의 거듭제곱이고 bands의 배수여야 합니다.")
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.threshold = threshold if threshold is not None else float(os.getenv("TOPIC_DUP_THRESHOLD", "0.6"))
+        self.num_perm, self.bands, self.rows, self.shingle = num_perm, bands, num_perm // bands, shingle
+        self.bin_bits = num_perm.bit_length() - 1
+        self.params = f"oph{num_perm}/{shingle}"
+
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        migrate_local(self.conn)
+        self.signatures = {kind: [] for kind in KINDS}   # kind -> [(reddit_id, signature)]
+        self.buckets = {kind: [{} for _ in range(bands)] for kind in KINDS}
+        self._load()
+
+    # --- MinHash ---
+
+    def signature(self, text):
+        return _signature(text, self.num_perm, self.shingle)
+
+    def _band_keys(self, signature):
+        r = self.rows
+        return [signature[b * r:(b + 1) * r].tobytes() for b in range(self.bands)]
+
+    def similarity(self, a, b):
+        return sum(x == y for x, y in zip(a, b)) / self.num_perm
+
+    # --- 색인 ---
+
+    def _load(self):
+        stale = []
+        for kind, doc_hash, reddit_id, text, blob, params in self.conn.execute(
+                "SELECT kind, doc_hash, reddit_id, text, signature, params FROM topic_docs"):
+            if kind not in KINDS:
+                continue
+            if params != self.params:
+                # 파라미터가 바뀌었으면 저장해 둔 원문으로 서명을 다시 계산
+                signature = self.signature(text)
+                if signature is None:
+                    continue
+                stale.append((signature.tobytes(), self.params, kind, doc_hash))
+            else:
+                signature = array("Q")
+                signature.frombytes(blob)
+            self._index(kind, reddit_id, signature)
+        if stale:
+            with self.conn:
+                self.conn.executemany("UPDATE topic_docs SET signature = ?, params = ? WHERE kind = ? AND doc_hash = ?", stale)
+
+    def _index(self, kind, reddit_id, signature):
+        position = len(self.signatures[kind])
+        self.signatures[kind].append((reddit_id, signature))
+        for band, key in zip(self.buckets[kind], self._band_keys(signature)):
+            band.setdefault(key, []).append(position)
+
+    def __len__(self):
+        return sum(len(s) for s in self.signatures.values())
+
+    def add_many(self, rows):
+        """(reddit_id, kind, text) 목록을 색인하고 topic_docs에 저장합니다."""
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        records = []
+        with self.lock:
+            for reddit_id, kind, text in rows:
+                signature = self.signature(text)
+                if signature is None:
+                    continue
+                self._index(kind, reddit_id, signature)
+                doc_hash = hashlib.sha1(normalize(text).encode("utf-8")).hexdigest()
+                records.append((kind, doc_hash, reddit_id, text, signature.tobytes(), self.params, now))
+            if records:
+                with self.conn:
+                    self.conn.executemany("INSERT OR IGNORE INTO topic_docs VALUES (?, ?, ?, ?, ?, ?, ?)", records)
+
+    def query(self, kind, text, threshold=None):
+        """가장 비슷한 색인 문서의 (reddit_id, 유사도). threshold 미만이면 None"""
+        signature = self.signature(text)
+        if signature is None:
+            return None
+        threshold = self.threshold if threshold is None else threshold
+        with self.lock:
+            docs = self.signatures[kind]
+            candidates = set()
+            for band, key in zip(self.buckets[kind], self._band_keys(signature)):
+                candidates.update(band.get(key, ()))
+            best = None
+            for position in candidates:
+                reddit_id, other = docs[position]
+                score = self.similarity(signature, other)
+                if score >= threshold and (best is None or score > best[1]):
+                    best = (reddit_id, score)
+        return best
+
+    def rebuild(self, rows):
+        """색인을 비우고 rows로 다시 채웁니다."""
+        with self.lock:
+            with self.conn:
+                self.conn.execute("DELETE FROM topic_docs")
+            self.signatures = {kind: [] for kind in KINDS}
+            self.buckets = {kind: [{} for _ in range(self.bands)] for kind in KINDS}
+        self.add_many(rows)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+def pairs_from_titles(rows):
+    """(reddit_id 또는 slug, 발행 제목) 목록 → pair 색인 행"""
+    for key, title in rows:
+        pair = pair_from_title(title)
+        if pair:
+            yield key, "pair", pair
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="주제 유사도 인덱스")
+    parser.add_argument("--db", default="data/gtb_storage.db")
+    parser.add_argument("--rebuild", action="store_true", help="처리 이력 + D1 로컬 사본 제목으로 pair 색인 재구성 (source/summary 색인은 유지)")
+    parser.add_argument("--query", help="원문 제목으로 가장 비슷한 처리 글 찾기")
+    parser.add_argument("--kind", choices=KINDS, default="source")
+    args = parser.parse_args()
+
+    index = TopicIndex(args.db)
+    if args.rebuild:
+        conn = sqlite3.connect(args.db)
+        rows = conn.execute("SELECT reddit_id, title FROM posts").fetchall()
+        kept = conn.execute("SELECT reddit_id, kind, text FROM topic_docs WHERE kind IN ('source', 'summary')").fetchall()
+        conn.close()
+        if os.path.exists("data/d1_mirror.db"):
+            from src.storage.d1_mirror import D1Mirror
+            mirror = D1Mirror()
+            rows += [(r["slug"], r["title"]) for r in mirror.query("SELECT slug, title FROM posts")]
+            mirror.close()
+        index.rebuild(list(pairs_from_titles(rows)) + kept)
+        print(f"[+] 주제 인덱스 재구성: 문서 {len(index)}개")
+    if args.query:
+        print(index.query(args.kind, args.query))
@@ -0,0 +1,24 @@
+import ipaddress
+import socket
+
+import pytest
+
+_connect = socket.socket.connect
+
+
+def _loopback_only(self, address):
+    host = address[0] if isinstance(address, tuple) else None
+    if host is not None:
+        try:
+            loopback = host == "localhost" or ipaddress.ip_address(host).is_loopback
+        except ValueError:
+            loopback = False
+        if not loopback:
+            raise RuntimeError(f"테스트에서 외부 네트워크 접속 금지: {address}")
+    return _connect(self, address)
+
+
+@pytest.fixture(autouse=True)
+def no_network(monkeypatch):
+    """테스트는 로컬 대역 서버(127.0.0.1)에만 붙습니다. 외부 접속을 시도하면 바로 실패"""
+    monkeypatch.setattr(socket.socket, "connect", _loopback_only)
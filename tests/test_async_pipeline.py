@@ -0,0 +1,92 @@
+import asyncio
+import gc
+
+import pytest
+
+from manager import GTBManager
+from src.pipeline.async_pipeline import _DONE, AsyncPipeline
+
+
+class FakeAnalyzer:
+    def __init__(self, selected_by_sub):
+        self.selected_by_sub = selected_by_sub
+
+    async def rank_categories_async(self, candidates_by_sub, interest):
+        return self.selected_by_sub
+
+
+class FakeSearcher:
+    async def search_korean_trends_many_async(self, queries):
+        return []
+
+
+class FailingClaude:
+    """IMAGE_PROMPT까지 보내고 생성에 실패하는 processor"""
+
+    async def stream_post_async(self, post, korean_trends=None, on_section=None):
+        on_section("image_prompt", "a bottle on a desk")
+        await asyncio.sleep(0)
+        return None
+
+
+class FailingPainter:
+    async def generate_image_async(self, prompt, output_name=None):
+        await asyncio.sleep(0.01)
+        return None
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = GTBManager()
+    manager.reader_interest = lambda: {}
+    yield manager
+    manager.store.close()
+
+
+def post(i, a="A", b="B"):
+    return {"id": f"t3_{i}", "title": f"{a} vs {b} #{i}", "compare_a": a, "compare_b": b}
+
+
+def test_rank_falls_back_to_next_candidate_when_top_pick_is_repeat(manager):
+    repeat, fresh, third = post(1, "Whey", "Casein"), post(2, "Zinc", "Magnesium"), post(3, "C", "D")
+    manager.analyzer = FakeAnalyzer({"Supplements": [repeat, fresh, third]})
+    manager.is_repeated_comparison = lambda p: p is repeat
+    pipeline = AsyncPipeline(manager, subs=["Supplements"])
+
+    async def rank():
+        pipeline.sem = {name: asyncio.Semaphore(n) for name, n in pipeline.limits.items()}
+        write_q = asyncio.Queue()
+        await pipeline._rank({"Supplements": [repeat, fresh, third]}, write_q)
+        return [write_q.get_nowait() for _ in range(write_q.qsize())]
+
+    queued = asyncio.run(rank())
+    assert [(sub, job["reddit_id"]) for sub, job in queued] == [("Supplements", "t3_2")]
+
+
+def test_claude_failure_retrieves_spawned_thumbnail_error(manager):
+    manager.searcher = FakeSearcher()
+    manager.processor = FailingClaude()
+    manager.painter = FailingPainter()
+    pipeline = AsyncPipeline(manager, subs=["Gadgets"])
+    job = manager.jobs.select("Gadgets", post(9))
+    unretrieved = []
+
+    async def write():
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: unretrieved.append(context))
+        pipeline.sem = {name: asyncio.Semaphore(n) for name, n in pipeline.limits.items()}
+        write_q, paint_q = asyncio.Queue(), asyncio.Queue()
+        await write_q.put(("Gadgets", job))
+        await write_q.put(_DONE)
+        await pipeline._write_worker(write_q, paint_q)
+        # 남겨 둔 썸네일 태스크가 끝날 때까지
+        await asyncio.sleep(0.1)
+        gc.collect()
+        return paint_q.get_nowait()
+
+    assert asyncio.run(write()) is _DONE
+    gc.collect()
+    assert unretrieved == []
+    saved = manager.jobs.get("t3_9")
+    assert saved["attempts"] == 1 and "Claude" in saved["error"]
+    assert saved["image_url"] is None
@@ -0,0 +1,94 @@
+import json
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from src.publisher.d1_client import D1Client, D1Error
+from src.publisher.d1_local_server import LocalD1, _Handler
+
+SCHEMA = "CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL);"
+
+
+class LossyHandler(_Handler):
+    """요청을 실제로 반영한 뒤 fail_next번까지 502를 돌려주는 D1 (응답만 잃어버린 상황)"""
+    fail_next = 0
+    requests = 0
+
+    def _reply(self, status, body):
+        cls = type(self)
+        cls.requests += 1
+        if status == 200 and cls.fail_next:
+            cls.fail_next -= 1
+            return super()._reply(502, {"success": False, "errors": [{"code": 502, "message": "Bad gateway"}]})
+        return super()._reply(status, body)
+
+
+@pytest.fixture
+def d1(tmp_path):
+    schema = tmp_path / "schema.sql"
+    schema.write_text(SCHEMA, encoding="utf-8")
+    handler = type("Handler", (LossyHandler,), {"d1": LocalD1(str(tmp_path / "d1.db"), str(schema))})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = D1Client("acc", "db", "token", api_base=f"http://127.0.0.1:{server.server_address[1]}/client/v4",
+                      backoff=0)
+    yield client, handler
+    client.close()
+    server.shutdown()
+    server.server_close()
+
+
+def names(client):
+    return [r["name"] for r in client.query("SELECT name FROM items ORDER BY id")]
+
+
+def test_batch_is_atomic(d1):
+    client, _ = d1
+    client.batch([("INSERT INTO items (name) VALUES (?)", ("a",))])
+    with pytest.raises(D1Error):
+        client.batch([("INSERT INTO items (name) VALUES (?)", ("b",)),
+                      ("INSERT INTO items (name) VALUES (?)", ("a",))])   # UNIQUE 위반 → 배치 전체 취소
+    assert names(client) == ["a"]
+
+
+def test_multi_statement_without_params_stays_in_batch_transaction(d1):
+    client, _ = d1
+    with pytest.raises(D1Error):
+        client.batch([("INSERT INTO items (name) VALUES ('x'); INSERT INTO items (name) VALUES ('y')", None),
+                      ("INSERT INTO items (name) VALUES ('x')", None)])
+    assert names(client) == []
+    client.query("INSERT INTO items (name) VALUES ('x'); INSERT INTO items (name) VALUES ('y')")
+    assert names(client) == ["x", "y"]
+
+
+def test_non_idempotent_write_is_not_retried_after_5xx(d1):
+    client, handler = d1
+    handler.fail_next = 1
+    with pytest.raises(D1Error):
+        client.query("INSERT INTO items (name) VALUES (?)", ("once",))
+    # D1은 이미 반영했으므로 다시 보내면 두 번 들어갔을 것
+    assert handler.requests == 1
+    assert names(client) == ["once"]
+
+
+def test_reads_and_marked_writes_are_retried_after_5xx(d1):
+    client, handler = d1
+    client.query("INSERT INTO items (name) VALUES ('r')")
+    handler.fail_next, handler.requests = 2, 0
+    assert names(client) == ["r"]
+    assert handler.requests == 3
+
+    handler.fail_next, handler.requests = 1, 0
+    client.query("INSERT OR IGNORE INTO items (name) VALUES (?)", ("r",), idempotent=True)
+    assert handler.requests == 2
+    assert names(client) == ["r"]
+
+
+def test_gives_up_after_server_retries(d1):
+    client, handler = d1
+    handler.fail_next, handler.requests = 10, 0
+    with pytest.raises(D1Error, match="502"):
+        client.query("SELECT 1")
+    assert handler.requests == client.server_retries + 1
+    handler.fail_next = 0
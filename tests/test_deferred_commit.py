@@ -0,0 +1,45 @@
+import pytest
+
+from manager import GTBManager
+
+
+class FakePublisher:
+    def __init__(self):
+        self.staged = []
+
+    def stage(self, paths, message):
+        self.staged.append(message)
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = GTBManager()
+    manager.publisher = FakePublisher()
+    yield manager
+    manager.store.close()
+
+
+def published_job(manager, reddit_id):
+    manager.jobs.select("Gadgets", {"id": reddit_id, "title": "A vs B"})
+    manager.jobs.save(reddit_id, trends=[], parsed={"title": "A vs B"}, image_url=f"/images/thumb_{reddit_id}.png",
+                      coupang=[])
+    return manager.jobs.save(reddit_id, slug=f"20260101-{reddit_id}")
+
+
+def test_job_waiting_for_deferred_commit_is_not_resumed(manager):
+    job = published_job(manager, "t3_a")
+    assert job["stage"] == "published"
+    assert [j["reddit_id"] for j in manager.resume_posts()] == ["t3_a"]
+
+    manager.stage_posts([job])
+    # 커밋 창이 열려 있는 동안 다음 데몬 실행이 다시 발행 대기열에 넣지 않음
+    assert manager.resume_posts() == []
+
+
+def test_stage_posts_dedupes_by_reddit_id(manager):
+    job = published_job(manager, "t3_b")
+    manager.stage_posts([job])
+    manager.stage_posts([dict(job)])
+    assert [j["reddit_id"] for j in manager.uncommitted] == ["t3_b"]
+    assert manager.publisher.staged == ["Image: 20260101-t3_b"]
@@ -0,0 +1,71 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.common import http_cache
+from src.common.http_cache import HttpCache
+
+BODY = b'{"items": [1, 2, 3]}'
+ETAG = '"v1"'
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    """ETag를 붙여 주고, If-None-Match가 맞으면 본문 없이 304를 돌려주는 피드"""
+    hits = []
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        type(self).hits.append(self.headers.get("If-None-Match"))
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.send_header("ETag", ETAG)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", ETAG)
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+
+@pytest.fixture
+def feed(tmp_path):
+    handler = type("Handler", (FeedHandler,), {"hits": []})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    http_cache.set_session_factory()
+    cache = HttpCache(str(tmp_path / "http_cache.db"))
+    yield cache, f"http://127.0.0.1:{server.server_address[1]}/feed.json", handler
+    cache.conn.close()
+    http_cache.set_session_factory()
+    server.shutdown()
+    server.server_close()
+
+
+def test_etag_round_trip(feed):
+    cache, url, handler = feed
+
+    first = cache.get(url, ttl=0)
+    assert (first.status_code, first.from_cache, first.json()) == (200, False, {"items": [1, 2, 3]})
+    cache.store_parsed(url, [1, 2, 3])
+
+    second = cache.get(url, ttl=0)
+    assert second.not_modified and second.from_cache
+    assert second.content == BODY and second.parsed == [1, 2, 3]
+    assert handler.hits == [None, ETAG]
+
+    third = cache.get(url, ttl=60)
+    assert third.from_cache and not third.not_modified and third.parsed == [1, 2, 3]
+    assert len(handler.hits) == 2   # TTL 안에서는 요청하지 않음
+    assert cache.stats == {"hit": 1, "revalidated": 1, "miss": 1, "error": 0}
+
+
+def test_secret_params_stay_out_of_cache_key(feed):
+    cache, url, _ = feed
+    cache.get(url, params={"q": "gpu", "key": "secret"}, ttl=0)
+    keys = [row[0] for row in cache.conn.execute("SELECT cache_key FROM http_cache")]
+    assert keys == [f"{url}?q=gpu"]
@@ -0,0 +1,78 @@
+import os
+import sqlite3
+
+import pytest
+
+from benchmarks.check_migrations import HOT_QUERIES, OLD_SCHEMA, SCHEMA_PATH, indexes, plan
+from src.publisher.d1_client import D1Client
+from src.publisher.d1_local_server import start_local_server
+from src.storage.migrations import DIRECTORIES, MigrationRunner, SQLiteTarget, migrate_local
+from src.storage.stats_rollup import StatsRollup
+
+HOT_INDEXES = {"idx_posts_created", "idx_posts_category_created", "idx_posts_updated", "idx_stats_daily_type_path"}
+
+
+@pytest.fixture(scope="module")
+def d1(tmp_path_factory):
+    """마이그레이션 도입 전 스키마에서 시작해 d1 마이그레이션을 모두 적용한 로컬 D1 대역"""
+    tmp = tmp_path_factory.mktemp("d1")
+    old = tmp / "old.sql"
+    old.write_text(OLD_SCHEMA, encoding="utf-8")
+    server, api_base = start_local_server(str(tmp / "d1.db"), schema_path=str(old))
+    client = D1Client("local", "local", "local", api_base=api_base)
+    client.batch([("INSERT INTO posts (slug, title, content, category) VALUES (?, ?, ?, ?)",
+                   (f"s{i}", f"title {i}", f"## 제목 {i}\n본문", "건강" if i % 2 else "IT테크")) for i in range(200)])
+    runner = MigrationRunner(client, DIRECTORIES["d1"])
+    runner.migrate(quiet=True)
+    client.batch([("INSERT INTO stats (type, path) VALUES (?, ?)", ("visit", f"/blog/s{i % 50}")) for i in range(500)])
+    yield client, runner
+    client.close()
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("name, sql, expected", HOT_QUERIES, ids=[q[0] for q in HOT_QUERIES])
+def test_hot_query_uses_index(d1, name, sql, expected):
+    client, _ = d1
+    assert expected in plan(client, sql)
+
+
+def test_migrations_are_recorded_and_not_reapplied(d1):
+    client, runner = d1
+    assert runner.migrate(quiet=True) == []
+    assert {r["version"] for r in client.query("SELECT version FROM schema_migrations")} == \
+        {m.version for m in runner.migrations}
+    columns = {r["name"] for r in client.query("PRAGMA table_info(posts)")}
+    assert {"content_html", "excerpt", "reading_minutes", "toc", "image_meta"} <= columns
+
+
+def test_migrated_indexes_match_schema_sql(d1, tmp_path):
+    client, _ = d1
+    assert indexes(client) == HOT_INDEXES
+    conn = sqlite3.connect(tmp_path / "fresh.db", isolation_level=None)
+    with open(SCHEMA_PATH, encoding="utf-8") as f:
+        conn.executescript(f.read())
+    fresh = SQLiteTarget(conn)
+    MigrationRunner(fresh, DIRECTORIES["d1"]).migrate(quiet=True)
+    assert indexes(fresh) == HOT_INDEXES
+    conn.close()
+
+
+def test_rollup_runs_on_migrated_schema(d1):
+    client, _ = d1
+    rollup = StatsRollup(client)
+    assert rollup.rollup() == 500
+    assert rollup.rollup() == 0
+
+
+@pytest.mark.parametrize("target, expected", [
+    ("local", {"posts", "posts_bloom", "post_jobs", "runs", "spans", "topic_docs", "api_quota", "token_bucket",
+               "llm_usage", "source_health", "poll_schedule", "poll_seen", "image_variants", "image_sources"}),
+    ("cache", {"http_cache", "kv_cache"}),
+])
+def test_local_migrations_create_every_table(tmp_path, target, expected):
+    conn = sqlite3.connect(os.path.join(tmp_path, f"{target}.db"))
+    migrate_local(conn, target)
+    tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert expected <= tables
+    conn.close()
@@ -0,0 +1,70 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from src.painter.job_queue import RenderQueue
+from src.painter.painter_service import PainterClient, PainterService, StubPainter
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = RenderQueue(str(tmp_path / "painter_queue.db"), max_pending=2)
+    yield queue
+    queue.close()
+
+
+def test_existing_queue_file_is_migrated(tmp_path):
+    path = str(tmp_path / "old_queue.db")
+    conn = sqlite3.connect(path)
+    # 마이그레이션 도입 전 RenderQueue가 직접 만든 테이블
+    conn.execute("CREATE TABLE render_jobs (id INTEGER PRIMARY KEY AUTOINCREMENT, prompt TEXT NOT NULL, "
+                 "output_name TEXT NOT NULL, priority INTEGER DEFAULT 0, status TEXT DEFAULT 'queued', "
+                 "attempts INTEGER DEFAULT 0, result_path TEXT, error TEXT, created_at REAL, started_at REAL, "
+                 "finished_at REAL)")
+    conn.execute("INSERT INTO render_jobs (prompt, output_name) VALUES ('old', 'old.png')")
+    conn.commit()
+    conn.close()
+
+    queue = RenderQueue(path)
+    assert queue.claim_next()["prompt"] == "old"
+    assert queue.last_heartbeat() is None
+    versions = [r[0] for r in queue.conn.execute("SELECT version FROM schema_migrations")]
+    assert versions == [1]
+    queue.close()
+
+
+def test_client_fails_fast_without_service(queue):
+    client = PainterClient(queue, timeout=600, poll_interval=0.01)
+    started = time.perf_counter()
+    assert client.generate_image("prompt", "a.png") is None
+    assert time.perf_counter() - started < 1
+    assert queue.pending_count() == 0
+
+
+def test_waiting_job_is_cancelled_when_heartbeat_goes_stale(queue):
+    queue.heartbeat()
+    client = PainterClient(queue, timeout=600, poll_interval=0.01, heartbeat_timeout=0.2)
+    job_id = client.submit("prompt", "a.png")
+    started = time.perf_counter()
+    assert client.wait(job_id) is None
+    assert time.perf_counter() - started < 2
+    assert queue.get(job_id)["status"] == "failed"
+    # 나중에 뜬 서비스가 주인 없는 작업을 가져가지 않음
+    assert queue.claim_next() is None
+
+
+def test_live_service_renders(queue, tmp_path):
+    service = PainterService(queue, lambda: StubPainter(0, str(tmp_path / "images")), heartbeat_interval=0.05)
+    worker = threading.Thread(target=service.serve_forever, kwargs={"poll_interval": 0.01})
+    worker.start()
+    try:
+        client = PainterClient(queue, timeout=10, poll_interval=0.01, heartbeat_timeout=1)
+        while not client.worker_alive():
+            time.sleep(0.01)
+        paths = [client.generate_image(f"prompt {i}", f"{i}.png") for i in range(3)]
+    finally:
+        service.stop()
+        worker.join()
+    assert all(path and path.endswith(f"{i}.png") for i, path in enumerate(paths))
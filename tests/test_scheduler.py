@@ -0,0 +1,98 @@
+import random
+
+import pytest
+
+from manager import GTBManager
+from src.pipeline.scheduler import PollScheduler
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def make_scheduler(path, clock, **kwargs):
+    return PollScheduler(["Gadgets"], str(path), clock=clock, sleep=clock.sleep, rng=random.Random(0),
+                         min_interval=900, max_interval=6 * 3600, initial_interval=3600, jitter=0, **kwargs)
+
+
+def test_failed_poll_retries_at_min_interval(tmp_path):
+    clock = FakeClock()
+    scheduler = make_scheduler(tmp_path / "s.db", clock)
+    scheduler.record("Gadgets", None)
+    state = scheduler.state["Gadgets"]
+    assert state["interval"] == 3600
+    assert state["next_poll_at"] == clock() + 900
+    assert state["errors"] == 1 and state["polls"] == 0
+    scheduler.close()
+
+
+def test_empty_feed_backs_off(tmp_path):
+    clock = FakeClock()
+    scheduler = make_scheduler(tmp_path / "s.db", clock)
+    scheduler.record("Gadgets", 0)
+    assert scheduler.state["Gadgets"]["interval"] == 3600 * 1.5
+    scheduler.close()
+
+
+def test_observe_counts_only_ids_not_seen_before(tmp_path):
+    clock = FakeClock()
+    path = tmp_path / "s.db"
+    scheduler = make_scheduler(path, clock, seen_ttl=86400)
+    assert scheduler.observe("Gadgets", ["a", "b", "a"]) == 2
+    scheduler.close()
+    # 재시작해도 본 글 기록이 이어짐
+    scheduler = make_scheduler(path, clock, seen_ttl=86400)
+    assert scheduler.observe("Gadgets", ["b", "c"]) == 1
+    clock.sleep(2 * 86400)
+    assert scheduler.observe("Gadgets", ["d"]) == 1
+    assert scheduler.conn.execute("SELECT COUNT(*) FROM poll_seen").fetchone()[0] == 1
+    scheduler.close()
+
+
+class FlakyCollector:
+    """첫 수집은 두 소스 모두 실패(None), 그다음부터는 같은 피드"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def fetch_top_posts(self, sub, limit=1):
+        self.calls += 1
+        if self.calls == 1:
+            return None
+        return [{"id": f"t3_{i}", "title": f"post {i}"} for i in range(3)]
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = GTBManager()
+    manager.collector = FlakyCollector()
+    manager.run_pipeline = lambda subs=None: manager.collect_candidates(subs)
+    yield manager
+    manager.store.close()
+
+
+def test_daemon_passes_collect_failure_to_scheduler(manager):
+    clock = FakeClock()
+    scheduler = make_scheduler(manager.db_path, clock)
+    manager.run_daemon(scheduler=scheduler, max_ticks=1)
+    # 실패: 간격은 그대로, min_interval 뒤 재시도
+    assert manager.last_poll == {"Gadgets": None}
+    scheduler = make_scheduler(manager.db_path, clock)   # run_daemon이 닫은 뒤 저장된 상태를 다시 읽음
+    state = scheduler.state["Gadgets"]
+    assert (state["errors"], state["polls"], state["interval"]) == (1, 0, 3600)
+    assert state["next_poll_at"] == clock() + 900
+
+    clock.sleep(900)
+    manager.run_daemon(scheduler=scheduler, max_ticks=1)
+    scheduler = make_scheduler(manager.db_path, clock)
+    state = scheduler.state["Gadgets"]
+    assert (state["polls"], state["new_ids"]) == (1, 3)
+    scheduler.close()
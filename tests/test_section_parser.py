@@ -0,0 +1,70 @@
+from src.processor.section_parser import SectionParser, parse_sections
+
+NEW_ORDER = """VS_TITLE: A vs B
+---
+TITLE: 제목
+---
+SUMMARY: 요약
+---
+IMAGE_PROMPT: a bottle on a desk
+---
+KEYWORDS: 마그네슘 영양제
+---
+CONTENT:
+## 본문
+Summary: 본문 안의 줄
+---
+가로줄 아래 본문
+"""
+
+OLD_ORDER = """VS_TITLE: A vs B
+---
+TITLE: 제목
+---
+SUMMARY: 요약
+---
+CONTENT:
+## 본문
+첫 문단
+---
+IMAGE_PROMPT: a bottle on a desk
+---
+KEYWORDS: 마그네슘 영양제
+"""
+
+
+def test_new_order_keeps_body_lines_that_look_like_headers():
+    data = parse_sections(NEW_ORDER)
+    assert data["image_prompt"] == "a bottle on a desk"
+    assert data["keywords"] == "마그네슘 영양제"
+    assert data["content"] == "## 본문\nSummary: 본문 안의 줄\n---\n가로줄 아래 본문"
+
+
+def test_old_order_ends_content_at_trailing_sections():
+    data = parse_sections(OLD_ORDER)
+    assert data["content"] == "## 본문\n첫 문단"
+    assert data["image_prompt"] == "a bottle on a desk"
+    assert data["keywords"] == "마그네슘 영양제"
+
+
+def test_mixed_order_without_separator():
+    text = "TITLE: 제목\nCONTENT:\n본문\nKEYWORDS: 키워드\nSUMMARY: 요약\nIMAGE_PROMPT: prompt"
+    data = parse_sections(text)
+    assert data["content"] == "본문"
+    assert data["keywords"] == "키워드"
+    assert data["summary"] == "요약"
+    assert data["image_prompt"] == "prompt"
+
+
+def test_body_header_without_separator_stays_in_content():
+    data = parse_sections("TITLE: 제목\nCONTENT:\n본문\nTitle: 본문 속 소제목\n끝")
+    assert data["content"] == "본문\nTitle: 본문 속 소제목\n끝"
+
+
+def test_streaming_chunks_match_whole_parse():
+    seen = []
+    parser = SectionParser(on_section=lambda name, value: seen.append(name))
+    for i in range(0, len(OLD_ORDER), 7):
+        parser.feed(OLD_ORDER[i:i + 7])
+    assert parser.close() == parse_sections(OLD_ORDER)
+    assert seen == ["vs_title", "title", "summary", "content", "image_prompt", "keywords"]
@@ -0,0 +1,43 @@
+import asyncio
+
+import pytest
+
+from manager import GTBManager
+from src.pipeline.async_pipeline import AsyncPipeline
+
+
+class FailingPainter:
+    """LocalPainter처럼 실패를 삼키고 None을 반환하는 painter"""
+
+    def generate_image(self, prompt, output_name=None):
+        return None
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = GTBManager()
+    manager.painter = FailingPainter()
+    yield manager
+    manager.store.close()
+
+
+def test_render_thumbnail_raises_when_painter_made_no_file(manager):
+    with pytest.raises(RuntimeError, match="썸네일 생성 실패"):
+        manager.render_thumbnail({"id": "t3_x"}, "prompt")
+
+
+def test_async_render_raises_and_saves_nothing(manager):
+    post = {"id": "t3_y", "title": "t"}
+    manager.jobs.select("Gadgets", post)
+    pipeline = AsyncPipeline(manager)
+    pipeline.sem = {"painter": asyncio.Semaphore(1)}
+    with pytest.raises(RuntimeError):
+        asyncio.run(pipeline._render(post, "prompt"))
+    assert manager.jobs.get("t3_y")["image_url"] is None
+
+
+def test_already_published_png_is_reused(manager, tmp_path):
+    (tmp_path / "public" / "images").mkdir(parents=True)
+    (tmp_path / "public" / "images" / "thumb_t3_z.png").write_bytes(b"png")
+    assert manager.publish_image("thumb_t3_z.png") == "/images/thumb_t3_z.png"
@@ -0,0 +1,43 @@
+import pytest
+
+from manager import GTBManager
+from src.collector.reddit_collector import legacy_news_id, news_id
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = GTBManager()
+    yield manager
+    manager.store.close()
+
+
+def news_post(title):
+    return {"id": news_id(title), "legacy_id": legacy_news_id(title), "title": title}
+
+
+def test_syndicated_headline_gets_one_id():
+    assert news_id("Nvidia unveils RTX 5090 - Reuters") == news_id("Nvidia Unveils RTX 5090! - The Verge")
+    assert news_id("Nvidia unveils RTX 5090") != news_id("Nvidia unveils RTX 5080")
+
+
+def test_news_processed_under_legacy_id_is_skipped(manager):
+    old = news_post("Samsung Galaxy S26 launch date leaks - Reuters")
+    fresh = news_post("Apple Vision Pro 2 spotted in filings - Bloomberg")
+    manager.store.mark_processed(old["legacy_id"], "갤럭시 S26 출시일", "db://old")
+
+    assert manager.filter_new_candidates([old, fresh]) == [fresh]
+    # 예전 ID 없이 수집된 글(레딧)은 그대로
+    assert manager.filter_new_candidates([{"id": "t3_x", "title": "x"}]) == [{"id": "t3_x", "title": "x"}]
+
+
+def test_mark_committed_indexes_summary(manager):
+    post = {"id": "t3_s", "title": "Magnesium glycinate vs citrate", "compare_a": "glycinate", "compare_b": "citrate"}
+    manager.jobs.select("Health", post)
+    summary = "마그네슘 글리시네이트와 시트레이트의 흡수율과 수면 효과를 비교합니다."
+    manager.mark_committed([{"reddit_id": "t3_s", "slug": "20260101-t3_s", "post": post,
+                             "parsed": {"title": "글리시네이트 vs 시트레이트", "summary": summary}}])
+
+    assert manager.topics.query("summary", summary)[0] == "t3_s"
+    assert manager.topics.query("source", post["title"])[0] == "t3_s"
+    assert manager.topics.query("pair", "citrate | glycinate")[0] == "t3_s"